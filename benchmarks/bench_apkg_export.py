@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark de Exportação .apkg
+=============================
+
+Compara o escritor direto (utils.apkg_writer) com o caminho genanki
+(um genanki.Note por card) e confere se os dois bancos têm o mesmo conteúdo.
+
+Uso:
+    python benchmarks/bench_apkg_export.py [num_cards]
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import genanki
+
+from core.cards import CardStore
+from utils.apkg_writer import guid_for, write_apkg
+from utils.export import ANKI_MODEL, format_note_fields
+
+
+TIMESTAMP = 1700000000.0
+DECK_ID = 2059400110
+
+
+def make_cards(n: int) -> CardStore:
+    """Gera n cards sintéticos (parte com código)."""
+    store = CardStore()
+    for i in range(n):
+        if i % 5 == 0:
+            store.append(f"Como iterar a lista {i}?", f"for x in itens_{i}:\n    print(x)")
+        else:
+            store.append(f"O que é o conceito {i}?", f"Definição do conceito número {i}.")
+    return store
+
+
+def export_genanki(path: str, cards: CardStore) -> None:
+    """Caminho original: um genanki.Note por card."""
+    deck = genanki.Deck(DECK_ID, "Benchmark")
+    for card in cards:
+        deck.add_note(genanki.Note(
+            model=ANKI_MODEL,
+            fields=format_note_fields(card),
+            guid=genanki.guid_for(card["q"], card["a"])
+        ))
+    genanki.Package(deck).write_to_file(path, timestamp=TIMESTAMP)
+
+
+def export_direct(path: str, cards: CardStore) -> None:
+    """Escritor direto com executemany em uma transação."""
+    notes = (
+        (format_note_fields(card), guid_for(card["q"], card["a"]))
+        for card in cards
+    )
+    write_apkg(path, DECK_ID, "Benchmark", ANKI_MODEL, notes, timestamp=TIMESTAMP)
+
+
+def dump_collection(path: str) -> dict:
+    """Lê todas as tabelas do collection.anki2 de um pacote."""
+    with tempfile.TemporaryDirectory() as tmp:
+        with zipfile.ZipFile(path) as z:
+            z.extract("collection.anki2", tmp)
+        conn = sqlite3.connect(os.path.join(tmp, "collection.anki2"))
+        tables = {
+            table: conn.execute(f"SELECT * FROM {table} ORDER BY 1").fetchall()
+            for table in ("col", "notes", "cards")
+        }
+        conn.close()
+    return tables
+
+
+def measure(label: str, func, path: str, cards: CardStore) -> None:
+    """Executa uma exportação medindo tempo e pico de memória."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    func(path, cards)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<10} {elapsed:8.2f}s  pico {peak / 1024 / 1024:8.1f} MB")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    cards = make_cards(n)
+    print(f"Exportando {n:,} cards\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path_genanki = os.path.join(tmp, "genanki.apkg")
+        path_direct = os.path.join(tmp, "direct.apkg")
+
+        measure("genanki", export_genanki, path_genanki, cards)
+        measure("direto", export_direct, path_direct, cards)
+
+        same = dump_collection(path_genanki) == dump_collection(path_direct)
+        print(f"\nConteúdo idêntico: {'sim' if same else 'NÃO'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark de Detecção de Código
+===============================
+
+Compara, em decks grandes com muito código, a formatação anterior (lista de
+indicadores recriada a cada card, sem escape), a formatação atual de
+utils.export (indicadores pré-montados + escape de HTML) e a detecção por
+alternância regex pré-compilada.
+
+Uso:
+    python benchmarks/bench_code_detection.py [num_cards]
+"""
+
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.export import CODE_INDICATORS, format_answer_html, is_code_answer
+
+
+_REGEX_DETECTOR = re.compile("|".join(re.escape(ind) for ind in CODE_INDICATORS))
+
+
+SNIPPETS = [
+    "for (let i = 0; i < n && ok; i++) {\n  total += v[i];\n}",
+    "if a < b and b > c:\n    print('a & c')",
+    "std::vector<int> v = {1, 2, 3};",
+    "const soma = (a, b) => a + b;",
+    "A mitocôndria produz ATP por fosforilação oxidativa.",
+    "SELECT * FROM t WHERE x <> 0;",
+]
+
+
+def legacy_format(answer: str) -> str:
+    """Implementação anterior: oito buscas por substring e nenhum escape."""
+    code_indicators = ['def ', 'function ', '{', '=>', 'import ', 'const ', 'let ', 'var ']
+    is_code = '\n' in answer or any(ind in answer for ind in code_indicators)
+    if is_code:
+        answer = f"<pre><code>{answer}</code></pre>"
+    return answer
+
+
+def make_answers(n: int) -> list:
+    """Gera n respostas, a maioria com código e texto longo."""
+    answers = []
+    for i in range(n):
+        base = SNIPPETS[i % len(SNIPPETS)]
+        answers.append(f"Exemplo {i}: " + " ".join([base] * (1 + i % 8)))
+    return answers
+
+
+def measure(label: str, func, answers: list) -> float:
+    start = time.perf_counter()
+    for answer in answers:
+        func(answer)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<12} {elapsed:8.3f}s")
+    return elapsed
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    answers = make_answers(n)
+    print(f"Formatando {n:,} respostas\n")
+
+    legacy = measure("anterior", legacy_format, answers)
+    current = measure("atual", format_answer_html, answers)
+    print(f"\nRazão: {legacy / current:.2f}x (atual inclui o escape de HTML)\n")
+
+    print("Só detecção:")
+    measure("substring", is_code_answer, answers)
+    measure("regex", _REGEX_DETECTOR.search, answers)
+
+    escaped = sum(1 for a in answers if "&lt;" in format_answer_html(a))
+    print(f"Respostas com '<' escapado: {escaped:,}")
+
+
+if __name__ == "__main__":
+    main()
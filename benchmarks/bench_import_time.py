@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+Orçamento de Tempo de Importação
+================================
+
+Mede, com `python -X importtime`, quanto custa importar a interface antes
+da primeira janela e falha (código de saída 1) se:
+
+- o tempo acumulado passar do orçamento, ou
+- algum módulo pesado que deve ser carregado só no primeiro uso
+  (openai, genanki, tiktoken) for importado na inicialização.
+
+Cada medição roda num processo novo; vale a menor das execuções (a que
+sofre menos interferência do sistema).
+
+Uso:
+    python benchmarks/bench_import_time.py [orcamento_ms] [execucoes]
+"""
+
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Módulos importados por main.py antes da janela
+STARTUP_IMPORT = "import ui.app, utils.validators"
+
+# Dependências pesadas que só podem ser carregadas no primeiro uso
+LAZY_MODULES = ("openai", "genanki", "httpx", "pydantic", "tiktoken")
+
+DEFAULT_BUDGET_MS = 300
+DEFAULT_RUNS = 5
+
+
+def measure_imports() -> List[Tuple[str, int, int]]:
+    """
+    Importa os módulos de inicialização num processo novo.
+
+    Returns:
+        Lista de (módulo, tempo próprio em µs, tempo acumulado em µs).
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", STARTUP_IMPORT],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append((name.strip(), int(self_us), int(cumulative_us)))
+    return modules
+
+
+def total_ms(modules: List[Tuple[str, int, int]]) -> float:
+    """Soma dos tempos próprios (inclui todos os níveis de importação)."""
+    return sum(self_us for _, self_us, _ in modules) / 1000
+
+
+def main():
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_BUDGET_MS
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_RUNS
+
+    measurements = [measure_imports() for _ in range(runs)]
+    best = min(measurements, key=total_ms)
+    elapsed = total_ms(best)
+
+    print(f"{STARTUP_IMPORT!r}: {elapsed:.1f} ms (melhor de {runs}, orçamento {budget:.0f} ms)\n")
+    print("Maiores tempos próprios:")
+    for name, self_us, cumulative_us in sorted(best, key=lambda m: m[1], reverse=True)[:12]:
+        print(f"  {name:<40} {self_us / 1000:7.1f} ms  (acumulado {cumulative_us / 1000:7.1f} ms)")
+
+    loaded: Dict[str, int] = {}
+    for name, _, cumulative_us in best:
+        root = name.split(".")[0]
+        if root in LAZY_MODULES:
+            loaded[root] = max(loaded.get(root, 0), cumulative_us)
+
+    failed = False
+    if loaded:
+        failed = True
+        print("\nMódulos que deveriam ser importados só no primeiro uso:")
+        for name, cumulative_us in loaded.items():
+            print(f"  {name:<40} {cumulative_us / 1000:7.1f} ms")
+    if elapsed > budget:
+        failed = True
+        print(f"\nOrçamento estourado: {elapsed:.1f} ms > {budget:.0f} ms")
+
+    print("\nResultado:", "FALHOU" if failed else "ok")
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark do Serviço de Tarefas
+===============================
+
+Testa o modo serviço (server.py) de ponta a ponta, sem chamar a API: um
+backend substituto (espera fixa por tarefa, cards sintéticos) atende os
+pedidos enviados pelo JobClient por HTTP. Confere:
+
+- vazão próxima de `workers / espera` (o pool trabalha em paralelo);
+- resultados, erros (pedido inválido, falha no backend) e cancelamento;
+- persistência: tarefas em execução ao "cair" voltam para a fila.
+
+Uso:
+    python benchmarks/bench_job_service.py [num_tarefas] [workers] [espera_ms]
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.job_store import JobStore
+from core.jobs import CANCELLED, DONE, FAILED, QUEUED
+from server import JobClient, JobService, ServiceError, create_server
+
+
+DEFAULT_JOBS = 40
+DEFAULT_WORKERS = 4
+DEFAULT_DELAY_MS = 50
+
+
+def make_backend(delay: float):
+    """Handlers substitutos: esperam `delay` segundos e devolvem cards falsos."""
+
+    def generate(payload):
+        time.sleep(delay)
+        if payload["text"] == "falhar":
+            raise RuntimeError("falha simulada")
+        words = payload["text"].split()
+        return {"cards": [{"q": f"O que é {w}?", "a": w.upper()} for w in words]}
+
+    def refine(payload):
+        time.sleep(delay)
+        return {"cards": payload["cards"][: max(1, len(payload["cards"]) // 2)]}
+
+    def review(payload):
+        time.sleep(delay)
+        return {"cards": payload["cards"], "report": f"Revisão de {payload['subject']}"}
+
+    return {"generate": generate, "refine": refine, "review": review}
+
+
+def main():
+    num_jobs = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_JOBS
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_WORKERS
+    delay = (int(sys.argv[3]) if len(sys.argv) > 3 else DEFAULT_DELAY_MS) / 1000
+
+    failures = []
+    tmp = tempfile.mkdtemp()
+    db = os.path.join(tmp, "jobs.sqlite3")
+
+    store = JobStore(db)
+    service = JobService(store, make_backend(delay), workers=workers)
+    server = create_server(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    service.start()
+    client = JobClient(f"http://127.0.0.1:{server.server_address[1]}")
+
+    # Vazão: muitos clientes enviando e esperando ao mesmo tempo
+    start = time.perf_counter()
+
+    def one(i: int):
+        job_id = client.submit("generate", text=f"alfa beta gama {i}")
+        return client.wait_result(job_id, poll=0.01)
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(one, range(num_jobs)))
+    elapsed = time.perf_counter() - start
+    ideal = num_jobs * delay / workers
+
+    print(f"{num_jobs} tarefas, {workers} workers, {delay * 1000:.0f} ms cada")
+    print(f"  tempo: {elapsed:.2f}s (ideal {ideal:.2f}s, serial {num_jobs * delay:.2f}s)")
+    print(f"  vazão: {num_jobs / elapsed:.1f} tarefas/s")
+    if any(len(r["cards"]) != 4 for r in results):
+        failures.append("resultado de geração incorreto")
+    if elapsed > num_jobs * delay * 0.75:
+        failures.append("o pool não processou em paralelo")
+
+    # Outros tipos, erros e métricas
+    refine_id = client.submit("refine", cards=[{"q": "a", "a": "b"}, {"q": "c", "a": "d"}])
+    review_id = client.submit("review", cards=[{"q": "a", "a": "b"}], subject="Teste", mode="final")
+    failed_id = client.submit("generate", text="falhar")
+    if len(client.wait_result(refine_id, poll=0.01)["cards"]) != 1:
+        failures.append("resultado de refinamento incorreto")
+    if client.wait_result(review_id, poll=0.01)["report"] != "Revisão de Teste":
+        failures.append("resultado de revisão incorreto")
+    try:
+        client.wait_result(failed_id, poll=0.01)
+        failures.append("falha do backend não foi reportada")
+    except ServiceError as e:
+        print(f"  falha reportada: {e}")
+    try:
+        client.submit("review", cards=[])
+        failures.append("pedido inválido aceito")
+    except ServiceError as e:
+        print(f"  pedido inválido: {e}")
+
+    metrics = client.metrics()
+    print(f"  métricas: {metrics['states']} • espera média {metrics['avg_wait'] * 1000:.0f} ms"
+          f" • execução média {metrics['avg_run'] * 1000:.0f} ms")
+    if metrics["states"][DONE] != num_jobs + 2 or metrics["states"][FAILED] != 1:
+        failures.append("contagens das métricas incorretas")
+
+    # Cancelamento: com o pool parado, as tarefas ficam na fila
+    service.stop()
+    queued_id = client.submit("generate", text="cancelar")
+    if not client.cancel(queued_id) or client.status(queued_id)["state"] != CANCELLED:
+        failures.append("cancelamento falhou")
+    server.shutdown()
+    server.server_close()
+
+    # Persistência: uma tarefa "em execução" num processo que caiu volta à fila
+    orphan_id = store.submit("generate", {"text": "orfã"})
+    store.claim()
+    store.close()
+    reopened = JobStore(db)
+    print(f"  reabertura: {reopened.requeued} tarefa(s) devolvida(s) à fila")
+    if reopened.get(orphan_id)["state"] != QUEUED:
+        failures.append("tarefa interrompida não voltou para a fila")
+    if reopened.get(refine_id)["state"] != DONE or reopened.result(refine_id) is None:
+        failures.append("resultado não persistiu")
+    reopened.close()
+
+    for failure in failures:
+        print(f"  ✗ {failure}")
+    print("\nResultado:", "FALHOU" if failures else "ok")
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+Ida e Volta dos Formatos de Texto
+=================================
+
+Grava um deck em cada formato de texto da exportação (tab, anki_txt com
+cabeçalho #separator/#html/#columns/#deck, csv) e o relê com o parser do
+próprio projeto (core.parser.parse_flashcard_file). Falha (código de saída 1)
+se algum card voltar diferente, se linhas do cabeçalho virarem cards ou se
+a contagem não bater.
+
+Uso:
+    python benchmarks/bench_txt_roundtrip.py [num_cards]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.parser import parse_flashcard_file
+from utils.export import export_txt
+
+
+# Formatos relidos pelo parser de texto
+TEXT_FORMATS = ("tab", "anki_txt", "csv")
+
+SAMPLES = [
+    ("O que a mitocôndria produz?", "ATP, por fosforilação oxidativa."),
+    ("Como somar dois números em JS?", "const soma = (a, b) => a + b;"),
+    ("Qual a saída?", "for i in range(3):\n    print(i)"),
+    ("Separadores; vírgulas, e \"aspas\"", "Resposta com ; e , no meio"),
+    ("#hashtag no início da pergunta?", "Só o cabeçalho do topo é ignorado."),
+    ("Se a < b & b > c, então?", "a < c (e <b>não</b> é negrito; &amp; fica literal)"),
+]
+
+
+def make_cards(n: int) -> list:
+    """Gera n cards distintos a partir das amostras."""
+    cards = []
+    for i in range(n):
+        q, a = SAMPLES[i % len(SAMPLES)]
+        cards.append({"q": f"{q} ({i})" if i else q, "a": a})
+    return cards
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    cards = make_cards(n)
+    print(f"Ida e volta de {n:,} cards\n")
+
+    failed = False
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for fmt in TEXT_FORMATS:
+            path = os.path.join(temp_dir, f"deck_{fmt}.txt")
+
+            start = time.perf_counter()
+            export_txt(path, cards, fmt, deck_name="Biologia::Células")
+            written = time.perf_counter() - start
+
+            start = time.perf_counter()
+            loaded = parse_flashcard_file(path)
+            read = time.perf_counter() - start
+
+            mismatches = sum(
+                1 for a, b in zip(cards, loaded) if (a["q"], a["a"]) != (b["q"], b["a"])
+            )
+            ok = len(loaded) == len(cards) and mismatches == 0
+            failed = failed or not ok
+            print(
+                f"{fmt:<10} gravação {written:6.3f}s  leitura {read:6.3f}s  "
+                f"{len(loaded):,} cards  {mismatches} diferente(s)  "
+                f"{'ok' if ok else 'FALHOU'}"
+            )
+            if not ok and loaded:
+                print(f"  primeiro card lido: {loaded[0]}")
+
+    print("\nResultado:", "FALHOU" if failed else "ok")
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
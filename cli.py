@@ -0,0 +1,718 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Modo de Linha de Comando
+========================
+
+Executa geração, refinamento, revisão e exportação sem a interface gráfica
+(servidores sem tela, cron, scripts). As chamadas à API rodam na mesma fila
+de tarefas da interface (core.jobs), com `--workers` tarefas simultâneas.
+
+O progresso sai em JSON Lines na saída padrão, um evento por linha:
+
+    {"event": "job", "t": 1.2, "id": 3, "state": "running", ...}
+    {"event": "done", "t": 9.8, "cards": 120, "output": "deck.apkg", ...}
+
+Mensagens de diagnóstico das bibliotecas vão para a saída de erro, para não
+misturar com os eventos.
+
+Uso:
+    ankilab generate notas/ aula.md -o deck.apkg --workers 8
+    cat aula.txt | ankilab generate - -o aula.csv --profile economica
+    ankilab refine deck.apkg --source aula.txt -o refinado.apkg
+    ankilab review deck.apkg --subject "Cardiologia" --mode final -o revisado.apkg
+    ankilab export a.csv b.apkg -o tudo.jsonl
+    ankilab serve --port 8765 --workers 4
+    ankilab watch /compartilhado/textos --workers 4
+
+Código de saída: 0 (sucesso), 1 (alguma tarefa falhou), 2 (uso incorreto),
+130 (interrompido).
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, TextIO, Tuple
+
+
+# Cards enviados por chamada no `refine` (lotes rodam em paralelo)
+REFINE_BATCH_SIZE = 40
+
+# Formato deduzido da extensão de saída quando --format não é informado
+_FORMAT_BY_EXTENSION = {
+    ".apkg": "anki_apkg",
+    ".txt": "anki_txt",
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+}
+
+# Nome do "arquivo" que representa a entrada padrão
+STDIN = "-"
+
+
+class EventWriter:
+    """
+    Emite eventos de progresso em JSON Lines (seguro entre threads).
+
+    Uso:
+        events = EventWriter(sys.stdout)
+        events.emit("start", command="generate", total=3)
+    """
+
+    def __init__(self, stream: TextIO):
+        """
+        Args:
+            stream: Saída dos eventos.
+        """
+        self.stream = stream
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def emit(self, event: str, **fields: Any) -> None:
+        """
+        Escreve um evento.
+
+        Args:
+            event: Tipo do evento.
+            **fields: Dados do evento (serializáveis em JSON).
+        """
+        record = {"event": event, "t": round(time.perf_counter() - self._start, 3)}
+        record.update(fields)
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+
+
+class CommandError(Exception):
+    """Erro de uso ou de entrada que encerra o comando (código 1)."""
+
+
+# ==============================================================================
+# ARGUMENTOS
+# ==============================================================================
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Monta o parser dos subcomandos.
+
+    Returns:
+        ArgumentParser configurado.
+    """
+    parser = argparse.ArgumentParser(
+        prog="ankilab",
+        description="AnkiLab sem interface gráfica: gera, refina, revisa e exporta "
+                    "flashcards. O progresso sai em JSON Lines na saída padrão."
+    )
+    commands = parser.add_subparsers(dest="command", required=True, metavar="comando")
+
+    # Opções comuns a todos os subcomandos
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        "--workers", "-w", type=int, default=None,
+        help="tarefas simultâneas (padrão: ANKILAB_WORKERS ou 3)"
+    )
+    common.add_argument(
+        "--max-requests", type=int, default=None,
+        help="chamadas simultâneas à API (padrão: ANKILAB_MAX_REQUESTS ou o número de workers)"
+    )
+    common.add_argument(
+        "--profile", "-p", default=None,
+        help="perfil de modelos (ver config/profiles.py)"
+    )
+
+    # Opções de saída (decks)
+    output = argparse.ArgumentParser(add_help=False)
+    output.add_argument("--output", "-o", help="arquivo de saída")
+    output.add_argument(
+        "--format", "-f", dest="fmt", default=None,
+        help="formato de saída: anki_apkg, anki_txt, noji_txt, csv ou jsonl "
+             "(padrão: pela extensão de --output)"
+    )
+    output.add_argument("--deck-name", default=None, help="nome do deck (.apkg)")
+
+    generate = commands.add_parser(
+        "generate", parents=[common, output],
+        help="gera cards a partir de textos (arquivos, diretórios ou '-' para stdin)"
+    )
+    generate.add_argument("inputs", nargs="+", help="arquivos, diretórios, globs ou '-'")
+    generate.add_argument(
+        "--quantity", "-n", default="AUTO",
+        help="cards por texto ou AUTO (padrão: AUTO)"
+    )
+    generate.add_argument("--hard", action="store_true", help="prompt focado em aplicação")
+    generate.add_argument("--refine", action="store_true", help="refina os cards gerados")
+
+    refine = commands.add_parser(
+        "refine", parents=[common, output],
+        help="refina decks existentes em lotes paralelos"
+    )
+    refine.add_argument("decks", nargs="+", help="decks (.apkg, .csv, .txt, .tsv) ou diretórios")
+    refine.add_argument("--source", "-s", default=None, help="texto-fonte original ('-' para stdin)")
+    refine.add_argument("--hard", action="store_true", help="refinamento mais rigoroso")
+    refine.add_argument(
+        "--batch-size", type=int, default=REFINE_BATCH_SIZE,
+        help=f"cards por chamada (padrão: {REFINE_BATCH_SIZE})"
+    )
+
+    review = commands.add_parser(
+        "review", parents=[common, output],
+        help="audita ou revisa decks (os arquivos são combinados num só deck)"
+    )
+    review.add_argument("decks", nargs="+", help="decks (.apkg, .csv, .txt, .tsv) ou diretórios")
+    review.add_argument("--subject", required=True, help="tema/assunto do deck")
+    review.add_argument(
+        "--mode", choices=("audit", "final"), default="audit",
+        help="audit = novos cards sugeridos; final = deck revisado (padrão: audit)"
+    )
+    review.add_argument(
+        "--encoding", default="full",
+        help="codificação do deck no prompt: full, compact, questions ou truncated "
+             "(questions/truncated só com --mode audit; padrão: full)"
+    )
+    review.add_argument(
+        "--cache", default=None,
+        help="arquivo do cache de revisões (padrão: DATA_DIR/review_cache.sqlite3)"
+    )
+    review.add_argument(
+        "--no-cache", action="store_true",
+        help="revisa o deck inteiro, sem o cache de revisões"
+    )
+    review.add_argument(
+        "--no-dedup", action="store_true",
+        help="envia também duplicatas e quase duplicatas (padrão: ignora e as lista no evento "
+             "duplicates)"
+    )
+    review.add_argument("--report", default=None, help="grava o relatório da IA neste arquivo")
+
+    export = commands.add_parser(
+        "export", parents=[common, output],
+        help="converte e combina decks sem chamar a API"
+    )
+    export.add_argument("decks", nargs="+", help="decks (.apkg, .csv, .txt, .tsv) ou diretórios")
+    export.add_argument("--update", action="store_true", help="atualiza um .apkg existente")
+    export.add_argument(
+        "--partition", default=None,
+        help="divide o .apkg em subdecks: source, tag, cluster ou size"
+    )
+    export.add_argument("--partition-size", type=int, default=None, help="cards por parte (regra size)")
+    export.add_argument("--separate", action="store_true", help="um pacote por subdeck")
+
+    serve = commands.add_parser(
+        "serve", parents=[common],
+        help="serviço HTTP local de tarefas (ver server.py)"
+    )
+    serve.add_argument("--host", default="127.0.0.1", help="endereço de escuta (padrão: 127.0.0.1)")
+    serve.add_argument("--port", type=int, default=8765, help="porta (padrão: 8765)")
+    serve.add_argument(
+        "--db", default=None,
+        help="tabela de tarefas SQLite (padrão: DATA_DIR/jobs.sqlite3)"
+    )
+
+    watch = commands.add_parser(
+        "watch", parents=[common],
+        help="observa pastas e converte textos novos ou alterados em decks (ver watcher.py)"
+    )
+    watch.add_argument("directories", nargs="+", help="pastas observadas")
+    watch.add_argument(
+        "--format", "-f", dest="fmt", default="anki_apkg",
+        help="formato dos decks gravados ao lado dos textos (padrão: anki_apkg)"
+    )
+    watch.add_argument(
+        "--quantity", "-n", default="AUTO",
+        help="cards por texto ou AUTO (padrão: AUTO)"
+    )
+    watch.add_argument("--hard", action="store_true", help="prompt focado em aplicação")
+    watch.add_argument("--no-refine", action="store_true", help="não refina os cards gerados")
+    watch.add_argument(
+        "--interval", type=float, default=2.0,
+        help="segundos entre varreduras (padrão: 2)"
+    )
+    watch.add_argument(
+        "--debounce", type=float, default=3.0,
+        help="segundos sem alterações antes de processar um arquivo (padrão: 3)"
+    )
+    watch.add_argument("--no-recursive", action="store_true", help="ignora subpastas")
+    watch.add_argument(
+        "--ledger", default=None,
+        help="registro de arquivos convertidos (padrão: DATA_DIR/ingest_ledger.sqlite3)"
+    )
+    watch.add_argument(
+        "--once", action="store_true",
+        help="processa o que mudou, espera as conversões e sai (para cron)"
+    )
+
+    return parser
+
+
+def _configure_environment(args: argparse.Namespace) -> None:
+    """
+    Aplica as opções lidas pelos módulos de configuração na importação.
+
+    Precisa rodar antes de importar config/core: o pool de tarefas e o
+    semáforo de requisições são dimensionados uma única vez.
+    """
+    if args.workers is not None:
+        os.environ["ANKILAB_WORKERS"] = str(max(1, args.workers))
+    if args.max_requests is not None:
+        os.environ["ANKILAB_MAX_REQUESTS"] = str(max(1, args.max_requests))
+    elif args.workers is not None and "ANKILAB_MAX_REQUESTS" not in os.environ:
+        # Sem limite explícito da conta, cada worker pode ter sua chamada
+        os.environ["ANKILAB_MAX_REQUESTS"] = str(max(1, args.workers))
+
+
+def _select_profile(name: Optional[str]) -> None:
+    """Escolhe o perfil de modelos desta execução (e valida o ANKILAB_PROFILE)."""
+    from config import ProfileError, get_profiles
+    if name is not None:
+        # --profile prevalece sobre um ANKILAB_PROFILE (talvez inválido) do ambiente
+        os.environ["ANKILAB_PROFILE"] = name
+    try:
+        profiles = get_profiles()
+        if name is not None:
+            profiles.select(name)
+    except ProfileError as e:
+        raise CommandError(str(e))
+
+
+def _require_api_key() -> None:
+    """Falha cedo, antes de enfileirar tarefas, se não houver API Key."""
+    if not os.getenv("OPENAI_API_KEY"):
+        raise CommandError("Defina a variável de ambiente OPENAI_API_KEY.")
+
+
+def _export_target(args: argparse.Namespace, default_name: str):
+    """
+    Monta o destino da exportação a partir de --output/--format.
+
+    Raises:
+        CommandError: Sem --output ou com formato desconhecido.
+    """
+    from utils.export_worker import EXPORT_FORMATS, ExportTarget
+
+    if not args.output:
+        raise CommandError("Informe o arquivo de saída (--output).")
+
+    fmt = args.fmt or _FORMAT_BY_EXTENSION.get(os.path.splitext(args.output)[1].lower())
+    if fmt not in EXPORT_FORMATS:
+        raise CommandError(
+            f"Formato de saída desconhecido: {args.fmt or args.output} "
+            f"(use --format {', '.join(EXPORT_FORMATS)})"
+        )
+
+    options = {}
+    if getattr(args, "partition", None):
+        options["partition"] = args.partition
+        options["separate"] = args.separate
+        if args.partition_size:
+            options["partition_size"] = args.partition_size
+
+    return ExportTarget(
+        fmt, args.output,
+        deck_name=args.deck_name or default_name,
+        update=getattr(args, "update", False),
+        **options
+    )
+
+
+# ==============================================================================
+# EXECUÇÃO
+# ==============================================================================
+
+def _run_jobs(
+    events: EventWriter,
+    kind: str,
+    tasks: Sequence[Tuple[str, Callable[[], Any]]]
+) -> List:
+    """
+    Executa as tarefas na fila e espera todas terminarem.
+
+    Cada mudança de estado vira um evento "job". Ctrl+C cancela as tarefas
+    ainda na fila (as em execução são abandonadas com o processo).
+
+    Args:
+        events: Saída dos eventos.
+        kind: Tipo das tarefas.
+        tasks: Pares (descrição, função).
+
+    Returns:
+        As tarefas, na ordem de `tasks`.
+    """
+    from core.jobs import JobQueue
+
+    queue = JobQueue()
+    finished = threading.Semaphore(0)
+
+    def on_change(job) -> None:
+        fields = {
+            "id": job.id, "kind": job.kind, "label": job.label, "state": job.state,
+            "wait": round(job.wait_time, 3),
+        }
+        if job.run_time is not None:
+            fields["run"] = round(job.run_time, 3)
+        if job.error is not None:
+            fields["error"] = f"{type(job.error).__name__}: {job.error}"
+        events.emit("job", **fields)
+
+    queue.add_listener(on_change)
+    jobs = [
+        queue.submit(kind, label, fn, on_finish=lambda job: finished.release())
+        for label, fn in tasks
+    ]
+
+    try:
+        for _ in jobs:
+            finished.acquire()
+    except KeyboardInterrupt:
+        for job in jobs:
+            queue.cancel(job.id)
+        raise
+
+    return jobs
+
+
+def _export(events: EventWriter, cards, target) -> Dict:
+    """Grava os cards no destino, emitindo eventos "export"."""
+    from utils.export_worker import run_exports
+
+    def progress(p) -> None:
+        events.emit(
+            "export", format=p.target.fmt, done=p.done, total=p.total,
+            bytes=p.bytes_written
+        )
+
+    result = run_exports(cards, [target], progress_callback=progress)[0]
+    return {"output": result["paths"], "stats": result["stats"]}
+
+
+def _load_decks(events: EventWriter, inputs: Sequence[str], workers: Optional[int]):
+    """
+    Importa e combina os decks, emitindo um evento "load" por arquivo.
+
+    Raises:
+        CommandError: Se nenhum card for carregado.
+    """
+    from core.importer import import_files
+
+    def progress(result: Dict, done: int, total: int) -> None:
+        events.emit(
+            "load", path=result["path"], cards=result["count"],
+            done=done, total=total, error=result["error"]
+        )
+
+    cards, stats = import_files(inputs, max_workers=workers, progress_callback=progress)
+    if not cards:
+        raise CommandError("Nenhum card carregado dos arquivos informados.")
+    return cards, stats
+
+
+def _read_text(path: str) -> str:
+    """Lê um texto-fonte (arquivo ou '-' para stdin)."""
+    if path == STDIN:
+        return sys.stdin.read()
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        return f.read()
+
+
+def _job_failures(jobs) -> int:
+    from core.jobs import DONE
+    return sum(1 for job in jobs if job.state != DONE)
+
+
+# ==============================================================================
+# SUBCOMANDOS
+# ==============================================================================
+
+def cmd_generate(args: argparse.Namespace, events: EventWriter) -> int:
+    """Gera cards de cada texto em paralelo e grava um único deck."""
+    from core import CardStore, expand_import_paths, generate_cards, refine_cards
+    from core.importer import TEXT_EXTENSIONS
+
+    target = _export_target(args, "AnkiLab")
+    _require_api_key()
+
+    # stdin é lido aqui (uma única vez); arquivos, dentro de cada tarefa
+    stdin_text = _read_text(STDIN) if STDIN in args.inputs else None
+    paths = expand_import_paths(
+        [p for p in args.inputs if p != STDIN], extensions=TEXT_EXTENSIONS
+    )
+    if stdin_text is not None:
+        paths.insert(args.inputs.index(STDIN), STDIN)
+    if not paths:
+        raise CommandError("Nenhum texto encontrado nas entradas informadas.")
+
+    def make_task(path: str) -> Callable[[], List[Dict[str, str]]]:
+        def tarefa():
+            texto = (stdin_text if path == STDIN else _read_text(path)).strip()
+            if not texto:
+                raise ValueError("texto vazio")
+            cards = generate_cards(texto, args.quantity, args.hard)
+            if args.refine and cards:
+                cards = refine_cards(texto, cards, args.hard)
+            return cards
+        return tarefa
+
+    events.emit("start", command="generate", total=len(paths))
+    jobs = _run_jobs(
+        events, "generation",
+        [("stdin" if p == STDIN else p, make_task(p)) for p in paths]
+    )
+
+    cards = CardStore()
+    for path, job in zip(paths, jobs):
+        if job.result:
+            source = "stdin" if path == STDIN else os.path.basename(path)
+            for card in job.result:
+                cards.append(card["q"], card["a"], source)
+
+    failed = _job_failures(jobs)
+    if not cards:
+        raise CommandError("Nenhum card gerado.")
+
+    written = _export(events, cards, target)
+    events.emit("done", command="generate", cards=len(cards), failed=failed, **written)
+    return 1 if failed else 0
+
+
+def cmd_refine(args: argparse.Namespace, events: EventWriter) -> int:
+    """Refina os decks em lotes paralelos e grava o resultado."""
+    from core import refine_cards
+
+    target = _export_target(args, "AnkiLab")
+    _require_api_key()
+
+    texto = _read_text(args.source).strip() if args.source else ""
+    cards, _ = _load_decks(events, args.decks, args.workers)
+
+    size = max(1, args.batch_size)
+    batches = [cards[i:i + size] for i in range(0, len(cards), size)]
+
+    def make_task(batch) -> Callable[[], List[Dict[str, str]]]:
+        return lambda: refine_cards(texto, batch.to_dicts(), args.hard)
+
+    events.emit("start", command="refine", cards=len(cards), total=len(batches))
+    jobs = _run_jobs(
+        events, "refinement",
+        [(f"Lote {i + 1}/{len(batches)} ({len(b)} cards)", make_task(b))
+         for i, b in enumerate(batches)]
+    )
+
+    # Lotes com erro mantêm os cards originais
+    refined = []
+    for batch, job in zip(batches, jobs):
+        refined.extend(job.result if job.result else batch.to_dicts())
+
+    failed = _job_failures(jobs)
+    written = _export(events, refined, target)
+    events.emit("done", command="refine", cards=len(refined), failed=failed, **written)
+    return 1 if failed else 0
+
+
+def cmd_review(args: argparse.Namespace, events: EventWriter) -> int:
+    """Revisa os decks (combinados) e grava os cards e o relatório."""
+    from core import (
+        ReviewCache,
+        check_encoding_mode,
+        dedup_cards,
+        describe_duplicates,
+        encode_deck,
+        extract_cards_from_review,
+        extract_new_cards_from_audit,
+        extract_report_from_review,
+        plan_incremental_review,
+        review_deck,
+        split_review_sections,
+    )
+
+    try:
+        check_encoding_mode(args.encoding, args.mode)
+    except ValueError as e:
+        raise CommandError(str(e))
+    target = _export_target(args, args.subject) if args.output else None
+    if target is None and not args.report:
+        raise CommandError("Informe --output e/ou --report.")
+    _require_api_key()
+
+    deck, _ = _load_decks(events, args.decks, args.workers)
+    cache = None if args.no_cache else ReviewCache(args.cache)
+
+    def tarefa():
+        cards, duplicates = (deck, []) if args.no_dedup else dedup_cards(deck)
+        if duplicates:
+            events.emit("duplicates", cards=describe_duplicates(duplicates))
+        plan = None
+        if cache is not None:
+            plan = plan_incremental_review(cache, args.subject, args.mode, cards)
+            events.emit(
+                "plan", changed=len(plan.changed), cached=len(plan.cached),
+                duplicates=len(duplicates)
+            )
+            if not plan.changed:
+                return plan, [], ""
+            encoded = plan.build_prompt_deck(args.encoding)
+        else:
+            encoded = encode_deck(cards, args.encoding)
+
+        response = review_deck(args.subject, encoded.text, args.mode)
+        sections = split_review_sections(response)
+        if args.mode == "audit":
+            return plan, extract_new_cards_from_audit(sections), response
+        return plan, extract_cards_from_review(sections), extract_report_from_review(sections)
+
+    mode_txt = "Auditoria" if args.mode == "audit" else "Revisão final"
+    events.emit("start", command="review", cards=len(deck), total=1)
+    job, = _run_jobs(events, "review", [(f"{mode_txt}: {args.subject}", tarefa)])
+    if _job_failures([job]):
+        return 1
+
+    plan, result_cards, report = job.result
+    if plan is not None:
+        plan.commit(cache, result_cards)
+        result_cards = plan.merge(result_cards)
+
+    written: Dict = {}
+    if args.report and report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            f.write(report)
+        written["report"] = args.report
+    if target is not None and result_cards:
+        written.update(_export(events, result_cards, target))
+
+    events.emit("done", command="review", cards=len(result_cards), failed=0, **written)
+    return 0
+
+
+def cmd_export(args: argparse.Namespace, events: EventWriter) -> int:
+    """Combina os decks e grava no formato pedido (sem API)."""
+    target = _export_target(args, "AnkiLab")
+    cards, stats = _load_decks(events, args.decks, args.workers)
+
+    events.emit("start", command="export", cards=len(cards), total=stats["files"])
+    written = _export(events, cards, target)
+    events.emit(
+        "done", command="export", cards=len(cards), failed=stats["files_failed"], **written
+    )
+    return 1 if stats["files_failed"] else 0
+
+
+def cmd_serve(args: argparse.Namespace, events: EventWriter) -> int:
+    """Atende pedidos HTTP até Ctrl+C, emitindo um evento por mudança de estado."""
+    from core.job_store import JobStore
+    from server import JobService, create_server
+
+    _require_api_key()
+    store = JobStore(args.db)
+
+    def on_change(job_id: int, kind: str, state: str, error: Optional[str]) -> None:
+        fields = {"id": job_id, "kind": kind, "state": state}
+        if error is not None:
+            fields["error"] = error
+        events.emit("job", **fields)
+
+    service = JobService(store, on_change=on_change)
+    server = create_server(service, args.host, args.port)
+    service.start()
+
+    host, port = server.server_address[:2]
+    events.emit(
+        "serving", url=f"http://{host}:{port}", workers=service.workers,
+        db=store.path, requeued=store.requeued
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.stop()
+        store.close()
+
+    events.emit("stopped")
+    return 0
+
+
+def cmd_watch(args: argparse.Namespace, events: EventWriter) -> int:
+    """Converte os textos das pastas em decks até Ctrl+C (ou uma vez, com --once)."""
+    from core.ingest_ledger import IngestLedger
+    from utils.export_worker import EXPORT_FORMATS
+    from watcher import FolderWatcher
+
+    if args.fmt not in EXPORT_FORMATS:
+        raise CommandError(
+            f"Formato de saída desconhecido: {args.fmt} (use {', '.join(EXPORT_FORMATS)})"
+        )
+    missing = [d for d in args.directories if not os.path.isdir(d)]
+    if missing:
+        raise CommandError(f"Pasta inexistente: {', '.join(missing)}")
+    _require_api_key()
+
+    ledger = IngestLedger(args.ledger)
+    watcher = FolderWatcher(
+        args.directories, ledger,
+        fmt=args.fmt, quantity=args.quantity, hard=args.hard,
+        refine=not args.no_refine, debounce=args.debounce,
+        recursive=not args.no_recursive, on_event=events.emit
+    )
+    events.emit(
+        "watching", directories=args.directories, ledger=ledger.path,
+        workers=watcher.queue.max_workers
+    )
+
+    try:
+        watcher.run(args.interval, once=args.once)
+    except KeyboardInterrupt:
+        # Conversões em andamento são abandonadas; o registro não as marca
+        # como feitas, então recomeçam no próximo início
+        pass
+
+    events.emit("stopped", failed=watcher.failed)
+    return 1 if args.once and watcher.failed else 0
+
+
+COMMANDS = {
+    "generate": cmd_generate,
+    "refine": cmd_refine,
+    "review": cmd_review,
+    "export": cmd_export,
+    "serve": cmd_serve,
+    "watch": cmd_watch,
+}
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Ponto de entrada do comando `ankilab`.
+
+    Args:
+        argv: Argumentos (padrão: sys.argv[1:]).
+
+    Returns:
+        Código de saída.
+    """
+    args = build_parser().parse_args(argv)
+    _configure_environment(args)
+
+    events = EventWriter(sys.stdout)
+
+    # Prints de diagnóstico das bibliotecas não se misturam aos eventos
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            _select_profile(args.profile)
+            return COMMANDS[args.command](args, events)
+        except CommandError as e:
+            events.emit("error", message=str(e))
+            return 1
+        except KeyboardInterrupt:
+            events.emit("error", message="interrompido")
+            return 130
+        except Exception as e:
+            events.emit("error", message=f"{type(e).__name__}: {e}")
+            return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
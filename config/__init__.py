@@ -10,6 +10,9 @@ from .settings import (
     APP_NAME,
     APP_VERSION,
     APP_TAGLINE,
+    DATA_DIR,
+    JOB_WORKERS,
+    MAX_CONCURRENT_REQUESTS,
     MODEL_NAME,
     MODEL_REFINEMENT,
     MODEL_ADVANCED,
@@ -34,6 +37,14 @@ from .settings import (
     MAX_OUTPUT_TOKENS_REVIEW,
 )
 
+from .profiles import (
+    ModelParams,
+    ProfileError,
+    ProfileManager,
+    get_profiles,
+    get_model_params,
+)
+
 from .prompts import (
     PROMPT_NORMAL,
     PROMPT_HARD,
@@ -46,12 +57,20 @@ __all__ = [
     "APP_NAME",
     "APP_VERSION", 
     "APP_TAGLINE",
+    "DATA_DIR",
+    "JOB_WORKERS",
+    "MAX_CONCURRENT_REQUESTS",
     "MODEL_NAME",
     "MODEL_REFINEMENT",
     "MODEL_ADVANCED",
     "get_openai_client",
     "is_gpt5_model",
     "get_model_config",
+    "ModelParams",
+    "ProfileError",
+    "ProfileManager",
+    "get_profiles",
+    "get_model_params",
     "PROMPT_NORMAL",
     "PROMPT_HARD",
     "REFINE_PROMPT",
@@ -0,0 +1,432 @@
+# -*- coding: utf-8 -*-
+"""
+Perfis de Modelo
+================
+
+Perfis com o modelo e os parâmetros de cada tarefa (geração, refinamento e
+revisão), carregados de um arquivo TOML ou JSON fora do código e validados
+contra MODEL_CONFIG.
+
+Perfis embutidos (sempre disponíveis):
+  • padrao     → constantes de config/settings.py
+  • premium    → GPT-5 de máxima qualidade
+  • economica  → GPT-5 de menor custo
+  • gpt4       → família GPT-4 (Chat Completions API)
+
+Arquivo (DATA_DIR/profiles.toml, ou ANKILAB_PROFILES=caminho):
+
+    active = "economica"
+
+    [profiles.pico]
+    generation = { model = "gpt-5-nano", reasoning_effort = "low" }
+    refinement = { model = "gpt-5-nano" }
+    review = { model = "gpt-5-mini", max_output_tokens = 12000 }
+
+Campos omitidos numa tarefa vêm do perfil "padrao". O perfil ativo é, em
+ordem: ANKILAB_PROFILE (por execução), `active` do arquivo, "padrao".
+O arquivo é relido quando muda (verificação por mtime), sem reiniciar; um
+arquivo inválido é ignorado e o último perfil válido continua em uso.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from .settings import (
+    DATA_DIR,
+    MODEL_CONFIG,
+    MODEL_NAME,
+    MODEL_REFINEMENT,
+    MODEL_ADVANCED,
+    GENERATION_TEMPERATURE,
+    REFINEMENT_TEMPERATURE,
+    REVIEW_TEMPERATURE,
+    MAX_TOKENS_GENERATION,
+    MAX_TOKENS_REVIEW,
+    REASONING_EFFORT_GENERATION,
+    REASONING_EFFORT_REFINEMENT,
+    REASONING_EFFORT_REVIEW,
+    VERBOSITY_GENERATION,
+    VERBOSITY_REFINEMENT,
+    VERBOSITY_REVIEW,
+    MAX_OUTPUT_TOKENS_GENERATION,
+    MAX_OUTPUT_TOKENS_REFINEMENT,
+    MAX_OUTPUT_TOKENS_REVIEW,
+    get_model_config,
+)
+
+
+# Tarefas configuráveis por perfil
+TASKS = ("generation", "refinement", "review")
+
+DEFAULT_PROFILE = "padrao"
+
+VERBOSITY_LEVELS = ("low", "medium", "high")
+
+# Intervalo mínimo entre verificações do arquivo (segundos)
+RELOAD_INTERVAL = 1.0
+
+
+class ProfileError(ValueError):
+    """Perfil ou arquivo de perfis inválido."""
+
+
+class ModelParams(NamedTuple):
+    """Modelo e parâmetros de uma tarefa."""
+
+    model: str
+    # Parâmetros GPT-4
+    temperature: float
+    max_tokens: int
+    # Parâmetros GPT-5
+    reasoning_effort: str
+    verbosity: str
+    max_output_tokens: int
+
+
+_DEFAULTS = {
+    "generation": ModelParams(
+        MODEL_NAME, GENERATION_TEMPERATURE, MAX_TOKENS_GENERATION,
+        REASONING_EFFORT_GENERATION, VERBOSITY_GENERATION, MAX_OUTPUT_TOKENS_GENERATION,
+    ),
+    "refinement": ModelParams(
+        MODEL_REFINEMENT, REFINEMENT_TEMPERATURE, MAX_TOKENS_GENERATION,
+        REASONING_EFFORT_REFINEMENT, VERBOSITY_REFINEMENT, MAX_OUTPUT_TOKENS_REFINEMENT,
+    ),
+    "review": ModelParams(
+        MODEL_ADVANCED, REVIEW_TEMPERATURE, MAX_TOKENS_REVIEW,
+        REASONING_EFFORT_REVIEW, VERBOSITY_REVIEW, MAX_OUTPUT_TOKENS_REVIEW,
+    ),
+}
+
+# Alternativas antes comentadas em config/settings.py
+BUILTIN_PROFILES: Dict[str, Dict[str, ModelParams]] = {
+    DEFAULT_PROFILE: _DEFAULTS,
+    "premium": {
+        "generation": _DEFAULTS["generation"]._replace(model="gpt-5.1"),
+        "refinement": _DEFAULTS["refinement"]._replace(model="gpt-5-mini"),
+        "review": _DEFAULTS["review"]._replace(model="gpt-5.2"),
+    },
+    "economica": {
+        "generation": _DEFAULTS["generation"]._replace(model="gpt-5-nano"),
+        "refinement": _DEFAULTS["refinement"]._replace(model="gpt-5-nano"),
+        "review": _DEFAULTS["review"]._replace(model="gpt-5-mini"),
+    },
+    "gpt4": {
+        "generation": _DEFAULTS["generation"]._replace(model="gpt-4.1-mini"),
+        "refinement": _DEFAULTS["refinement"]._replace(model="gpt-4o-mini"),
+        "review": _DEFAULTS["review"]._replace(model="gpt-4o"),
+    },
+}
+
+
+# ==============================================================================
+# VALIDAÇÃO
+# ==============================================================================
+
+def _known_model(model: str) -> bool:
+    """Modelo presente em MODEL_CONFIG (ou versão datada, ex: "gpt-5.2-2025-12-11")."""
+    return any(model == key or model.startswith(f"{key}-") for key in MODEL_CONFIG)
+
+
+def validate_params(params: ModelParams, where: str = "") -> None:
+    """
+    Valida os parâmetros de uma tarefa contra MODEL_CONFIG.
+
+    Args:
+        params: Parâmetros da tarefa.
+        where: Contexto para a mensagem de erro (ex: "premium.review").
+
+    Raises:
+        ProfileError: Se algum valor não for suportado pelo modelo.
+    """
+    prefix = f"{where}: " if where else ""
+
+    if not _known_model(params.model):
+        raise ProfileError(f"{prefix}modelo desconhecido: {params.model}")
+
+    config = get_model_config(params.model)
+    max_output = config["max_output"]
+
+    if config["is_gpt5"]:
+        efforts = config["reasoning_effort"] or []
+        if params.reasoning_effort not in efforts:
+            raise ProfileError(
+                f"{prefix}reasoning_effort {params.reasoning_effort!r} não suportado por "
+                f"{params.model} (use {', '.join(efforts)})"
+            )
+        if params.verbosity not in VERBOSITY_LEVELS:
+            raise ProfileError(
+                f"{prefix}verbosity deve ser {', '.join(VERBOSITY_LEVELS)}"
+            )
+        if not 0 < params.max_output_tokens <= max_output:
+            raise ProfileError(
+                f"{prefix}max_output_tokens deve estar entre 1 e {max_output} para {params.model}"
+            )
+    else:
+        if not 0 <= params.temperature <= 2:
+            raise ProfileError(f"{prefix}temperature deve estar entre 0 e 2")
+        if not 0 < params.max_tokens <= max_output:
+            raise ProfileError(
+                f"{prefix}max_tokens deve estar entre 1 e {max_output} para {params.model}"
+            )
+
+
+def parse_profiles(data: Dict) -> Tuple[Dict[str, Dict[str, ModelParams]], Optional[str]]:
+    """
+    Converte e valida o conteúdo do arquivo de perfis.
+
+    Args:
+        data: Conteúdo lido do TOML/JSON.
+
+    Returns:
+        Tuple com (perfis do arquivo, perfil ativo declarado ou None).
+
+    Raises:
+        ProfileError: Se a estrutura ou algum valor for inválido.
+    """
+    if not isinstance(data, dict):
+        raise ProfileError("o arquivo deve conter uma tabela/objeto")
+
+    unknown = set(data) - {"active", "profiles"}
+    if unknown:
+        raise ProfileError(f"chaves desconhecidas: {', '.join(sorted(unknown))}")
+
+    active = data.get("active")
+    if active is not None and not isinstance(active, str):
+        raise ProfileError("active deve ser o nome de um perfil")
+
+    raw_profiles = data.get("profiles", {})
+    if not isinstance(raw_profiles, dict):
+        raise ProfileError("profiles deve ser uma tabela de perfis")
+
+    profiles = {}
+    for name, tasks in raw_profiles.items():
+        if not isinstance(tasks, dict):
+            raise ProfileError(f"{name}: o perfil deve ser uma tabela de tarefas")
+        unknown = set(tasks) - set(TASKS)
+        if unknown:
+            raise ProfileError(
+                f"{name}: tarefas desconhecidas: {', '.join(sorted(unknown))} "
+                f"(use {', '.join(TASKS)})"
+            )
+
+        profile = {}
+        for task in TASKS:
+            values = tasks.get(task, {})
+            if not isinstance(values, dict):
+                raise ProfileError(f"{name}.{task}: deve ser uma tabela de parâmetros")
+            unknown = set(values) - set(ModelParams._fields)
+            if unknown:
+                raise ProfileError(
+                    f"{name}.{task}: parâmetros desconhecidos: {', '.join(sorted(unknown))}"
+                )
+
+            base = _DEFAULTS[task]
+            try:
+                params = base._replace(**{
+                    field: type(getattr(base, field))(value)
+                    for field, value in values.items()
+                })
+            except (TypeError, ValueError) as e:
+                raise ProfileError(f"{name}.{task}: valor inválido ({e})")
+
+            validate_params(params, f"{name}.{task}")
+            profile[task] = params
+        profiles[name] = profile
+
+    known = set(BUILTIN_PROFILES) | set(profiles)
+    if active is not None and active not in known:
+        raise ProfileError(f"perfil ativo inexistente: {active}")
+
+    return profiles, active
+
+
+def _read_file(path: str) -> Dict:
+    """Lê o arquivo de perfis (TOML ou JSON, pela extensão)."""
+    if path.lower().endswith(".json"):
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    import tomllib
+    with open(path, "rb") as f:
+        return tomllib.load(f)
+
+
+# ==============================================================================
+# GERENCIADOR
+# ==============================================================================
+
+class ProfileManager:
+    """
+    Perfis embutidos + arquivo de perfis, com recarga automática.
+
+    Uso:
+        params = get_profiles().params("generation")
+        params.model, params.temperature, ...
+    """
+
+    def __init__(self, path: Optional[str] = None, selected: Optional[str] = None):
+        """
+        Inicializa o gerenciador (o arquivo é lido no primeiro acesso, ou já
+        aqui quando há um perfil escolhido, para validá-lo).
+
+        Args:
+            path: Arquivo de perfis (padrão: ANKILAB_PROFILES ou
+                DATA_DIR/profiles.toml).
+            selected: Perfil escolhido para esta execução (padrão:
+                ANKILAB_PROFILE).
+
+        Raises:
+            ProfileError: Se o perfil escolhido não existir (como em `select`).
+        """
+        self.path = path or os.getenv("ANKILAB_PROFILES") or os.path.join(
+            DATA_DIR, "profiles.toml"
+        )
+        self._selected = selected or os.getenv("ANKILAB_PROFILE") or None
+        self._lock = threading.Lock()
+
+        self._file_profiles: Dict[str, Dict[str, ModelParams]] = {}
+        self._file_active: Optional[str] = None
+        self._mtime: Optional[float] = None
+        self._checked = 0.0
+        self.error: Optional[str] = None
+        self.version = 0
+
+        if self._selected is not None:
+            self.select(self._selected)
+
+    def _refresh(self) -> None:
+        """Relê o arquivo se o mtime mudou (no máximo a cada RELOAD_INTERVAL)."""
+        now = time.monotonic()
+        if self._checked and now - self._checked < RELOAD_INTERVAL:
+            return
+        self._checked = now
+
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except FileNotFoundError:
+            mtime = None
+        except OSError as e:
+            print(f"[ProfileManager] Erro: {e}")
+            return
+
+        if mtime == self._mtime:
+            return
+        self._mtime = mtime
+
+        if mtime is None:
+            profiles, active, error = {}, None, None
+        else:
+            try:
+                profiles, active = parse_profiles(_read_file(self.path))
+                error = None
+            except (OSError, ValueError) as e:
+                # Arquivo inválido: mantém o último conjunto válido
+                self.error = f"{os.path.basename(self.path)}: {e}"
+                print(f"[ProfileManager] Perfis ignorados: {self.error}")
+                return
+
+        self._file_profiles, self._file_active, self.error = profiles, active, error
+        self.version += 1
+
+    def names(self) -> List[str]:
+        """
+        Lista os perfis disponíveis.
+
+        Returns:
+            Nomes dos perfis embutidos seguidos dos perfis do arquivo.
+        """
+        with self._lock:
+            self._refresh()
+            return list(BUILTIN_PROFILES) + [
+                name for name in self._file_profiles if name not in BUILTIN_PROFILES
+            ]
+
+    def select(self, name: Optional[str]) -> None:
+        """
+        Escolhe o perfil desta execução (None volta ao `active` do arquivo).
+
+        Args:
+            name: Nome do perfil.
+
+        Raises:
+            ProfileError: Se o perfil não existir.
+        """
+        if name is not None and name not in self.names():
+            raise ProfileError(f"perfil inexistente: {name}")
+        with self._lock:
+            self._selected = name
+            self.version += 1
+
+    @property
+    def active(self) -> str:
+        """Nome do perfil em uso."""
+        with self._lock:
+            self._refresh()
+            return self._active_name()
+
+    def _active_name(self) -> str:
+        for name in (self._selected, self._file_active):
+            if name and (name in self._file_profiles or name in BUILTIN_PROFILES):
+                return name
+        return DEFAULT_PROFILE
+
+    def params(self, task: str) -> ModelParams:
+        """
+        Retorna o modelo e os parâmetros de uma tarefa no perfil em uso.
+
+        Args:
+            task: "generation", "refinement" ou "review".
+
+        Returns:
+            ModelParams da tarefa.
+
+        Raises:
+            ProfileError: Se a tarefa não existir.
+        """
+        if task not in TASKS:
+            raise ProfileError(f"tarefa desconhecida: {task}")
+
+        with self._lock:
+            self._refresh()
+            name = self._active_name()
+            profile = self._file_profiles.get(name) or BUILTIN_PROFILES[name]
+            return profile[task]
+
+
+_profiles: Optional[ProfileManager] = None
+_profiles_lock = threading.Lock()
+
+
+def get_profiles() -> ProfileManager:
+    """
+    Retorna o gerenciador de perfis padrão (criado uma única vez).
+
+    Returns:
+        Instância compartilhada de ProfileManager.
+    """
+    global _profiles
+    with _profiles_lock:
+        if _profiles is None:
+            _profiles = ProfileManager()
+        return _profiles
+
+
+def get_model_params(task: str) -> ModelParams:
+    """
+    Atalho para `get_profiles().params(task)`.
+
+    Consultado a cada chamada à API (core.api), para que a troca de perfil e
+    as edições no arquivo de perfis valham já na próxima chamada, sem
+    reiniciar.
+
+    Args:
+        task: "generation", "refinement" ou "review".
+
+    Returns:
+        ModelParams da tarefa no perfil em uso.
+    """
+    return get_profiles().params(task)
@@ -29,7 +29,13 @@ REASONING EFFORT (GPT-5):
 """
 
 import os
-from openai import OpenAI
+import threading
+from typing import TYPE_CHECKING
+
+# O SDK da OpenAI leva centenas de ms para importar: só é carregado no
+# primeiro uso do cliente (ver get_openai_client)
+if TYPE_CHECKING:
+    from openai import OpenAI
 
 
 # ==============================================================================
@@ -40,36 +46,55 @@ APP_NAME = "AnkiLab"
 APP_VERSION = "v3.1"
 APP_TAGLINE = "Cognitive Flashcard Engine"
 
+# Diretório de dados locais (caches, registros). Sobrescreva com ANKILAB_HOME.
+DATA_DIR = os.getenv("ANKILAB_HOME") or os.path.join(os.path.expanduser("~"), ".ankilab")
+
 
 # ==============================================================================
-# CONFIGURAÇÃO DE MODELOS
+# FILA DE TAREFAS
 # ==============================================================================
 
-# ┌─────────────────────────────────────────────────────────────────────────────┐
-# │ CONFIGURAÇÃO ATIVA - GPT-5 Family                                           │
-# └─────────────────────────────────────────────────────────────────────────────┘
+def _env_int(name: str, default: int) -> int:
+    """
+    Lê um inteiro positivo de uma variável de ambiente.
+    
+    Valores inválidos não impedem a inicialização: o padrão é usado e um
+    aviso cita a variável.
+    
+    Args:
+        name: Nome da variável de ambiente.
+        default: Valor usado se ela estiver ausente ou inválida.
+    
+    Returns:
+        Valor lido (mínimo 1) ou o padrão.
+    """
+    raw = os.getenv(name)
+    if not raw or not raw.strip():
+        return default
+    try:
+        return max(1, int(raw))
+    except ValueError:
+        print(f"[settings] Aviso: {name}={raw!r} não é um número inteiro; usando {default}")
+        return default
+
 
-#MODEL_NAME = "gpt-5-mini"            # Geração principal (bom custo-benefício)
-#MODEL_REFINEMENT = "gpt-5-nano"      # Refinamento (rápido e barato)
-#MODEL_ADVANCED = "gpt-5.1"           # Revisão avançada (alta qualidade)
+# Tarefas (gerações e revisões) executadas ao mesmo tempo. Sobrescreva com
+# ANKILAB_WORKERS.
+JOB_WORKERS = _env_int("ANKILAB_WORKERS", 3)
 
-# ┌─────────────────────────────────────────────────────────────────────────────┐
-# │ ALTERNATIVAS GPT-5 (descomente conforme necessidade)                        │
-# └─────────────────────────────────────────────────────────────────────────────┘
+# Chamadas simultâneas à API, para respeitar o limite de requisições da
+# conta. Sobrescreva com ANKILAB_MAX_REQUESTS.
+MAX_CONCURRENT_REQUESTS = _env_int("ANKILAB_MAX_REQUESTS", 2)
 
-# Configuração PREMIUM (máxima qualidade, maior custo):
-# MODEL_NAME = "gpt-5.1"
-# MODEL_REFINEMENT = "gpt-5-mini"
-# MODEL_ADVANCED = "gpt-5.2"
 
-# Configuração ECONÔMICA (menor custo):
-# MODEL_NAME = "gpt-5-nano"
-# MODEL_REFINEMENT = "gpt-5-nano"
-# MODEL_ADVANCED = "gpt-5-mini"
+# ==============================================================================
+# CONFIGURAÇÃO DE MODELOS
+# ==============================================================================
 
-# ┌─────────────────────────────────────────────────────────────────────────────┐
-# │ CONFIGURAÇÃO LEGACY - GPT-4 Family (descomente para usar)                   │
-# └─────────────────────────────────────────────────────────────────────────────┘
+# Modelos e parâmetros abaixo formam o perfil "padrao". Para alternar entre
+# configurações (premium, economica, gpt4 ou perfis próprios) sem editar este
+# arquivo nem reiniciar, use os perfis de config/profiles.py
+# (DATA_DIR/profiles.toml ou ANKILAB_PROFILE=<nome>).
 
 MODEL_NAME = "gpt-4.1-mini"
 MODEL_REFINEMENT = "gpt-4o-mini"
@@ -224,12 +249,16 @@ def get_model_config(model_name: str) -> dict:
 # ==============================================================================
 
 _openai_client = None
+_openai_client_lock = threading.Lock()
 
 
-def get_openai_client() -> OpenAI:
+def get_openai_client() -> "OpenAI":
     """
     Retorna uma instância singleton do cliente OpenAI.
     
+    O pacote openai é importado na primeira chamada, fora da inicialização
+    da interface.
+    
     Returns:
         OpenAI: Cliente configurado com a API key do ambiente.
     
@@ -238,10 +267,13 @@ def get_openai_client() -> OpenAI:
     """
     global _openai_client
     
-    if _openai_client is None:
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise ValueError("OPENAI_API_KEY não configurada.")
-        _openai_client = OpenAI(api_key=api_key)
-    
-    return _openai_client
+    # Várias tarefas podem pedir o cliente ao mesmo tempo
+    with _openai_client_lock:
+        if _openai_client is None:
+            api_key = os.getenv("OPENAI_API_KEY")
+            if not api_key:
+                raise ValueError("OPENAI_API_KEY não configurada.")
+            from openai import OpenAI
+            _openai_client = OpenAI(api_key=api_key)
+        
+        return _openai_client
@@ -10,6 +10,7 @@ from .api import generate_cards, refine_cards, review_deck
 from .parser import (
     parse_cards,
     parse_csv_cards,
+    LoadCancelled,
     parse_apkg_cards,
     parse_flashcard_file,
     format_cards_for_export_tab,
@@ -19,6 +20,16 @@ from .parser import (
     extract_cards_from_review,
     extract_report_from_review,
 )
+from .cards import Card, CardStore
+from .dedup import MinHashIndex, dedup_cards, describe_duplicates
+from .sections import ReviewSections, split_review_sections
+from .encoding import DECK_ENCODINGS, check_encoding_mode, count_tokens, encode_deck, encoding_savings, resolve_card_refs
+from .importer import import_files, iter_import_files, expand_import_paths
+from .review_cache import ReviewCache, plan_incremental_review
+from .partition import PARTITION_RULES, available_partition_rules, partition_cards
+from .jobs import Job, JobQueue, get_job_queue
+from .job_store import JobStore
+from .ingest_ledger import IngestLedger
 
 __all__ = [
     "generate_cards",
@@ -26,6 +37,7 @@ __all__ = [
     "review_deck",
     "parse_cards",
     "parse_csv_cards",
+    "LoadCancelled",
     "parse_apkg_cards",
     "parse_flashcard_file",
     "format_cards_for_export_tab",
@@ -34,4 +46,30 @@ __all__ = [
     "extract_new_cards_from_audit",
     "extract_cards_from_review",
     "extract_report_from_review",
+    "Card",
+    "CardStore",
+    "MinHashIndex",
+    "dedup_cards",
+    "describe_duplicates",
+    "ReviewSections",
+    "split_review_sections",
+    "DECK_ENCODINGS",
+    "check_encoding_mode",
+    "count_tokens",
+    "encode_deck",
+    "encoding_savings",
+    "resolve_card_refs",
+    "import_files",
+    "iter_import_files",
+    "expand_import_paths",
+    "ReviewCache",
+    "plan_incremental_review",
+    "PARTITION_RULES",
+    "available_partition_rules",
+    "partition_cards",
+    "Job",
+    "JobQueue",
+    "get_job_queue",
+    "JobStore",
+    "IngestLedger",
 ]
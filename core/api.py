@@ -10,40 +10,29 @@ COMPATIBILIDADE:
 - GPT-4 Family: usa Chat Completions API (client.chat.completions.create)
 """
 
+import threading
 from string import Template
 from typing import List, Dict, Optional, Any
 
 from config import (
     get_openai_client,
-    MODEL_NAME,
-    MODEL_REFINEMENT,
-    MODEL_ADVANCED,
+    get_model_params,
+    MAX_CONCURRENT_REQUESTS,
     PROMPT_NORMAL,
     PROMPT_HARD,
     REFINE_PROMPT,
     PROMPT_AUDIT,
     PROMPT_FINAL_REVIEW,
     is_gpt5_model,
-    # Parâmetros GPT-4
-    GENERATION_TEMPERATURE,
-    REFINEMENT_TEMPERATURE,
-    REVIEW_TEMPERATURE,
-    MAX_TOKENS_GENERATION,
-    MAX_TOKENS_REVIEW,
-    # Parâmetros GPT-5
-    REASONING_EFFORT_GENERATION,
-    REASONING_EFFORT_REFINEMENT,
-    REASONING_EFFORT_REVIEW,
-    VERBOSITY_GENERATION,
-    VERBOSITY_REFINEMENT,
-    VERBOSITY_REVIEW,
-    MAX_OUTPUT_TOKENS_GENERATION,
-    MAX_OUTPUT_TOKENS_REFINEMENT,
-    MAX_OUTPUT_TOKENS_REVIEW,
 )
 from .parser import parse_cards, format_cards_for_refine
 
 
+# Limita as chamadas simultâneas quando várias tarefas da fila rodam juntas;
+# as excedentes esperam uma vaga em vez de estourar o limite de requisições
+_request_slots = threading.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
+
+
 def _call_gpt5_responses_api(
     client,
     model: str,
@@ -145,25 +134,26 @@ def _call_openai(
     """
     client = get_openai_client()
     
-    if is_gpt5_model(model):
-        return _call_gpt5_responses_api(
-            client=client,
-            model=model,
-            instructions=system_prompt,
-            user_input=user_message,
-            reasoning_effort=reasoning_effort,
-            verbosity=verbosity,
-            max_output_tokens=max_output_tokens,
-        )
-    else:
-        return _call_gpt4_chat_completions_api(
-            client=client,
-            model=model,
-            system_prompt=system_prompt,
-            user_message=user_message,
-            temperature=temperature,
-            max_tokens=max_tokens,
-        )
+    with _request_slots:
+        if is_gpt5_model(model):
+            return _call_gpt5_responses_api(
+                client=client,
+                model=model,
+                instructions=system_prompt,
+                user_input=user_message,
+                reasoning_effort=reasoning_effort,
+                verbosity=verbosity,
+                max_output_tokens=max_output_tokens,
+            )
+        else:
+            return _call_gpt4_chat_completions_api(
+                client=client,
+                model=model,
+                system_prompt=system_prompt,
+                user_message=user_message,
+                temperature=temperature,
+                max_tokens=max_tokens,
+            )
 
 
 def generate_cards(
@@ -197,17 +187,11 @@ def generate_cards(
     )
     
     # Chamada à API (roteamento automático)
+    params = get_model_params("generation")
     raw_content = _call_openai(
-        model=MODEL_NAME,
         system_prompt=prompt,
         user_message=texto,
-        # Parâmetros GPT-4
-        temperature=GENERATION_TEMPERATURE,
-        max_tokens=MAX_TOKENS_GENERATION,
-        # Parâmetros GPT-5
-        reasoning_effort=REASONING_EFFORT_GENERATION,
-        verbosity=VERBOSITY_GENERATION,
-        max_output_tokens=MAX_OUTPUT_TOKENS_GENERATION,
+        **params._asdict(),
     )
     
     cards = parse_cards(raw_content)
@@ -248,17 +232,11 @@ def refine_cards(
     )
     
     # Chamada à API (roteamento automático)
+    params = get_model_params("refinement")
     raw_content = _call_openai(
-        model=MODEL_REFINEMENT,
         system_prompt=prompt,
         user_message=cards_text,
-        # Parâmetros GPT-4
-        temperature=REFINEMENT_TEMPERATURE,
-        max_tokens=MAX_TOKENS_GENERATION,
-        # Parâmetros GPT-5
-        reasoning_effort=REASONING_EFFORT_REFINEMENT,
-        verbosity=VERBOSITY_REFINEMENT,
-        max_output_tokens=MAX_OUTPUT_TOKENS_REFINEMENT,
+        **params._asdict(),
     )
     
     refined = parse_cards(raw_content)
@@ -299,15 +277,9 @@ def review_deck(
     )
     
     # Chamada à API (roteamento automático)
+    params = get_model_params("review")
     return _call_openai(
-        model=MODEL_ADVANCED,
         system_prompt=prompt,
         user_message=cards_text,
-        # Parâmetros GPT-4
-        temperature=REVIEW_TEMPERATURE,
-        max_tokens=MAX_TOKENS_REVIEW,
-        # Parâmetros GPT-5
-        reasoning_effort=REASONING_EFFORT_REVIEW,
-        verbosity=VERBOSITY_REVIEW,
-        max_output_tokens=MAX_OUTPUT_TOKENS_REVIEW,
+        **params._asdict(),
     )
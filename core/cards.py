@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+"""
+Armazenamento Compacto de Flashcards
+====================================
+
+Substitui listas de dicionários {"q", "a"} por registros com __slots__,
+identificadores estáveis e fatias que compartilham os mesmos registros.
+
+Cada `Card` se comporta como um mapeamento somente leitura (card["q"],
+card.get("source")), então todas as funções que esperam dicionários
+aceitam um `CardStore` sem conversão.
+"""
+
+import hashlib
+import itertools
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+
+# Gerador global de IDs: únicos dentro do processo, preservados em fatias e views
+_id_counter = itertools.count(1)
+
+
+def content_hash(q: str, a: str) -> str:
+    """
+    Calcula o hash de conteúdo de um card (pergunta + resposta).
+
+    Args:
+        q: Pergunta.
+        a: Resposta.
+
+    Returns:
+        Hash hexadecimal de 16 caracteres, estável entre execuções.
+    """
+    data = f"{q}\x1f{a}".encode("utf-8")
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+class Card(Mapping):
+    """
+    Registro compacto de um flashcard.
+
+    Atributos:
+        id: Identificador estável do card.
+        q: Pergunta.
+        a: Resposta.
+        source: Origem do card (arquivo, chunk), opcional.
+        guid: GUID da nota no Anki (cards vindos de .apkg ou já exportados).
+        tags: Tags do Anki separadas por espaço, opcional.
+    """
+
+    __slots__ = ("id", "q", "a", "source", "guid", "tags")
+
+    def __init__(
+        self,
+        q: str,
+        a: str,
+        source: Optional[str] = None,
+        card_id: Optional[int] = None,
+        guid: Optional[str] = None,
+        tags: Optional[str] = None
+    ):
+        self.id = card_id if card_id is not None else next(_id_counter)
+        self.q = q
+        self.a = a
+        self.source = source
+        self.guid = guid
+        self.tags = tags
+
+    def _keys(self) -> tuple:
+        keys = ("q", "a")
+        if self.source is not None:
+            keys += ("source",)
+        if self.guid is not None:
+            keys += ("guid",)
+        if self.tags is not None:
+            keys += ("tags",)
+        return keys
+
+    def __getitem__(self, key: str) -> str:
+        if key == "q":
+            return self.q
+        if key == "a":
+            return self.a
+        if key == "source" and self.source is not None:
+            return self.source
+        if key == "guid" and self.guid is not None:
+            return self.guid
+        if key == "tags" and self.tags is not None:
+            return self.tags
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys())
+
+    def __len__(self) -> int:
+        return len(self._keys())
+
+    def __repr__(self) -> str:
+        return f"Card(id={self.id}, q={self.q!r}, a={self.a!r})"
+
+    @property
+    def content_hash(self) -> str:
+        """Hash do conteúdo atual (muda quando pergunta ou resposta mudam)."""
+        return content_hash(self.q, self.a)
+
+    def to_dict(self) -> Dict[str, str]:
+        """Converte para o formato de dicionário usado pelas funções legadas."""
+        return dict(self.items())
+
+
+class CardStore:
+    """
+    Coleção de flashcards com IDs estáveis e fatias baratas.
+
+    Fatias (`store[10:20]`) e concatenações (`store + outros`) devolvem novos
+    `CardStore` que compartilham os mesmos objetos `Card`; apenas as
+    referências são copiadas.
+
+    Uso:
+        store = CardStore.from_dicts(parse_flashcard_file(path))
+        export_apkg(path, "Deck", store)
+    """
+
+    __slots__ = ("_cards", "_by_id")
+
+    def __init__(self, cards: Iterable[Mapping] = ()):
+        """
+        Inicializa a coleção.
+
+        Args:
+            cards: Cards iniciais (objetos Card são reaproveitados,
+                mapeamentos são convertidos).
+        """
+        self._cards: List[Card] = []
+        self._by_id: Optional[Dict[int, Card]] = None
+        self.extend(cards)
+
+    @classmethod
+    def from_dicts(cls, cards: Iterable[Mapping]) -> "CardStore":
+        """
+        Cria uma coleção a partir de dicionários {"q", "a"[, "source", "guid", "tags"]}.
+
+        Args:
+            cards: Cards no formato de dicionário.
+
+        Returns:
+            Nova instância de CardStore.
+        """
+        return cls(cards)
+
+    @classmethod
+    def _view(cls, cards: List[Card]) -> "CardStore":
+        """Cria uma coleção que reaproveita a lista de registros informada."""
+        store = cls.__new__(cls)
+        store._cards = cards
+        store._by_id = None
+        return store
+
+    # ==========================================================================
+    # MUTAÇÃO
+    # ==========================================================================
+
+    def append(
+        self,
+        q: str,
+        a: str,
+        source: Optional[str] = None,
+        guid: Optional[str] = None,
+        tags: Optional[str] = None
+    ) -> Card:
+        """
+        Adiciona um novo card.
+
+        Args:
+            q: Pergunta.
+            a: Resposta.
+            source: Origem do card.
+            guid: GUID da nota no Anki, se conhecido.
+            tags: Tags do Anki separadas por espaço.
+
+        Returns:
+            O registro criado.
+        """
+        card = Card(q, a, source, guid=guid, tags=tags)
+        self._cards.append(card)
+        if self._by_id is not None:
+            self._by_id[card.id] = card
+        return card
+
+    def add(self, card: Mapping) -> Card:
+        """
+        Adiciona um card existente (Card ou dicionário).
+
+        Args:
+            card: Card a adicionar.
+
+        Returns:
+            O registro armazenado.
+        """
+        if not isinstance(card, Card):
+            card = Card(
+                card["q"], card["a"], card.get("source"),
+                guid=card.get("guid"), tags=card.get("tags")
+            )
+        self._cards.append(card)
+        if self._by_id is not None:
+            self._by_id[card.id] = card
+        return card
+
+    def extend(self, cards: Iterable[Mapping]) -> None:
+        """
+        Adiciona vários cards.
+
+        Args:
+            cards: Cards a adicionar.
+        """
+        for card in cards:
+            self.add(card)
+
+    # ==========================================================================
+    # ACESSO
+    # ==========================================================================
+
+    def __len__(self) -> int:
+        return len(self._cards)
+
+    def __iter__(self) -> Iterator[Card]:
+        return iter(self._cards)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Card, "CardStore"]:
+        if isinstance(index, slice):
+            return CardStore._view(self._cards[index])
+        return self._cards[index]
+
+    def __add__(self, other: Iterable[Mapping]) -> "CardStore":
+        store = CardStore._view(list(self._cards))
+        store.extend(other)
+        return store
+
+    def __radd__(self, other: Iterable[Mapping]) -> "CardStore":
+        store = CardStore(other)
+        store._cards.extend(self._cards)
+        return store
+
+    def __repr__(self) -> str:
+        return f"CardStore({len(self._cards)} cards)"
+
+    def get_by_id(self, card_id: int) -> Optional[Card]:
+        """
+        Retorna o card com o ID informado.
+
+        Args:
+            card_id: ID do card.
+
+        Returns:
+            O card ou None se não existir.
+        """
+        if self._by_id is None:
+            self._by_id = {card.id: card for card in self._cards}
+        return self._by_id.get(card_id)
+
+    def ids(self) -> List[int]:
+        """Retorna os IDs dos cards na ordem atual."""
+        return [card.id for card in self._cards]
+
+    def to_dicts(self) -> List[Dict[str, str]]:
+        """Converte para lista de dicionários (formato legado)."""
+        return [card.to_dict() for card in self._cards]
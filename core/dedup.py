@@ -0,0 +1,283 @@
+# -*- coding: utf-8 -*-
+"""
+Detecção de Duplicatas
+======================
+
+Índice MinHash/LSH local sobre o texto normalizado de pergunta + resposta.
+
+Permite inserção incremental e consulta em tempo sub-linear: cada card só é
+comparado com os candidatos que compartilham pelo menos uma banda da
+assinatura, em vez de com o deck inteiro.
+"""
+
+import re
+import unicodedata
+import zlib
+from collections.abc import Mapping
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from .cards import Card, CardStore
+
+
+# Similaridade (Jaccard estimada) a partir da qual dois cards são duplicatas
+DEFAULT_THRESHOLD = 0.8
+
+_NON_WORD = re.compile(r"[^\w\s]+")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_card_text(text: str) -> str:
+    """
+    Normaliza texto para comparação (minúsculas, sem acentos e pontuação).
+
+    Args:
+        text: Texto original.
+
+    Returns:
+        Texto normalizado.
+    """
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = _NON_WORD.sub(" ", text)
+    return _SPACES.sub(" ", text).strip()
+
+
+def card_text(card: Mapping) -> str:
+    """
+    Retorna o texto normalizado de um card (pergunta + resposta).
+
+    Args:
+        card: Card com chaves 'q' e 'a'.
+
+    Returns:
+        Texto normalizado usado pelo índice.
+    """
+    return normalize_card_text(f"{card['q']} {card['a']}")
+
+
+class MinHashIndex:
+    """
+    Índice MinHash com Locality-Sensitive Hashing por bandas.
+
+    Uso:
+        index = MinHashIndex()
+        index.insert(card.id, card_text(card))
+        matches = index.query(card_text(outro))
+    """
+
+    def __init__(
+        self,
+        num_perm: int = 32,
+        bands: int = 8,
+        shingle_size: int = 5,
+        threshold: float = DEFAULT_THRESHOLD,
+        seed: int = 1
+    ):
+        """
+        Inicializa o índice.
+
+        Args:
+            num_perm: Tamanho da assinatura MinHash.
+            bands: Número de bandas LSH (num_perm deve ser múltiplo).
+            shingle_size: Tamanho dos n-gramas de caracteres.
+            threshold: Similaridade mínima padrão para `query`.
+            seed: Semente do hash dos n-gramas (assinaturas determinísticas).
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm deve ser múltiplo de bands.")
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.threshold = threshold
+        self.seed = seed
+
+        self._signatures: Dict[Hashable, Tuple[int, ...]] = {}
+        self._exact: Dict[str, Hashable] = {}
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], List[Hashable]] = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._signatures
+
+    def _shingles(self, text: str) -> set:
+        """Calcula os hashes (32 bits) dos n-gramas de caracteres do texto."""
+        k = self.shingle_size
+        data = text.encode("utf-8")
+        if len(data) <= k:
+            return {zlib.crc32(data, self.seed)}
+        seed = self.seed
+        return {zlib.crc32(data[i:i + k], seed) for i in range(len(data) - k + 1)}
+
+    def signature(self, text: str) -> Tuple[int, ...]:
+        """
+        Calcula a assinatura MinHash de um texto já normalizado.
+
+        Usa "one permutation hashing": cada n-grama é hasheado uma única vez
+        e distribuído em num_perm compartimentos, guardando o mínimo de cada
+        um. Compartimentos vazios copiam o próximo preenchido (densificação),
+        o que mantém a estimativa de similaridade sem num_perm passadas.
+
+        Args:
+            text: Texto normalizado.
+
+        Returns:
+            Tupla com num_perm valores mínimos.
+        """
+        bins = self.num_perm
+        signature = [-1] * bins
+
+        for h in self._shingles(text):
+            h = (h * 0x9E3779B1) & 0xFFFFFFFF
+            slot, value = h % bins, h // bins
+            current = signature[slot]
+            if current < 0 or value < current:
+                signature[slot] = value
+
+        # Densificação por rotação: vazio recebe o próximo preenchido + deslocamento
+        if -1 in signature:
+            offset = 0xFFFFFFFF // bins + 1
+            for i in range(bins):
+                if signature[i] < 0:
+                    for step in range(1, bins):
+                        value = signature[(i + step) % bins]
+                        if value >= 0:
+                            signature[i] = value + step * offset
+                            break
+
+        return tuple(signature)
+
+    def _band_keys(self, signature: Tuple[int, ...]):
+        rows = self.rows
+        for band in range(self.bands):
+            yield band, signature[band * rows:(band + 1) * rows]
+
+    def insert(
+        self,
+        key: Hashable,
+        text: str,
+        signature: Optional[Tuple[int, ...]] = None
+    ) -> None:
+        """
+        Adiciona um texto ao índice.
+
+        Args:
+            key: Identificador (ex: ID do card).
+            text: Texto normalizado.
+            signature: Assinatura já calculada (evita recalcular).
+        """
+        if signature is None:
+            signature = self.signature(text)
+        self._signatures[key] = signature
+        self._exact.setdefault(text, key)
+        for band_key in self._band_keys(signature):
+            self._buckets.setdefault(band_key, []).append(key)
+
+    def query(
+        self,
+        text: str,
+        threshold: Optional[float] = None,
+        signature: Optional[Tuple[int, ...]] = None
+    ) -> List[Tuple[Hashable, float]]:
+        """
+        Busca textos semelhantes já indexados.
+
+        Args:
+            text: Texto normalizado.
+            threshold: Similaridade mínima (padrão: a do índice).
+            signature: Assinatura já calculada (evita recalcular).
+
+        Returns:
+            Lista de (chave, similaridade estimada), da mais similar à menos.
+        """
+        if threshold is None:
+            threshold = self.threshold
+
+        # Caminho rápido: texto idêntico após normalização
+        exact = self._exact.get(text)
+        if exact is not None:
+            return [(exact, 1.0)]
+
+        if signature is None:
+            signature = self.signature(text)
+        candidates = set()
+        for band_key in self._band_keys(signature):
+            candidates.update(self._buckets.get(band_key, ()))
+
+        matches = []
+        for key in candidates:
+            other = self._signatures[key]
+            equal = sum(1 for x, y in zip(signature, other) if x == y)
+            similarity = equal / self.num_perm
+            if similarity >= threshold:
+                matches.append((key, similarity))
+
+        matches.sort(key=lambda m: m[1], reverse=True)
+        return matches
+
+
+def dedup_cards(
+    cards: Iterable[Mapping],
+    threshold: float = DEFAULT_THRESHOLD,
+    index: Optional[MinHashIndex] = None
+) -> Tuple[CardStore, List[Tuple[Card, Optional[Card], float]]]:
+    """
+    Remove cards duplicados ou quase duplicados, mantendo a primeira ocorrência.
+
+    Args:
+        cards: Cards a verificar (lista de dicionários ou CardStore).
+        threshold: Similaridade mínima para considerar duplicata.
+        index: Índice existente a reaproveitar (ex: deck já exportado);
+            os cards mantidos são adicionados a ele.
+
+    Returns:
+        Tuple com (cards mantidos, lista de (duplicata, card mantido, similaridade)).
+        O card mantido é None quando a correspondência veio do índice informado.
+    """
+    store = cards if isinstance(cards, CardStore) else CardStore(cards)
+    if index is None:
+        index = MinHashIndex(threshold=threshold)
+
+    kept = CardStore()
+    duplicates = []
+
+    for card in store:
+        text = card_text(card)
+        signature = index.signature(text)
+        matches = index.query(text, threshold, signature)
+
+        if matches:
+            original = kept.get_by_id(matches[0][0])
+            duplicates.append((card, original, matches[0][1]))
+            continue
+
+        index.insert(card.id, text, signature)
+        kept.add(card)
+
+    return kept, duplicates
+
+
+def describe_duplicates(
+    duplicates: Iterable[Tuple[Card, Optional[Card], float]]
+) -> List[Dict[str, Any]]:
+    """
+    Lista as duplicatas de `dedup_cards` em formato serializável (JSON).
+
+    Args:
+        duplicates: Lista de (duplicata, card mantido, similaridade).
+
+    Returns:
+        Lista de {"q", "a", "kept" (pergunta do card mantido ou None), "similarity"}.
+    """
+    return [
+        {
+            "q": card["q"],
+            "a": card["a"],
+            "kept": original["q"] if original is not None else None,
+            "similarity": round(similarity, 3),
+        }
+        for card, original, similarity in duplicates
+    ]
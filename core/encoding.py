@@ -0,0 +1,312 @@
+# -*- coding: utf-8 -*-
+"""
+Codificações de Deck para Prompts
+=================================
+
+Formatos selecionáveis para enviar um deck à revisão gastando menos tokens:
+
+- full: formato original ([Card i] + Q:/A: + linha em branco)
+- compact: uma linha por card, numerada
+- questions: apenas as perguntas (suficiente para auditoria de cobertura)
+- truncated: respostas resumidas com hash de conteúdo
+
+"questions" e "truncated" omitem respostas e só valem para auditoria: a
+revisão final devolve o deck inteiro reescrito, e o modelo reescreveria
+respostas que não viu (ver check_encoding_mode).
+
+Os números enviados no prompt são mapeados de volta para os IDs dos cards,
+permitindo ligar as referências da resposta ("Card 12", "#12" ou o início
+da pergunta entre aspas) aos cards originais.
+
+A contagem de tokens usa o tokenizador real (tiktoken) quando ele está
+instalado e cai para a estimativa de ~4 caracteres por token caso contrário.
+"""
+
+import re
+import threading
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .cards import content_hash
+from .dedup import normalize_card_text
+
+
+DECK_ENCODINGS = {
+    "full": "Completo",
+    "compact": "Compacto",
+    "questions": "Só perguntas",
+    "truncated": "Respostas resumidas",
+}
+
+# Codificações que omitem respostas (só para o modo "audit" da revisão)
+AUDIT_ONLY_ENCODINGS = ("questions", "truncated")
+
+# Tamanho máximo da resposta no formato "truncated"
+ANSWER_PREVIEW_CHARS = 80
+
+_LEGENDS = {
+    "compact": "Formato: <n>. <pergunta> || <resposta> (⏎ = quebra de linha)",
+    "questions": "Formato: <n>. <pergunta> (respostas omitidas para economizar tokens)",
+    "truncated": (
+        f"Formato: <n>. <pergunta> || <resposta resumida em até "
+        f"{ANSWER_PREVIEW_CHARS} caracteres> #<hash>"
+    ),
+}
+
+_REF_PATTERN = re.compile(r"(?:\[?Card\s+|#)(\d+)\b", re.IGNORECASE)
+_QUOTE_PATTERN = re.compile(r"[\"“]([^\"”\n]{8,})[\"”]")
+
+# Tamanho do prefixo normalizado usado para localizar perguntas citadas
+_PREFIX_LEN = 16
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estima o número de tokens de um texto (~4 caracteres por token).
+
+    Args:
+        text: Texto a estimar.
+
+    Returns:
+        Número aproximado de tokens.
+    """
+    return len(text) // 4
+
+
+# Codificação do tiktoken para modelos que ele ainda não conhece
+DEFAULT_TOKENIZER = "o200k_base"
+
+_tokenizers: Dict[str, Any] = {}
+_tokenizers_lock = threading.Lock()
+
+
+def _get_tokenizer(model: str) -> Optional[Any]:
+    """
+    Retorna o tokenizador do tiktoken para o modelo (criado uma única vez).
+
+    O tiktoken é opcional e importado só no primeiro uso.
+
+    Args:
+        model: Nome do modelo.
+
+    Returns:
+        Tokenizador, ou None se o tiktoken não estiver disponível.
+    """
+    with _tokenizers_lock:
+        if model in _tokenizers:
+            return _tokenizers[model]
+
+        tokenizer = None
+        try:
+            import tiktoken
+            try:
+                tokenizer = tiktoken.encoding_for_model(model)
+            except KeyError:
+                tokenizer = tiktoken.get_encoding(DEFAULT_TOKENIZER)
+        except ImportError:
+            pass
+        except Exception as e:
+            # Ex: sem rede para baixar o vocabulário na primeira execução
+            print(f"[Tokens] Erro ao carregar tokenizador: {e}")
+
+        _tokenizers[model] = tokenizer
+        return tokenizer
+
+
+def count_tokens(text: str, model: str = "") -> Tuple[int, bool]:
+    """
+    Conta os tokens de um texto com o tokenizador do modelo.
+
+    Args:
+        text: Texto a contar.
+        model: Nome do modelo (define o vocabulário do tiktoken).
+
+    Returns:
+        Tuple com (tokens, exato); exato é False quando o tiktoken não está
+        disponível e o valor vem de `estimate_tokens`.
+    """
+    tokenizer = _get_tokenizer(model)
+    if tokenizer is None:
+        return estimate_tokens(text), False
+    return len(tokenizer.encode(text, disallowed_special=())), True
+
+
+class EncodedDeck:
+    """
+    Deck codificado para prompt.
+
+    Atributos:
+        text: Texto a enviar no prompt.
+        encoding: Codificação usada.
+        refs: Mapa número no prompt (1-based) → ID do card.
+        tokens: Estimativa de tokens do texto.
+    """
+
+    __slots__ = ("text", "encoding", "refs", "tokens")
+
+    def __init__(self, text: str, encoding: str, refs: Dict[int, int]):
+        self.text = text
+        self.encoding = encoding
+        self.refs = refs
+        self.tokens = estimate_tokens(text)
+
+
+def _one_line(text: str) -> str:
+    return text.replace('\\n', '\n').replace('\n', '⏎')
+
+
+def check_encoding_mode(encoding: str, mode: str) -> None:
+    """
+    Valida a codificação para o modo de revisão.
+
+    Args:
+        encoding: Chave de DECK_ENCODINGS.
+        mode: "audit" ou "final".
+
+    Raises:
+        ValueError: Se a codificação não existir ou omitir respostas fora
+            do modo "audit".
+    """
+    if encoding not in DECK_ENCODINGS:
+        raise ValueError(
+            f"Codificação desconhecida: {encoding} (use {', '.join(DECK_ENCODINGS)})"
+        )
+    if mode != "audit" and encoding in AUDIT_ONLY_ENCODINGS:
+        raise ValueError(
+            f"A codificação '{encoding}' omite respostas e só pode ser usada na auditoria."
+        )
+
+
+def encode_deck(cards: Iterable[Mapping[str, str]], encoding: str = "full") -> EncodedDeck:
+    """
+    Codifica os cards no formato escolhido.
+
+    Args:
+        cards: Lista de cards ou CardStore (IDs dos Cards são preservados;
+            para dicionários o ID é a posição na lista).
+        encoding: Uma das chaves de DECK_ENCODINGS.
+
+    Returns:
+        Instância de EncodedDeck.
+
+    Raises:
+        ValueError: Se a codificação não existir.
+    """
+    if encoding not in DECK_ENCODINGS:
+        raise ValueError(f"Codificação desconhecida: {encoding}")
+
+    lines = []
+    refs = {}
+
+    if encoding in _LEGENDS:
+        lines.append(_LEGENDS[encoding])
+        lines.append("")
+
+    for i, c in enumerate(cards, 1):
+        refs[i] = getattr(c, "id", i - 1)
+
+        if encoding == "full":
+            lines.append(f"[Card {i}]")
+            lines.append(f"Q: {c['q']}")
+            lines.append(f"A: {c['a']}")
+            lines.append("")
+        elif encoding == "compact":
+            lines.append(f"{i}. {_one_line(c['q'])} || {_one_line(c['a'])}")
+        elif encoding == "questions":
+            lines.append(f"{i}. {_one_line(c['q'])}")
+        else:
+            answer = _one_line(c['a'])
+            if len(answer) > ANSWER_PREVIEW_CHARS:
+                answer = answer[:ANSWER_PREVIEW_CHARS].rstrip() + "…"
+            digest = content_hash(c['q'], c['a'])[:6]
+            lines.append(f"{i}. {_one_line(c['q'])} || {answer} #{digest}")
+
+    return EncodedDeck("\n".join(lines).strip(), encoding, refs)
+
+
+def encoding_savings(
+    cards: Iterable[Mapping[str, str]],
+    encodings: Optional[Iterable[str]] = None
+) -> Dict[str, Dict]:
+    """
+    Compara o tamanho estimado de cada codificação com o formato completo.
+
+    Args:
+        cards: Lista de cards ou CardStore.
+        encodings: Codificações a comparar (padrão: todas).
+
+    Returns:
+        Dicionário codificação → {"tokens", "saved_tokens", "saved_pct"}.
+    """
+    cards = cards if hasattr(cards, "__len__") else list(cards)
+    full_tokens = encode_deck(cards, "full").tokens
+    report = {}
+
+    for encoding in (encodings or DECK_ENCODINGS):
+        tokens = full_tokens if encoding == "full" else encode_deck(cards, encoding).tokens
+        saved = full_tokens - tokens
+        report[encoding] = {
+            "tokens": tokens,
+            "saved_tokens": saved,
+            "saved_pct": (100.0 * saved / full_tokens) if full_tokens else 0.0,
+        }
+
+    return report
+
+
+def resolve_card_refs(
+    text: str,
+    encoded: EncodedDeck,
+    cards: Iterable[Mapping[str, str]]
+) -> Dict[int, List[str]]:
+    """
+    Liga as referências da resposta da IA aos IDs dos cards enviados.
+
+    Reconhece números ("Card 12", "[Card 12]", "#12") e inícios de pergunta
+    citados entre aspas, como pedem os prompts de auditoria e revisão.
+
+    Args:
+        text: Trecho da resposta (ex: relatório ou problemas do deck).
+        encoded: Deck codificado que foi enviado no prompt.
+        cards: Os mesmos cards usados em `encode_deck`.
+
+    Returns:
+        Dicionário ID do card → linhas da resposta que o mencionam.
+    """
+    # Índice de prefixos normalizados das perguntas
+    by_prefix: Dict[str, List[tuple]] = {}
+    for number, c in enumerate(cards, 1):
+        question = normalize_card_text(c['q'])
+        by_prefix.setdefault(question[:_PREFIX_LEN], []).append(
+            (question, encoded.refs[number])
+        )
+
+    refs: Dict[int, List[str]] = {}
+
+    def add(card_id: int, line: str):
+        lines = refs.setdefault(card_id, [])
+        if line not in lines:
+            lines.append(line)
+
+    for line in text.split('\n'):
+        for match in _REF_PATTERN.finditer(line):
+            number = int(match.group(1))
+            if number in encoded.refs:
+                add(encoded.refs[number], line.strip())
+
+        for match in _QUOTE_PATTERN.finditer(line):
+            snippet = normalize_card_text(match.group(1).rstrip(".…"))
+            if not snippet:
+                continue
+
+            if len(snippet) >= _PREFIX_LEN:
+                candidates = by_prefix.get(snippet[:_PREFIX_LEN], ())
+            else:
+                candidates = [c for group in by_prefix.values() for c in group]
+
+            for question, card_id in candidates:
+                if question.startswith(snippet):
+                    add(card_id, line.strip())
+                    break
+
+    return refs
@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+"""
+Importação em Lote
+==================
+
+Carrega vários arquivos de flashcards de uma vez (arquivos, diretórios ou
+padrões glob), processando cada arquivo em um processo separado.
+
+Os resultados são entregues conforme cada arquivo termina, com estatísticas
+e erros individuais, e podem ser combinados em um único deck com a origem
+de cada card.
+"""
+
+import os
+import glob
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import get_context
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .cards import CardStore
+from .parser import parse_flashcard_file
+
+
+SUPPORTED_EXTENSIONS = ('.apkg', '.csv', '.txt', '.tsv')
+
+# Extensões de textos-fonte (geração a partir de arquivos: CLI e modo watch)
+TEXT_EXTENSIONS = ('.txt', '.md', '.markdown', '.rst')
+
+
+def expand_import_paths(
+    inputs: Iterable[str],
+    recursive: bool = True,
+    extensions: Tuple[str, ...] = SUPPORTED_EXTENSIONS
+) -> List[str]:
+    """
+    Expande arquivos, diretórios e padrões glob em uma lista de arquivos.
+
+    Diretórios e globs só incluem extensões suportadas; arquivos informados
+    explicitamente são mantidos mesmo sem extensão conhecida (o formato é
+    detectado pelo conteúdo). Caminhos inexistentes são mantidos para que o
+    erro apareça no resultado do arquivo.
+
+    Args:
+        inputs: Caminhos de arquivos, diretórios ou padrões glob.
+        recursive: Se True, percorre subdiretórios.
+        extensions: Extensões aceitas em diretórios e globs (padrão: as
+            dos formatos de flashcards).
+
+    Returns:
+        Lista de caminhos sem duplicatas, na ordem de descoberta.
+    """
+    paths = []
+    seen = set()
+
+    def add(path: str):
+        key = os.path.normcase(os.path.abspath(path))
+        if key not in seen:
+            seen.add(key)
+            paths.append(path)
+
+    def add_directory(directory: str):
+        if recursive:
+            for root, dirs, files in os.walk(directory):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.lower().endswith(extensions):
+                        add(os.path.join(root, name))
+        else:
+            for name in sorted(os.listdir(directory)):
+                full = os.path.join(directory, name)
+                if os.path.isfile(full) and name.lower().endswith(extensions):
+                    add(full)
+
+    for item in inputs:
+        if os.path.isdir(item):
+            add_directory(item)
+        elif os.path.isfile(item):
+            add(item)
+        elif glob.has_magic(item):
+            for match in sorted(glob.glob(item, recursive=recursive)):
+                if os.path.isdir(match):
+                    add_directory(match)
+                elif match.lower().endswith(extensions):
+                    add(match)
+        else:
+            add(item)
+
+    return paths
+
+
+def _parse_file_worker(index: int, file_path: str) -> Dict:
+    """
+    Processa um único arquivo (executado no processo worker).
+
+    Args:
+        index: Posição do arquivo na lista de entrada.
+        file_path: Caminho do arquivo.
+
+    Returns:
+        Dicionário com cards, estatísticas e erro (se houver).
+    """
+    start = time.perf_counter()
+    result = {
+        "index": index,
+        "path": file_path,
+        "cards": [],
+        "count": 0,
+        "size": 0,
+        "elapsed": 0.0,
+        "error": None,
+    }
+
+    try:
+        result["size"] = os.path.getsize(file_path)
+        cards = parse_flashcard_file(file_path)
+        result["cards"] = cards
+        result["count"] = len(cards)
+        if not cards:
+            result["error"] = "Nenhum card extraído"
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+
+    result["elapsed"] = time.perf_counter() - start
+    return result
+
+
+def iter_import_files(
+    inputs: Iterable[str],
+    max_workers: Optional[int] = None
+) -> Iterator[Dict]:
+    """
+    Processa arquivos em paralelo e entrega cada resultado ao terminar.
+
+    Args:
+        inputs: Caminhos de arquivos, diretórios ou padrões glob.
+        max_workers: Número de processos (padrão: número de núcleos).
+
+    Yields:
+        Dicionário por arquivo (ver `_parse_file_worker`), em ordem de conclusão.
+    """
+    yield from _iter_parsed_files(expand_import_paths(inputs), max_workers)
+
+
+def _iter_parsed_files(
+    paths: List[str],
+    max_workers: Optional[int] = None
+) -> Iterator[Dict]:
+    """Como `iter_import_files`, para caminhos já expandidos."""
+    if not paths:
+        return
+
+    workers = min(max_workers or os.cpu_count() or 1, len(paths))
+
+    # Um único arquivo não compensa o custo de iniciar processos
+    if workers <= 1:
+        for i, path in enumerate(paths):
+            yield _parse_file_worker(i, path)
+        return
+
+    # "spawn": um fork do processo da interface (Tk, threads) não é seguro
+    with ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn")) as pool:
+        futures = [
+            pool.submit(_parse_file_worker, i, path)
+            for i, path in enumerate(paths)
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def merge_import_results(
+    results: Iterable[Dict],
+    elapsed: float = 0.0
+) -> Tuple[CardStore, Dict]:
+    """
+    Combina os resultados de vários arquivos em um único deck.
+
+    Os cards mantêm a ordem dos arquivos de entrada e recebem como
+    'source' o nome do arquivo de origem.
+
+    Args:
+        results: Resultados produzidos por `iter_import_files`.
+        elapsed: Duração total da importação (relógio), em segundos.
+
+    Returns:
+        Tuple com (CardStore, dicionário de estatísticas). 'elapsed' é a
+        duração total e 'parse_time' a soma dos tempos de cada arquivo
+        (maior que 'elapsed' quando os arquivos são lidos em paralelo).
+    """
+    ordered = sorted(results, key=lambda r: r["index"])
+
+    cards = CardStore()
+    stats = {
+        "files": len(ordered),
+        "files_ok": 0,
+        "files_failed": 0,
+        "total_cards": 0,
+        "elapsed": elapsed,
+        "parse_time": 0.0,
+        "per_file": [],
+        "errors": [],
+    }
+
+    for result in ordered:
+        source = os.path.basename(result["path"])
+
+        for card in result["cards"]:
+            cards.append(card["q"], card["a"], source, card.get("guid"), card.get("tags"))
+
+        if result["error"]:
+            stats["files_failed"] += 1
+            stats["errors"].append((result["path"], result["error"]))
+        else:
+            stats["files_ok"] += 1
+
+        stats["total_cards"] += result["count"]
+        stats["parse_time"] += result["elapsed"]
+        stats["per_file"].append({
+            "path": result["path"],
+            "count": result["count"],
+            "size": result["size"],
+            "elapsed": result["elapsed"],
+            "error": result["error"],
+        })
+
+    return cards, stats
+
+
+def import_files(
+    inputs: Iterable[str],
+    max_workers: Optional[int] = None,
+    progress_callback: Optional[Callable[[Dict, int, int], None]] = None
+) -> Tuple[CardStore, Dict]:
+    """
+    Importa vários arquivos em paralelo e combina tudo em um único deck.
+
+    Args:
+        inputs: Caminhos de arquivos, diretórios ou padrões glob.
+        max_workers: Número de processos (padrão: número de núcleos).
+        progress_callback: Chamado a cada arquivo concluído com
+            (resultado, concluídos, total).
+
+    Returns:
+        Tuple com (CardStore com 'source', dicionário de estatísticas).
+    """
+    start = time.perf_counter()
+    paths = expand_import_paths(inputs)
+    total = len(paths)
+    results = []
+
+    for result in _iter_parsed_files(paths, max_workers):
+        results.append(result)
+        if progress_callback:
+            progress_callback(result, len(results), total)
+
+    return merge_import_results(results, time.perf_counter() - start)
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""
+Registro de Ingestão
+====================
+
+Guarda em SQLite, por arquivo-fonte, o hash do conteúdo já convertido em
+deck (modo watch, watcher.py). Um arquivo só é reprocessado quando o
+conteúdo muda: tocar o arquivo ou salvá-lo sem alterações não gera nova
+chamada à API.
+
+O tamanho e o mtime também são guardados, para que arquivos sem nenhuma
+alteração nem precisem ser relidos para o cálculo do hash.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional, Tuple
+
+from config import DATA_DIR
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ingested_files (
+    path TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    output TEXT NOT NULL,
+    cards INTEGER NOT NULL,
+    processed_at REAL NOT NULL
+)
+"""
+
+
+def content_hash(data: bytes) -> str:
+    """
+    Hash do conteúdo de um arquivo-fonte.
+
+    Args:
+        data: Bytes do arquivo.
+
+    Returns:
+        SHA-256 em hexadecimal.
+    """
+    return hashlib.sha256(data).hexdigest()
+
+
+def _key(path: str) -> str:
+    return os.path.normcase(os.path.abspath(path))
+
+
+class IngestLedger:
+    """
+    Registro dos arquivos já convertidos (seguro entre threads).
+
+    Uso:
+        ledger = IngestLedger()
+        entry = ledger.lookup(path)
+        if entry is None or entry[0] != content_hash(data):
+            ...  # gera o deck
+            ledger.record(path, digest, mtime_ns, size, output, len(cards))
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Abre (ou cria) o banco do registro.
+
+        Args:
+            path: Caminho do arquivo SQLite (padrão: DATA_DIR/ingest_ledger.sqlite3).
+        """
+        if path is None:
+            path = os.path.join(DATA_DIR, "ingest_ledger.sqlite3")
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+
+    def close(self) -> None:
+        """Fecha a conexão com o banco."""
+        with self._lock:
+            self._conn.close()
+
+    def lookup(self, path: str) -> Optional[Tuple[str, int, int]]:
+        """
+        Última conversão registrada de um arquivo.
+
+        Args:
+            path: Arquivo-fonte.
+
+        Returns:
+            (hash do conteúdo, mtime_ns, tamanho), ou None se nunca foi convertido.
+        """
+        with self._lock:
+            return self._conn.execute(
+                "SELECT content_hash, mtime_ns, size FROM ingested_files WHERE path = ?",
+                (_key(path),)
+            ).fetchone()
+
+    def record(
+        self,
+        path: str,
+        digest: str,
+        mtime_ns: int,
+        size: int,
+        output: str,
+        cards: int
+    ) -> None:
+        """
+        Registra uma conversão concluída.
+
+        Args:
+            path: Arquivo-fonte.
+            digest: Hash do conteúdo convertido.
+            mtime_ns: mtime do arquivo lido.
+            size: Tamanho do arquivo lido.
+            output: Deck gravado.
+            cards: Número de cards do deck.
+        """
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO ingested_files "
+                    "(path, content_hash, mtime_ns, size, output, cards, processed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (_key(path), digest, mtime_ns, size, _key(output), cards, time.time())
+                )
+
+    def touch(self, path: str, mtime_ns: int, size: int) -> None:
+        """
+        Atualiza o mtime/tamanho de um arquivo cujo conteúdo não mudou.
+
+        Args:
+            path: Arquivo-fonte.
+            mtime_ns: mtime atual.
+            size: Tamanho atual.
+        """
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE ingested_files SET mtime_ns = ?, size = ? WHERE path = ?",
+                    (mtime_ns, size, _key(path))
+                )
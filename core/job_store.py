@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+"""
+Tabela Persistente de Tarefas
+=============================
+
+Guarda em SQLite as tarefas do modo serviço (server.py): pedido, estado,
+resultado e tempos. As tarefas sobrevivem a reinícios: as que estavam em
+execução quando o processo parou voltam para a fila na abertura.
+
+Os estados são os mesmos da fila em memória (core.jobs).
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import DATA_DIR
+from .jobs import CANCELLED, DONE, FAILED, QUEUED, RUNNING
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    state TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    created REAL NOT NULL,
+    started REAL,
+    finished REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, id);
+"""
+
+# Colunas devolvidas nas consultas de estado (sem pedido nem resultado)
+_STATUS_COLUMNS = "id, kind, state, error, created, started, finished"
+
+
+def _status_row(row: Tuple) -> Dict[str, Any]:
+    job_id, kind, state, error, created, started, finished = row
+    now = time.time()
+    return {
+        "id": job_id,
+        "kind": kind,
+        "state": state,
+        "error": error,
+        "created": created,
+        "started": started,
+        "finished": finished,
+        "wait": (started or finished or now) - created,
+        "run": None if started is None else (finished or now) - started,
+    }
+
+
+class JobStore:
+    """
+    Fila persistente de tarefas em SQLite (segura entre threads).
+
+    Uso:
+        store = JobStore()
+        job_id = store.submit("generate", {"text": "..."})
+        claimed = store.claim()          # (id, kind, payload) ou None
+        store.finish(job_id, {"cards": [...]})
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Abre (ou cria) o banco e devolve à fila as tarefas interrompidas.
+
+        Args:
+            path: Caminho do arquivo SQLite (padrão: DATA_DIR/jobs.sqlite3).
+        """
+        if path is None:
+            path = os.path.join(DATA_DIR, "jobs.sqlite3")
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        # WAL + synchronous=NORMAL: um commit por mudança de estado sem fsync a cada vez
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self.requeued = self._requeue_running()
+
+    def close(self) -> None:
+        """Fecha a conexão com o banco."""
+        with self._lock:
+            self._conn.close()
+
+    def _requeue_running(self) -> int:
+        """Volta para a fila as tarefas em execução de um processo anterior."""
+        with self._lock:
+            with self._conn:
+                cursor = self._conn.execute(
+                    "UPDATE jobs SET state = ?, started = NULL WHERE state = ?",
+                    (QUEUED, RUNNING)
+                )
+        return cursor.rowcount
+
+    def submit(self, kind: str, payload: Dict[str, Any]) -> int:
+        """
+        Enfileira uma tarefa.
+
+        Args:
+            kind: Tipo da tarefa (ex: "generate").
+            payload: Pedido (serializável em JSON).
+
+        Returns:
+            ID da tarefa.
+        """
+        data = json.dumps(payload, ensure_ascii=False)
+        with self._lock:
+            with self._conn:
+                cursor = self._conn.execute(
+                    "INSERT INTO jobs (kind, state, payload, created) VALUES (?, ?, ?, ?)",
+                    (kind, QUEUED, data, time.time())
+                )
+        return cursor.lastrowid
+
+    def claim(self) -> Optional[Tuple[int, str, Dict[str, Any]]]:
+        """
+        Retira a tarefa mais antiga da fila e a marca como em execução.
+
+        Returns:
+            (id, tipo, pedido), ou None se a fila estiver vazia.
+        """
+        with self._lock:
+            with self._conn:
+                row = self._conn.execute(
+                    "SELECT id, kind, payload FROM jobs WHERE state = ? ORDER BY id LIMIT 1",
+                    (QUEUED,)
+                ).fetchone()
+                if row is None:
+                    return None
+                self._conn.execute(
+                    "UPDATE jobs SET state = ?, started = ? WHERE id = ?",
+                    (RUNNING, time.time(), row[0])
+                )
+        return row[0], row[1], json.loads(row[2])
+
+    def finish(self, job_id: int, result: Any) -> None:
+        """
+        Registra o resultado de uma tarefa concluída.
+
+        Args:
+            job_id: ID da tarefa.
+            result: Resultado (serializável em JSON).
+        """
+        self._close_job(job_id, DONE, json.dumps(result, ensure_ascii=False), None)
+
+    def fail(self, job_id: int, error: str) -> None:
+        """
+        Registra o erro de uma tarefa.
+
+        Args:
+            job_id: ID da tarefa.
+            error: Descrição do erro.
+        """
+        self._close_job(job_id, FAILED, None, error)
+
+    def _close_job(self, job_id: int, state: str, result: Optional[str], error: Optional[str]):
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE jobs SET state = ?, result = ?, error = ?, finished = ? WHERE id = ?",
+                    (state, result, error, time.time(), job_id)
+                )
+
+    def cancel(self, job_id: int) -> bool:
+        """
+        Cancela uma tarefa que ainda está na fila.
+
+        Args:
+            job_id: ID da tarefa.
+
+        Returns:
+            True se a tarefa foi cancelada.
+        """
+        with self._lock:
+            with self._conn:
+                cursor = self._conn.execute(
+                    "UPDATE jobs SET state = ?, finished = ? WHERE id = ? AND state = ?",
+                    (CANCELLED, time.time(), job_id, QUEUED)
+                )
+        return cursor.rowcount > 0
+
+    def get(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Estado de uma tarefa.
+
+        Args:
+            job_id: ID da tarefa.
+
+        Returns:
+            Dicionário com id, kind, state, error, tempos (wait/run), ou None.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {_STATUS_COLUMNS} FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return None if row is None else _status_row(row)
+
+    def result(self, job_id: int) -> Any:
+        """
+        Resultado de uma tarefa concluída.
+
+        Args:
+            job_id: ID da tarefa.
+
+        Returns:
+            Resultado decodificado, ou None se não houver.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return json.loads(row[0])
+
+    def list(self, state: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Tarefas mais recentes primeiro.
+
+        Args:
+            state: Filtra por estado (padrão: todos).
+            limit: Máximo de tarefas.
+
+        Returns:
+            Lista no formato de `get`.
+        """
+        query = f"SELECT {_STATUS_COLUMNS} FROM jobs"
+        params: List[Any] = []
+        if state is not None:
+            query += " WHERE state = ?"
+            params.append(state)
+        query += " ORDER BY id DESC LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [_status_row(row) for row in rows]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Contagens por estado e tempos médios das tarefas terminadas.
+
+        Returns:
+            {"states": {estado: n}, "avg_wait", "avg_run", "finished_last_minute"}.
+        """
+        since = time.time() - 60
+        with self._lock:
+            states = dict(self._conn.execute(
+                "SELECT state, COUNT(*) FROM jobs GROUP BY state"
+            ).fetchall())
+            avg_wait, avg_run = self._conn.execute(
+                "SELECT AVG(started - created), AVG(finished - started) FROM jobs "
+                "WHERE state IN (?, ?) AND started IS NOT NULL",
+                (DONE, FAILED)
+            ).fetchone()
+            recent = self._conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE finished >= ? AND state IN (?, ?)",
+                (since, DONE, FAILED)
+            ).fetchone()[0]
+
+        return {
+            "states": {s: states.get(s, 0) for s in (QUEUED, RUNNING, DONE, FAILED, CANCELLED)},
+            "avg_wait": avg_wait,
+            "avg_run": avg_run,
+            "finished_last_minute": recent,
+        }
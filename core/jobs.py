@@ -0,0 +1,283 @@
+# -*- coding: utf-8 -*-
+"""
+Fila de Tarefas
+===============
+
+Fila compartilhada de tarefas (gerações, revisões) executadas por um pool
+de threads. Várias tarefas podem ser enfileiradas de uma vez; até
+JOB_WORKERS rodam ao mesmo tempo, e o semáforo de requisições de
+core/api.py mantém as chamadas à API dentro do limite da conta.
+
+As threads do pool são daemon, como as demais threads do app: fechar a
+janela não espera as tarefas em andamento.
+
+A fila não usa o Tk: os ouvintes são chamados na thread da tarefa e a
+interface repassa as mudanças para a thread principal com `after`.
+"""
+
+import itertools
+import threading
+import time
+from queue import Queue
+from typing import Any, Callable, Dict, List, Optional
+
+from config import JOB_WORKERS
+
+
+# Estados de uma tarefa
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+JOB_STATES = {
+    QUEUED: "Na fila",
+    RUNNING: "Executando",
+    DONE: "Concluída",
+    FAILED: "Erro",
+    CANCELLED: "Cancelada",
+}
+
+# Tarefas concluídas mantidas no histórico (as mais antigas saem primeiro)
+MAX_FINISHED_JOBS = 100
+
+
+class Job:
+    """
+    Uma tarefa da fila.
+
+    Atributos:
+        id: Número sequencial da tarefa.
+        kind: Tipo livre (ex: "generation", "review").
+        label: Descrição exibida no painel de tarefas.
+        state: Um dos estados de JOB_STATES.
+        result: Valor retornado pela função (estado DONE).
+        error: Exceção levantada pela função (estado FAILED).
+        created, started, finished: Instantes (time.time()) de cada etapa.
+    """
+
+    __slots__ = (
+        "id", "kind", "label", "fn", "on_finish", "state", "result", "error",
+        "created", "started", "finished",
+    )
+
+    def __init__(
+        self,
+        job_id: int,
+        kind: str,
+        label: str,
+        fn: Callable[[], Any],
+        on_finish: Optional[Callable[["Job"], None]] = None
+    ):
+        self.id = job_id
+        self.kind = kind
+        self.label = label
+        self.fn = fn
+        self.on_finish = on_finish
+        self.state = QUEUED
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.created = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+
+    @property
+    def active(self) -> bool:
+        """Indica se a tarefa ainda não terminou."""
+        return self.state in (QUEUED, RUNNING)
+
+    @property
+    def wait_time(self) -> float:
+        """Segundos na fila antes de começar (até agora, se ainda espera)."""
+        end = self.started or self.finished or time.time()
+        return end - self.created
+
+    @property
+    def run_time(self) -> Optional[float]:
+        """Segundos em execução (None se ainda não começou)."""
+        if self.started is None:
+            return None
+        return (self.finished or time.time()) - self.started
+
+
+class JobQueue:
+    """
+    Fila de tarefas com um pool de threads.
+
+    Uso:
+        queue = get_job_queue()
+        queue.add_listener(lambda job: print(job.id, job.state))
+        job = queue.submit("generation", "Texto 1", lambda: gerar(texto),
+                           on_finish=lambda job: ...)
+    """
+
+    def __init__(self, max_workers: int = JOB_WORKERS):
+        """
+        Cria o pool.
+
+        Args:
+            max_workers: Tarefas executadas ao mesmo tempo.
+        """
+        self.max_workers = max_workers
+        self._pending: "Queue[Job]" = Queue()
+        self._workers: List[threading.Thread] = []
+        self._jobs: Dict[int, Job] = {}
+        self._ids = itertools.count(1)
+        self._listeners: List[Callable[[Job], None]] = []
+        self._lock = threading.Lock()
+
+    def add_listener(self, callback: Callable[[Job], None]) -> None:
+        """
+        Registra uma função chamada a cada mudança de estado de uma tarefa.
+
+        Args:
+            callback: Recebe a tarefa (na thread que mudou o estado).
+        """
+        self._listeners.append(callback)
+
+    def jobs(self) -> List[Job]:
+        """Tarefas conhecidas, da mais antiga para a mais nova."""
+        with self._lock:
+            return list(self._jobs.values())
+
+    def submit(
+        self,
+        kind: str,
+        label: str,
+        fn: Callable[[], Any],
+        on_finish: Optional[Callable[[Job], None]] = None
+    ) -> Job:
+        """
+        Enfileira uma tarefa.
+
+        Args:
+            kind: Tipo da tarefa.
+            label: Descrição exibida no painel.
+            fn: Função sem argumentos executada no pool.
+            on_finish: Chamada com a tarefa ao terminar (concluída, com erro
+                ou cancelada), na thread da tarefa.
+
+        Returns:
+            A tarefa criada.
+        """
+        with self._lock:
+            job = Job(next(self._ids), kind, label, fn, on_finish)
+            self._jobs[job.id] = job
+            self._trim()
+
+        self._notify(job)
+        self._pending.put(job)
+        self._start_worker()
+        return job
+
+    def cancel(self, job_id: int) -> bool:
+        """
+        Cancela uma tarefa que ainda está na fila.
+
+        Tarefas em execução não são interrompidas (a chamada à API em
+        andamento não tem como ser desfeita).
+
+        Args:
+            job_id: ID da tarefa.
+
+        Returns:
+            True se a tarefa foi cancelada.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.state != QUEUED:
+                return False
+            # A thread que retirar a tarefa da fila a ignora
+            job.state = CANCELLED
+            job.finished = time.time()
+
+        self._finish(job)
+        return True
+
+    def clear_finished(self) -> None:
+        """Remove do histórico as tarefas já terminadas."""
+        with self._lock:
+            for job_id in [j.id for j in self._jobs.values() if not j.active]:
+                del self._jobs[job_id]
+
+    def _trim(self) -> None:
+        """Limita o histórico a MAX_FINISHED_JOBS tarefas terminadas."""
+        finished = [j.id for j in self._jobs.values() if not j.active]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._jobs[job_id]
+
+    def _start_worker(self) -> None:
+        """Cria mais uma thread no pool, até o limite `max_workers`."""
+        with self._lock:
+            self._workers = [t for t in self._workers if t.is_alive()]
+            if len(self._workers) >= self.max_workers:
+                return
+            worker = threading.Thread(
+                target=self._work, name=f"ankilab-job-{len(self._workers) + 1}", daemon=True
+            )
+            self._workers.append(worker)
+        worker.start()
+
+    def _work(self) -> None:
+        """Laço de uma thread do pool."""
+        while True:
+            self._run(self._pending.get())
+
+    def _run(self, job: Job) -> None:
+        """Executa a tarefa numa thread do pool."""
+        with self._lock:
+            if job.state != QUEUED:
+                return
+            job.state = RUNNING
+            job.started = time.time()
+        self._notify(job)
+
+        try:
+            job.result = job.fn()
+            job.state = DONE
+        except Exception as e:
+            job.error = e
+            job.state = FAILED
+        job.finished = time.time()
+
+        self._finish(job)
+
+    def _finish(self, job: Job) -> None:
+        """Avisa o fim da tarefa ao dono e aos ouvintes."""
+        job.fn = None  # libera o texto/deck capturado pela função
+        if job.on_finish is not None:
+            try:
+                job.on_finish(job)
+            except Exception as e:
+                print(f"[JobQueue] Erro: {e}")
+        self._notify(job)
+
+    def _notify(self, job: Job) -> None:
+        for callback in self._listeners:
+            try:
+                callback(job)
+            except Exception as e:
+                print(f"[JobQueue] Erro: {e}")
+
+
+# ==============================================================================
+# FILA PADRÃO (Singleton)
+# ==============================================================================
+
+_job_queue: Optional[JobQueue] = None
+_job_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """
+    Retorna a fila de tarefas compartilhada (criada uma única vez).
+
+    Returns:
+        Instância compartilhada de JobQueue.
+    """
+    global _job_queue
+    with _job_queue_lock:
+        if _job_queue is None:
+            _job_queue = JobQueue()
+        return _job_queue
@@ -9,12 +9,36 @@ Funções para extração, formatação e manipulação de flashcards.
 import re
 import csv
 from io import StringIO
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional, Iterable, Iterator, Mapping, Tuple, Union
 import zipfile
 import sqlite3
 import tempfile
+import threading
 import os
 
+from .encoding import encode_deck
+from .sections import (
+    ReviewSections,
+    split_review_sections,
+    SECTION_NEW_CARDS,
+    SECTION_REPORT,
+    SECTION_FINAL_CARDS,
+)
+
+
+# Linha de cabeçalho do .txt do Anki (#separator:tab, #html:true, ...)
+_ANKI_HEADER_LINE = re.compile(r"^#([A-Za-z ]+):(.*)$")
+
+# Valores nomeados de #separator
+_ANKI_SEPARATORS = {
+    "tab": "\t",
+    "comma": ",",
+    "semicolon": ";",
+    "pipe": "|",
+    "space": " ",
+}
+
+
 def parse_apkg_cards_detailed(file_path: str) -> tuple[List[Dict[str, str]], Dict]:
     """
     Extrai flashcards e metadados de um arquivo .apkg.
@@ -105,64 +129,123 @@ def parse_apkg_cards_detailed(file_path: str) -> tuple[List[Dict[str, str]], Dic
         return [], metadata
 
 
-def parse_apkg_cards(file_path: str) -> List[Dict[str, str]]:
+class LoadCancelled(Exception):
+    """Carregamento interrompido pelo usuário."""
+
+
+# Notas lidas do banco do .apkg por lote
+APKG_BATCH_SIZE = 500
+
+# Bancos de notas possíveis dentro do .apkg, em ordem de preferência
+_APKG_DATABASES = ('collection.anki2', 'collection.anki21')
+
+
+def iter_apkg_cards(
+    file_path: str,
+    batch_size: int = APKG_BATCH_SIZE
+) -> Iterator[Tuple[List[Dict[str, str]], int, int]]:
     """
-    Extrai flashcards de um arquivo .apkg do Anki.
+    Lê os flashcards de um .apkg em lotes.
     
-    O formato .apkg é um ZIP contendo um banco SQLite com as notas.
-    Os campos estão na tabela 'notes', coluna 'flds', separados por \\x1f.
+    Só o banco de notas é extraído do ZIP (as mídias são ignoradas), e as
+    notas são lidas e limpas `batch_size` por vez, permitindo exibir o
+    progresso e interromper a leitura entre lotes.
     
     Args:
         file_path: Caminho do arquivo .apkg.
+        batch_size: Notas por lote.
     
-    Returns:
-        Lista de dicionários com chaves 'q' e 'a'.
-    """
-    cards = []
+    Yields:
+        Tuple com (cards do lote, notas lidas até agora, total de notas).
     
-    try:
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # .apkg é um arquivo ZIP
-            with zipfile.ZipFile(file_path, 'r') as zip_ref:
-                zip_ref.extractall(temp_dir)
-            
-            # Localiza o banco SQLite (pode ser .anki2 ou .anki21)
-            db_path = None
-            for db_name in ['collection.anki2', 'collection.anki21']:
-                potential = os.path.join(temp_dir, db_name)
-                if os.path.exists(potential):
-                    db_path = potential
-                    break
-            
-            if not db_path:
+    Raises:
+        zipfile.BadZipFile: Se o arquivo não for um ZIP válido.
+        sqlite3.Error: Se o banco de notas estiver corrompido.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # .apkg é um arquivo ZIP; localiza o banco SQLite (.anki2 ou .anki21)
+        with zipfile.ZipFile(file_path, 'r') as zip_ref:
+            names = set(zip_ref.namelist())
+            db_name = next((n for n in _APKG_DATABASES if n in names), None)
+            if db_name is None:
                 print("[parse_apkg_cards] Banco SQLite não encontrado no .apkg")
-                return []
+                return
+            db_path = zip_ref.extract(db_name, temp_dir)
+        
+        conn = sqlite3.connect(db_path)
+        
+        try:
+            total = conn.execute("SELECT COUNT(*) FROM notes").fetchone()[0]
             
-            # Conecta e extrai notas
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
+            # flds contém todos os campos separados por \x1f (unit separator)
+            cursor = conn.execute("SELECT flds, guid, tags FROM notes")
+            done = 0
             
-            try:
-                # Extrai campos das notas
-                # flds contém todos os campos separados por \x1f (unit separator)
-                cursor.execute("SELECT flds FROM notes")
-                rows = cursor.fetchall()
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
                 
-                for row in rows:
-                    fields = row[0].split('\x1f')
+                batch = []
+                for flds, guid, tags in rows:
+                    fields = flds.split('\x1f')
                     
                     if len(fields) >= 2:
                         q = _clean_html(fields[0].strip())
                         a = _clean_html(fields[1].strip())
                         
                         if q and a:
-                            cards.append({"q": q, "a": a})
+                            card = {"q": q, "a": a, "guid": guid}
+                            if tags and tags.strip():
+                                card["tags"] = tags.strip()
+                            batch.append(card)
                 
-            finally:
-                conn.close()
+                done += len(rows)
+                yield batch, done, total
+                
+        finally:
+            conn.close()
+
+
+def parse_apkg_cards(
+    file_path: str,
+    progress_callback: Optional[Callable[[List[Dict[str, str]], int, int], None]] = None,
+    cancel_event: Optional[threading.Event] = None
+) -> List[Dict[str, str]]:
+    """
+    Extrai flashcards de um arquivo .apkg do Anki.
+    
+    O formato .apkg é um ZIP contendo um banco SQLite com as notas.
+    Os campos estão na tabela 'notes', coluna 'flds', separados por \\x1f.
+    
+    Args:
+        file_path: Caminho do arquivo .apkg.
+        progress_callback: Chamado a cada lote com (cards do lote, notas
+            lidas, total de notas), na thread que executa esta função.
+        cancel_event: Quando sinalizado, interrompe a leitura no próximo lote.
+    
+    Returns:
+        Lista de dicionários com chaves 'q', 'a', 'guid' (GUID da nota,
+        usado para atualizar o mesmo pacote sem duplicar notas no Anki) e,
+        se a nota tiver tags, 'tags'.
+    
+    Raises:
+        LoadCancelled: Se o cancelamento for solicitado.
+    """
+    cards = []
+    
+    try:
+        for batch, done, total in iter_apkg_cards(file_path):
+            if cancel_event is not None and cancel_event.is_set():
+                raise LoadCancelled()
+            cards.extend(batch)
+            if progress_callback is not None:
+                progress_callback(batch, done, total)
         
         return cards
         
+    except LoadCancelled:
+        raise
     except zipfile.BadZipFile:
         print("[parse_apkg_cards] Arquivo não é um ZIP válido")
         return []
@@ -213,7 +296,11 @@ def _clean_html(text: str) -> str:
     return text.strip()
 
 
-def parse_flashcard_file(file_path: str) -> List[Dict[str, str]]:
+def parse_flashcard_file(
+    file_path: str,
+    progress_callback: Optional[Callable[[List[Dict[str, str]], int, int], None]] = None,
+    cancel_event: Optional[threading.Event] = None
+) -> List[Dict[str, str]]:
     """
     Função unificada para carregar flashcards de qualquer formato suportado.
     
@@ -221,6 +308,9 @@ def parse_flashcard_file(file_path: str) -> List[Dict[str, str]]:
     
     Args:
         file_path: Caminho do arquivo (.apkg, .csv, .txt).
+        progress_callback: Progresso da leitura de .apkg (ver
+            `parse_apkg_cards`); arquivos de texto são lidos de uma vez.
+        cancel_event: Interrompe a leitura de .apkg entre lotes.
     
     Returns:
         Lista de dicionários com chaves 'q' e 'a'.
@@ -228,6 +318,7 @@ def parse_flashcard_file(file_path: str) -> List[Dict[str, str]]:
     Raises:
         ValueError: Se o formato não for suportado.
         FileNotFoundError: Se o arquivo não existir.
+        LoadCancelled: Se o cancelamento for solicitado.
     """
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"Arquivo não encontrado: {file_path}")
@@ -235,7 +326,7 @@ def parse_flashcard_file(file_path: str) -> List[Dict[str, str]]:
     ext = os.path.splitext(file_path)[1].lower()
     
     if ext == '.apkg':
-        return parse_apkg_cards(file_path)
+        return parse_apkg_cards(file_path, progress_callback, cancel_event)
     elif ext in ['.csv', '.txt', '.tsv']:
         return parse_csv_cards(file_path=file_path)
     else:
@@ -245,7 +336,7 @@ def parse_flashcard_file(file_path: str) -> List[Dict[str, str]]:
             with zipfile.ZipFile(file_path, 'r') as zf:
                 names = zf.namelist()
                 if any('anki' in n.lower() for n in names):
-                    return parse_apkg_cards(file_path)
+                    return parse_apkg_cards(file_path, progress_callback, cancel_event)
         except zipfile.BadZipFile:
             pass
         
@@ -364,6 +455,33 @@ def parse_cards(raw: str) -> List[Dict[str, str]]:
         return []
 
 
+def _unescape_field(text: str) -> str:
+    """Desfaz o escape de &, < e > de um campo HTML (inverso de escape_field)."""
+    return text.replace("&lt;", "<").replace("&gt;", ">").replace("&amp;", "&")
+
+
+def _split_anki_header(content: str) -> Tuple[Dict[str, str], str]:
+    """
+    Separa as linhas de cabeçalho do Anki (#chave:valor) do início do texto.
+
+    Args:
+        content: Conteúdo do arquivo.
+
+    Returns:
+        Tuple com (cabeçalho {chave: valor}, restante do conteúdo).
+    """
+    header = {}
+    lines = content.splitlines(keepends=True)
+    skipped = 0
+    for line in lines:
+        match = _ANKI_HEADER_LINE.match(line.rstrip("\r\n"))
+        if match is None:
+            break
+        header[match.group(1).strip().lower()] = match.group(2)
+        skipped += 1
+    return header, "".join(lines[skipped:])
+
+
 def parse_csv_cards(
     file_path: Optional[str] = None,
     csv_content: Optional[str] = None
@@ -371,7 +489,10 @@ def parse_csv_cards(
     """
     Lê flashcards de arquivo CSV ou string.
     
-    Suporta delimitadores: vírgula, ponto-e-vírgula e tab.
+    Suporta delimitadores: vírgula, ponto-e-vírgula e tab. O cabeçalho do
+    .txt exportado pelo Anki (#separator:tab, #html:true, #columns:...) é
+    ignorado, e o #separator, quando presente, define o delimitador; com
+    #html:true, &lt;, &gt; e &amp; voltam a ser <, > e &.
     
     Args:
         file_path: Caminho do arquivo CSV.
@@ -389,6 +510,7 @@ def parse_csv_cards(
         else:
             content = csv_content or ""
         
+        header, content = _split_anki_header(content)
         if not content.strip():
             return []
         
@@ -411,6 +533,13 @@ def parse_csv_cards(
             else:
                 delimiter = ',' if counts[','] >= counts[';'] else ';'
         
+        # O #separator do cabeçalho do Anki prevalece sobre a detecção
+        separator = header.get("separator", "").strip()
+        if separator:
+            delimiter = _ANKI_SEPARATORS.get(separator.lower(), separator[0])
+        
+        html = header.get("html", "").strip().lower() == "true"
+        
         reader = csv.reader(StringIO(content), delimiter=delimiter)
         
         # Headers comuns a ignorar
@@ -428,6 +557,8 @@ def parse_csv_cards(
                     # Converte <br> de volta para quebras de linha
                     q = q.replace('<br>', '\n')
                     a = a.replace('<br>', '\n')
+                    if html:
+                        q, a = _unescape_field(q), _unescape_field(a)
                     cards.append({"q": q, "a": a})
         
         return cards
@@ -437,12 +568,12 @@ def parse_csv_cards(
         return []
 
 
-def format_cards_for_export_tab(cards: List[Dict[str, str]]) -> str:
+def format_cards_for_export_tab(cards: Iterable[Mapping[str, str]]) -> str:
     """
     Formata cards para exportação em formato tabulado (Anki/Noji).
     
     Args:
-        cards: Lista de cards.
+        cards: Lista de cards ou CardStore.
     
     Returns:
         String com cards separados por tab e quebras de linha como <br>.
@@ -453,35 +584,33 @@ def format_cards_for_export_tab(cards: List[Dict[str, str]]) -> str:
         a = c['a'].replace('\\n', '\n').replace('\n', '<br>')
         lines.append(f"{q}\t{a}")
     
-    return "\n".join(lines) + ("\n" if cards else "")
+    return "\n".join(lines) + ("\n" if lines else "")
 
 
-def format_cards_for_prompt(cards: List[Dict[str, str]]) -> str:
+def format_cards_for_prompt(
+    cards: Iterable[Mapping[str, str]],
+    encoding: str = "full"
+) -> str:
     """
     Formata cards para envio em prompts de revisão.
     
     Args:
-        cards: Lista de cards.
+        cards: Lista de cards ou CardStore.
+        encoding: Codificação do deck ("full", "compact", "questions" ou
+            "truncated"; ver core.encoding).
     
     Returns:
         String formatada com numeração.
     """
-    lines = []
-    for i, c in enumerate(cards, 1):
-        lines.append(f"[Card {i}]")
-        lines.append(f"Q: {c['q']}")
-        lines.append(f"A: {c['a']}")
-        lines.append("")
-    
-    return "\n".join(lines).strip()
+    return encode_deck(cards, encoding).text
 
 
-def format_cards_for_refine(cards: List[Dict[str, str]]) -> str:
+def format_cards_for_refine(cards: Iterable[Mapping[str, str]]) -> str:
     """
     Formata cards para envio ao prompt de refinamento.
     
     Args:
-        cards: Lista de cards.
+        cards: Lista de cards ou CardStore.
     
     Returns:
         String no formato Q:/A: simples.
@@ -493,96 +622,68 @@ def format_cards_for_refine(cards: List[Dict[str, str]]) -> str:
     return "\n".join(lines).strip()
 
 
-def extract_new_cards_from_audit(response: str) -> List[Dict[str, str]]:
+def _as_sections(response: Union[str, ReviewSections]) -> ReviewSections:
+    """Reaproveita seções já tokenizadas ou tokeniza a resposta."""
+    if isinstance(response, ReviewSections):
+        return response
+    return split_review_sections(response)
+
+
+def extract_new_cards_from_audit(response: Union[str, ReviewSections]) -> List[Dict[str, str]]:
     """
     Extrai novos cards sugeridos da resposta de auditoria.
     
     Args:
-        response: Resposta completa da IA.
+        response: Resposta completa da IA (ou suas seções já tokenizadas).
     
     Returns:
         Lista de novos cards sugeridos.
     """
-    markers = [
-        "=== NOVOS CARDS SUGERIDOS ===",
-        "NOVOS CARDS SUGERIDOS",
-        "=== CARDS SUGERIDOS ==="
-    ]
-    
-    start_idx = -1
-    for marker in markers:
-        if marker in response:
-            start_idx = response.find(marker) + len(marker)
-            break
-    
-    if start_idx == -1:
-        start_idx = 0
+    sections = _as_sections(response)
+    found = sections.locate(SECTION_NEW_CARDS)
+    start_idx = found[1] if found else 0
     
-    cards_section = response[start_idx:]
+    cards_section = sections.response[start_idx:]
     return parse_cards(cards_section)
 
 
-def extract_cards_from_review(response: str) -> List[Dict[str, str]]:
+def extract_cards_from_review(response: Union[str, ReviewSections]) -> List[Dict[str, str]]:
     """
     Extrai cards finais da resposta de revisão completa.
     
     Args:
-        response: Resposta completa da IA.
+        response: Resposta completa da IA (ou suas seções já tokenizadas).
     
     Returns:
         Lista de cards finais revisados.
     """
-    markers = [
-        "=== CARDS FINAIS ===",
-        "CARDS FINAIS",
-        "=== DECK REVISADO ==="
-    ]
-    
-    start_idx = -1
-    for marker in markers:
-        if marker in response:
-            start_idx = response.find(marker) + len(marker)
-            break
+    sections = _as_sections(response)
+    found = sections.locate(SECTION_FINAL_CARDS)
     
-    if start_idx == -1:
+    if not found:
         return []
     
-    cards_section = response[start_idx:]
+    cards_section = sections.response[found[1]:]
     return parse_cards(cards_section)
 
 
-def extract_report_from_review(response: str) -> str:
+def extract_report_from_review(response: Union[str, ReviewSections]) -> str:
     """
     Extrai o relatório de alterações da resposta de revisão.
     
     Args:
-        response: Resposta completa da IA.
+        response: Resposta completa da IA (ou suas seções já tokenizadas).
     
     Returns:
         Texto do relatório de alterações.
     """
-    start_markers = [
-        "=== RELATÓRIO DE ALTERAÇÕES ===",
-        "RELATÓRIO DE ALTERAÇÕES"
-    ]
-    end_markers = [
-        "=== CARDS FINAIS ===",
-        "CARDS FINAIS"
-    ]
-    
-    start_idx = -1
-    for marker in start_markers:
-        if marker in response:
-            start_idx = response.find(marker)
-            break
+    sections = _as_sections(response)
+    found = sections.locate(SECTION_REPORT)
     
-    if start_idx == -1:
+    if not found:
         return "Relatório não encontrado na resposta."
     
-    end_idx = len(response)
-    for marker in end_markers:
-        if marker in response:
-            end_idx = response.find(marker)
-            break
+    end = sections.locate(SECTION_FINAL_CARDS)
+    end_idx = end[0] if end else len(sections.response)
     
-    return response[start_idx:end_idx].strip()
+    return sections.response[found[0]:end_idx].strip()
@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+"""
+Divisão em Subdecks
+===================
+
+Regras para dividir um conjunto grande de cards em subdecks ("Pai::Filho")
+ou em pacotes separados:
+
+- source: um subdeck por origem (arquivo ou chunk de onde o card veio)
+- tag: um subdeck pela primeira tag do card
+- cluster: agrupa perguntas parecidas (MinHash/LSH) em tópicos
+- size: partes de tamanho fixo, na ordem original
+
+A ordem dos cards é preservada dentro de cada parte.
+"""
+
+from collections import Counter
+from collections.abc import Mapping
+from typing import Dict, Iterable, List
+
+from .cards import CardStore
+from .dedup import MinHashIndex, normalize_card_text
+
+
+# Regras disponíveis: chave → descrição
+PARTITION_RULES = {
+    "source": "Por origem",
+    "tag": "Por tag",
+    "cluster": "Por tópico",
+    "size": "Por tamanho",
+}
+
+# Tamanho padrão das partes (regra "size")
+DEFAULT_PART_SIZE = 500
+
+# Similaridade mínima entre as palavras-chave de uma pergunta e o líder do
+# tópico (regra "cluster")
+CLUSTER_THRESHOLD = 0.4
+
+# Palavras em mais que esta fração dos cards (e em pelo menos
+# COMMON_WORD_MIN_CARDS cards) são comuns demais para indicar um tópico
+COMMON_WORD_RATIO = 0.5
+COMMON_WORD_MIN_CARDS = 20
+
+# Tópicos com menos cards que isto vão para o subdeck OTHER_NAME
+MIN_CLUSTER_SIZE = 5
+
+NO_SOURCE_NAME = "Sem origem"
+NO_TAG_NAME = "Sem tag"
+OTHER_NAME = "Outros"
+
+# Palavras ignoradas ao nomear um tópico (já normalizadas, sem acentos)
+_STOPWORDS = frozenset("""
+    qual quais como onde quando porque para pela pelo pelas pelos entre sobre
+    sao uma umas uns que com sem dos das nos nas ele ela eles elas isso
+    esse essa este esta seu sua seus suas mais menos muito cada todo toda
+    what which when where does with from that this have used uses using
+    explique defina descreva diferenca exemplo funcao significa serve
+""".split())
+
+
+def _deck_child_name(name: str) -> str:
+    """Limpa o nome de um subdeck ("::" criaria outro nível no Anki)."""
+    name = " ".join(name.replace("::", ":").split())
+    return name or OTHER_NAME
+
+
+def _group_by(cards: Iterable[Mapping], key, default: str) -> Dict[str, CardStore]:
+    """Agrupa os cards pelo valor de `key(card)` (vazio → default)."""
+    parts: Dict[str, CardStore] = {}
+    for card in cards:
+        name = _deck_child_name(key(card) or default)
+        store = parts.get(name)
+        if store is None:
+            store = parts[name] = CardStore()
+        store.add(card)
+    return parts
+
+
+def _first_tag(card: Mapping) -> str:
+    tags = (card.get("tags") or "").split()
+    return tags[0] if tags else ""
+
+
+def _by_size(cards: CardStore, size: int) -> Dict[str, CardStore]:
+    """Partes consecutivas de `size` cards ("Parte 01", "Parte 02", ...)."""
+    size = max(1, size)
+    num_parts = (len(cards) + size - 1) // size
+    width = max(2, len(str(num_parts)))
+    return {
+        f"Parte {i + 1:0{width}d}": cards[i * size:(i + 1) * size]
+        for i in range(num_parts)
+    }
+
+
+def _significant_words(text: str) -> List[str]:
+    """Palavras que identificam o assunto (sem stopwords, números e palavras curtas)."""
+    return [
+        word for word in normalize_card_text(text).split()
+        if len(word) > 3 and word not in _STOPWORDS and not word.isdigit()
+    ]
+
+
+def _by_cluster(cards: CardStore, min_size: int) -> Dict[str, CardStore]:
+    """
+    Agrupa perguntas parecidas.
+
+    Palavras presentes em boa parte do corpus (ex: "pergunta") não
+    distinguem tópicos e são descartadas. Cada card entra no tópico do
+    "líder" mais parecido encontrado pelo índice LSH, ou vira líder de um
+    tópico novo; sem encadeamento entre cards, um tópico não absorve os
+    vizinhos dos vizinhos, e o custo cresce com o número de cards, não de
+    pares.
+    """
+    words = [_significant_words(card["q"]) for card in cards]
+
+    document_freq = Counter()
+    for card_words in words:
+        document_freq.update(set(card_words))
+    max_freq = max(COMMON_WORD_MIN_CARDS, len(cards) * COMMON_WORD_RATIO)
+
+    index = MinHashIndex(threshold=CLUSTER_THRESHOLD, shingle_size=4)
+    topics: Dict[int, List[int]] = {}
+    others: List[int] = []
+
+    for i, card_words in enumerate(words):
+        key_words = sorted({w for w in card_words if document_freq[w] <= max_freq})
+        words[i] = key_words
+        if not key_words:
+            others.append(i)
+            continue
+
+        text = " ".join(key_words)
+        signature = index.signature(text)
+        matches = index.query(text, signature=signature)
+        if matches:
+            topics[matches[0][0]].append(i)
+        else:
+            index.insert(i, text, signature)
+            topics[i] = [i]
+
+    # Maiores tópicos primeiro; nomes repetidos recebem sufixo numérico
+    named: Dict[str, List[int]] = {}
+    for members in sorted(topics.values(), key=len, reverse=True):
+        if len(members) < min_size:
+            others.extend(members)
+            continue
+        counts = Counter(w for i in members for w in words[i])
+        base = _deck_child_name(counts.most_common(1)[0][0].capitalize())
+        name, n = base, 2
+        while name in named or name == OTHER_NAME:
+            name, n = f"{base} {n}", n + 1
+        named[name] = members
+
+    if others:
+        named[OTHER_NAME] = others
+
+    return {
+        name: CardStore(cards[i] for i in sorted(members))
+        for name, members in named.items()
+    }
+
+
+def available_partition_rules(cards: Iterable[Mapping]) -> List[str]:
+    """
+    Regras que fazem sentido para os cards.
+
+    "source" e "tag" só entram se algum card tiver origem ou tag (cards
+    gerados a partir de texto colado não têm nenhuma das duas, e a regra
+    produziria um único subdeck "Sem origem"/"Sem tag").
+
+    Args:
+        cards: Cards a dividir.
+
+    Returns:
+        Chaves de PARTITION_RULES, na ordem original.
+    """
+    has_source = has_tag = False
+    for card in cards:
+        has_source = has_source or bool(card.get("source"))
+        has_tag = has_tag or bool(_first_tag(card))
+        if has_source and has_tag:
+            break
+
+    hidden = set()
+    if not has_source:
+        hidden.add("source")
+    if not has_tag:
+        hidden.add("tag")
+    return [rule for rule in PARTITION_RULES if rule not in hidden]
+
+
+def partition_cards(
+    cards: Iterable[Mapping],
+    rule: str,
+    size: int = DEFAULT_PART_SIZE
+) -> Dict[str, CardStore]:
+    """
+    Divide os cards em partes nomeadas.
+
+    Args:
+        cards: Cards a dividir (lista de dicionários ou CardStore).
+        rule: Uma das chaves de PARTITION_RULES.
+        size: Cards por parte (regra "size").
+
+    Returns:
+        Dicionário nome da parte → CardStore, na ordem em que as partes
+        aparecem (ou da maior para a menor, na regra "cluster").
+
+    Raises:
+        ValueError: Se a regra não existir.
+    """
+    if rule not in PARTITION_RULES:
+        raise ValueError(f"Regra de divisão desconhecida: {rule}")
+
+    store = cards if isinstance(cards, CardStore) else CardStore(cards)
+
+    if rule == "source":
+        return _group_by(store, lambda c: c.get("source"), NO_SOURCE_NAME)
+    if rule == "tag":
+        return _group_by(store, _first_tag, NO_TAG_NAME)
+    if rule == "size":
+        return _by_size(store, size)
+    return _by_cluster(store, MIN_CLUSTER_SIZE)
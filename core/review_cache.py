@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+"""
+Cache de Revisões
+=================
+
+Guarda localmente (SQLite) o último resultado de revisão de cada card, por
+assunto e modo, indexado pelo hash de conteúdo do card.
+
+Numa nova revisão do mesmo deck, apenas os cards novos ou alterados são
+enviados por completo; os demais vão como um resumo compacto (só contexto)
+e o resultado é combinado com os veredictos em cache.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Mapping
+from typing import Dict, Iterable, Optional
+
+from config import DATA_DIR
+from .cards import CardStore
+from .encoding import EncodedDeck, encode_deck
+
+
+# Veredictos registrados
+VERDICT_AUDITED = "audited"
+VERDICT_KEPT = "kept"
+
+# Tamanho máximo de cada pergunta no resumo dos cards já revisados
+SUMMARY_QUESTION_CHARS = 60
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reviewed_cards (
+    subject TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    card_hash TEXT NOT NULL,
+    verdict TEXT NOT NULL,
+    q TEXT NOT NULL,
+    a TEXT NOT NULL,
+    reviewed_at REAL NOT NULL,
+    PRIMARY KEY (subject, mode, card_hash)
+)
+"""
+
+
+def _normalize_subject(subject: str) -> str:
+    return " ".join(subject.lower().split())
+
+
+class ReviewCache:
+    """
+    Armazena o último veredicto de revisão por card, assunto e modo.
+
+    Uso:
+        cache = ReviewCache()
+        plan = plan_incremental_review(cache, assunto, "final", cards)
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Abre (ou cria) o banco do cache.
+
+        Args:
+            path: Caminho do arquivo SQLite (padrão: DATA_DIR/review_cache.sqlite3).
+        """
+        if path is None:
+            path = os.path.join(DATA_DIR, "review_cache.sqlite3")
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+
+    def close(self) -> None:
+        """Fecha a conexão com o banco."""
+        with self._lock:
+            self._conn.close()
+
+    def lookup(self, subject: str, mode: str, hashes: Iterable[str]) -> Dict[str, str]:
+        """
+        Busca os veredictos em cache para um conjunto de cards.
+
+        Args:
+            subject: Assunto do deck.
+            mode: Modo de revisão ("audit" ou "final").
+            hashes: Hashes de conteúdo dos cards.
+
+        Returns:
+            Dicionário hash → veredicto (apenas os encontrados).
+        """
+        subject = _normalize_subject(subject)
+        hashes = list(hashes)
+        found = {}
+
+        with self._lock:
+            # Consulta em lotes para respeitar o limite de parâmetros do SQLite
+            for i in range(0, len(hashes), 500):
+                batch = hashes[i:i + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT card_hash, verdict FROM reviewed_cards "
+                    f"WHERE subject = ? AND mode = ? AND card_hash IN ({placeholders})",
+                    [subject, mode, *batch]
+                ).fetchall()
+                found.update(rows)
+
+        return found
+
+    def record(
+        self,
+        subject: str,
+        mode: str,
+        cards: Iterable[Mapping[str, str]],
+        verdict: str
+    ) -> int:
+        """
+        Registra o veredicto de revisão de vários cards.
+
+        Args:
+            subject: Assunto do deck.
+            mode: Modo de revisão.
+            cards: Cards revisados.
+            verdict: Veredicto (VERDICT_*).
+
+        Returns:
+            Número de cards registrados.
+        """
+        subject = _normalize_subject(subject)
+        now = time.time()
+        rows = [
+            (subject, mode, c.content_hash, verdict, c["q"], c["a"], now)
+            for c in CardStore(cards)
+        ]
+
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO reviewed_cards "
+                    "(subject, mode, card_hash, verdict, q, a, reviewed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+
+        return len(rows)
+
+    def clear(self, subject: Optional[str] = None) -> None:
+        """
+        Remove entradas do cache.
+
+        Args:
+            subject: Assunto a limpar (padrão: todos).
+        """
+        with self._lock:
+            with self._conn:
+                if subject is None:
+                    self._conn.execute("DELETE FROM reviewed_cards")
+                else:
+                    self._conn.execute(
+                        "DELETE FROM reviewed_cards WHERE subject = ?",
+                        (_normalize_subject(subject),)
+                    )
+
+
+class IncrementalPlan:
+    """
+    Divisão de um deck entre cards a revisar e cards já revisados.
+
+    Atributos:
+        subject: Assunto do deck.
+        mode: Modo de revisão.
+        changed: Cards novos ou alterados (enviados por completo).
+        cached: Cards sem alteração desde a última revisão.
+    """
+
+    def __init__(self, subject: str, mode: str, changed: CardStore, cached: CardStore):
+        self.subject = subject
+        self.mode = mode
+        self.changed = changed
+        self.cached = cached
+
+    @property
+    def saved_ratio(self) -> float:
+        """Fração do deck que não precisa ser reenviada."""
+        total = len(self.changed) + len(self.cached)
+        return len(self.cached) / total if total else 0.0
+
+    def build_prompt_deck(self, encoding: str = "full") -> EncodedDeck:
+        """
+        Monta o deck a enviar: cards alterados + resumo dos já revisados.
+
+        Args:
+            encoding: Codificação dos cards alterados (ver core.encoding).
+
+        Returns:
+            EncodedDeck cujos números referem-se apenas aos cards alterados.
+        """
+        encoded = encode_deck(self.changed, encoding)
+        if not self.cached:
+            return encoded
+
+        lines = [
+            encoded.text,
+            "",
+            f"[CARDS JÁ REVISADOS: {len(self.cached)}]",
+            "(Sem alterações desde a última revisão. Use apenas como contexto de "
+            "cobertura; NÃO os inclua nem os repita na saída.)",
+        ]
+        for c in self.cached:
+            question = c["q"].replace("\n", " ")
+            if len(question) > SUMMARY_QUESTION_CHARS:
+                question = question[:SUMMARY_QUESTION_CHARS].rstrip() + "…"
+            lines.append(f"• {question}")
+
+        return EncodedDeck("\n".join(lines), encoded.encoding, encoded.refs)
+
+    def merge(self, result_cards: Iterable[Mapping[str, str]]) -> CardStore:
+        """
+        Combina o resultado da IA com os cards em cache.
+
+        Na revisão final, o deck final é (cards em cache + cards revisados);
+        na auditoria, o resultado são apenas os novos cards sugeridos.
+
+        Args:
+            result_cards: Cards extraídos da resposta.
+
+        Returns:
+            CardStore com o resultado combinado.
+        """
+        if self.mode == "final":
+            return self.cached + result_cards
+        return CardStore(result_cards)
+
+    def commit(self, cache: ReviewCache, result_cards: Iterable[Mapping[str, str]]) -> None:
+        """
+        Registra o resultado no cache após uma revisão bem-sucedida.
+
+        Args:
+            cache: Cache de revisões.
+            result_cards: Cards extraídos da resposta.
+        """
+        if self.mode == "final":
+            # O deck final inteiro passa a ser a referência aprovada
+            cache.record(self.subject, self.mode, self.merge(result_cards), VERDICT_KEPT)
+        else:
+            cache.record(self.subject, self.mode, self.changed, VERDICT_AUDITED)
+
+
+def plan_incremental_review(
+    cache: ReviewCache,
+    subject: str,
+    mode: str,
+    cards: Iterable[Mapping[str, str]]
+) -> IncrementalPlan:
+    """
+    Separa os cards que mudaram desde a última revisão do mesmo assunto.
+
+    Args:
+        cache: Cache de revisões.
+        subject: Assunto do deck.
+        mode: Modo de revisão ("audit" ou "final").
+        cards: Deck a revisar.
+
+    Returns:
+        IncrementalPlan com cards alterados e cards em cache.
+    """
+    store = cards if isinstance(cards, CardStore) else CardStore(cards)
+    hashes = [c.content_hash for c in store]
+    known = cache.lookup(subject, mode, hashes)
+
+    changed = CardStore()
+    cached = CardStore()
+    for card, digest in zip(store, hashes):
+        (cached if digest in known else changed).add(card)
+
+    return IncrementalPlan(subject, mode, changed, cached)
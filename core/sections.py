@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""
+Seções das Respostas de Revisão
+===============================
+
+Tokenizador que percorre a resposta da IA uma única vez e localiza todos os
+marcadores de seção ("=== NOVOS CARDS SUGERIDOS ===", "CARDS FINAIS", ...).
+
+As funções de extração do parser e o formatador da interface reutilizam o
+mesmo resultado em vez de procurar cada marcador separadamente.
+"""
+
+import re
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+# ==============================================================================
+# TIPOS DE SEÇÃO
+# ==============================================================================
+
+SECTION_PREAMBLE = "preamble"
+SECTION_COVERED = "covered"
+SECTION_GAPS = "gaps"
+SECTION_PROBLEMS = "problems"
+SECTION_NEW_CARDS = "new_cards"
+SECTION_REPORT = "report"
+SECTION_STATS = "stats"
+SECTION_FINAL_CARDS = "final_cards"
+
+# Marcadores por tipo, em ordem de prioridade (o primeiro presente vence)
+SECTION_MARKERS: Dict[str, List[str]] = {
+    SECTION_COVERED: ["=== CONCEITOS COBERTOS ==="],
+    SECTION_GAPS: ["=== LACUNAS IDENTIFICADAS ==="],
+    SECTION_PROBLEMS: ["=== PROBLEMAS NO DECK ATUAL ==="],
+    SECTION_NEW_CARDS: [
+        "=== NOVOS CARDS SUGERIDOS ===",
+        "NOVOS CARDS SUGERIDOS",
+        "=== CARDS SUGERIDOS ===",
+    ],
+    SECTION_REPORT: [
+        "=== RELATÓRIO DE ALTERAÇÕES ===",
+        "RELATÓRIO DE ALTERAÇÕES",
+    ],
+    SECTION_STATS: ["ESTATÍSTICAS"],
+    SECTION_FINAL_CARDS: [
+        "=== CARDS FINAIS ===",
+        "CARDS FINAIS",
+        "=== DECK REVISADO ===",
+    ],
+}
+
+_MARKER_KIND = {
+    marker: kind
+    for kind, markers in SECTION_MARKERS.items()
+    for marker in markers
+}
+
+# Alternativas mais longas primeiro: "=== CARDS FINAIS ===" antes de "CARDS FINAIS"
+_MARKER_PATTERN = re.compile(
+    "|".join(re.escape(m) for m in sorted(_MARKER_KIND, key=len, reverse=True))
+)
+
+
+class ResponseSection:
+    """
+    Trecho da resposta iniciado por um marcador de seção.
+
+    Atributos:
+        kind: Tipo da seção (SECTION_*).
+        marker: Marcador encontrado (None para o preâmbulo).
+        start: Início da linha do marcador.
+        body_start: Início do conteúdo (linha seguinte ao marcador).
+        end: Fim da seção (início da próxima seção ou fim do texto).
+    """
+
+    __slots__ = ("kind", "marker", "start", "body_start", "end", "_source")
+
+    def __init__(
+        self,
+        source: str,
+        kind: str,
+        marker: Optional[str],
+        start: int,
+        body_start: int,
+        end: int
+    ):
+        self._source = source
+        self.kind = kind
+        self.marker = marker
+        self.start = start
+        self.body_start = body_start
+        self.end = end
+
+    @property
+    def header(self) -> str:
+        """Linha do marcador (vazia para o preâmbulo)."""
+        return self._source[self.start:self.body_start].rstrip("\n")
+
+    @property
+    def body(self) -> str:
+        """Conteúdo da seção sem a linha do marcador."""
+        return self._source[self.body_start:self.end]
+
+    @property
+    def text(self) -> str:
+        """Seção completa, incluindo o marcador."""
+        return self._source[self.start:self.end]
+
+    def __repr__(self) -> str:
+        return f"ResponseSection({self.kind!r}, {self.start}:{self.end})"
+
+
+class ReviewSections:
+    """
+    Resultado do tokenizador: seções tipadas com offsets na resposta original.
+
+    Uso:
+        sections = split_review_sections(response)
+        cards = extract_cards_from_review(sections)
+        for section in sections:
+            print(section.kind, section.header)
+    """
+
+    def __init__(self, response: str):
+        """
+        Percorre a resposta uma única vez registrando todos os marcadores.
+
+        Args:
+            response: Resposta completa da IA.
+        """
+        self.response = response or ""
+        self._first: Dict[str, Tuple[int, int]] = {}
+        self.sections: List[ResponseSection] = []
+
+        text = self.response
+        occurrences = []
+        for match in _MARKER_PATTERN.finditer(text):
+            marker = match.group()
+            self._first.setdefault(marker, (match.start(), match.end()))
+            occurrences.append((match.start(), marker))
+
+        # Uma seção por linha de marcador; marcadores repetidos na mesma linha
+        # pertencem à mesma seção
+        starts = []
+        for pos, marker in occurrences:
+            line_start = text.rfind("\n", 0, pos) + 1
+            if starts and starts[-1][0] == line_start:
+                continue
+            starts.append((line_start, marker))
+
+        first_start = starts[0][0] if starts else len(text)
+        if text[:first_start].strip():
+            self.sections.append(
+                ResponseSection(text, SECTION_PREAMBLE, None, 0, 0, first_start)
+            )
+
+        for i, (line_start, marker) in enumerate(starts):
+            line_end = text.find("\n", line_start)
+            body_start = len(text) if line_end == -1 else line_end + 1
+            end = starts[i + 1][0] if i + 1 < len(starts) else len(text)
+            self.sections.append(
+                ResponseSection(
+                    text, _MARKER_KIND[marker], marker, line_start, body_start, end
+                )
+            )
+
+    def __iter__(self) -> Iterator[ResponseSection]:
+        return iter(self.sections)
+
+    def __len__(self) -> int:
+        return len(self.sections)
+
+    def get(self, kind: str) -> Optional[ResponseSection]:
+        """
+        Retorna a primeira seção de um tipo.
+
+        Args:
+            kind: Tipo da seção (SECTION_*).
+
+        Returns:
+            A seção ou None se não existir.
+        """
+        for section in self.sections:
+            if section.kind == kind:
+                return section
+        return None
+
+    def locate(self, kind: str) -> Optional[Tuple[int, int]]:
+        """
+        Localiza o marcador de maior prioridade de um tipo.
+
+        Mantém a semântica de `marker in response` + `response.find(marker)`
+        aplicada aos marcadores do tipo, em ordem.
+
+        Args:
+            kind: Tipo da seção (SECTION_*).
+
+        Returns:
+            Tuple (início, fim) do marcador ou None se nenhum estiver presente.
+        """
+        for marker in SECTION_MARKERS[kind]:
+            if marker in self._first:
+                return self._first[marker]
+        return None
+
+
+def split_review_sections(response: str) -> ReviewSections:
+    """
+    Divide a resposta de auditoria/revisão em seções tipadas.
+
+    Args:
+        response: Resposta completa da IA.
+
+    Returns:
+        Instância de ReviewSections.
+    """
+    return ReviewSections(response)
@@ -11,6 +11,8 @@ Versão: 3.0
 """
 
 import tkinter as tk
+from tkinter import messagebox
+from config import ProfileError, get_profiles
 from utils.validators import validar_api_key
 from ui.app import AnkiLabApp
 
@@ -18,13 +20,24 @@ from ui.app import AnkiLabApp
 def main():
     """Inicializa e executa a aplicação AnkiLab."""
     
-    # Validação da API Key antes de iniciar a UI
-    api_key = validar_api_key()
+    # Uma única instância do Tk: também exibe o erro de API Key, se houver
+    root = tk.Tk()
+    
+    # Validação da API Key antes de montar a UI (a verificação no serviço
+    # roda em segundo plano, ver AnkiLabApp)
+    api_key = validar_api_key(root)
     if not api_key:
+        root.destroy()
         raise SystemExit(1)
     
-    # Inicialização da janela principal
-    root = tk.Tk()
+    # Perfil de modelos (ANKILAB_PROFILE) inexistente: mesmo erro de select()
+    try:
+        get_profiles()
+    except ProfileError as e:
+        root.withdraw()
+        messagebox.showerror("Perfil inválido", f"ANKILAB_PROFILE: {e}")
+        root.destroy()
+        raise SystemExit(1)
     
     # Instancia a aplicação
     _ = AnkiLabApp(root)
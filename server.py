@@ -0,0 +1,555 @@
+# -*- coding: utf-8 -*-
+"""
+Serviço HTTP de Tarefas
+=======================
+
+Modo serviço local para outras ferramentas enviarem documentos sem a
+interface gráfica. Só usa a biblioteca padrão (http.server + SQLite):
+
+- os pedidos de geração, refinamento e revisão entram na tabela persistente
+  de tarefas (core.job_store), então sobrevivem a reinícios;
+- um pool fixo de threads (`workers`) processa a fila, e o semáforo de
+  core/api.py limita as chamadas simultâneas à API;
+- o estado, o resultado e as métricas são consultados por HTTP.
+
+Endpoints (JSON):
+    POST   /jobs                 {"kind": "generate", "text": "..."} → 202 {"id"}
+    GET    /jobs[?state=&limit=] tarefas mais recentes
+    GET    /jobs/<id>            estado e tempos
+    GET    /jobs/<id>/result     resultado (409 enquanto não terminar)
+    DELETE /jobs/<id>            cancela uma tarefa ainda na fila
+    GET    /metrics              contagens, tempos médios, vazão
+    GET    /health
+
+Pedidos por tipo:
+    generate: text, quantity ("AUTO"), hard, refine
+    refine:   cards [{"q", "a"}], text, hard
+    review:   cards [{"q", "a"}], subject, mode ("audit"/"final"), encoding,
+              dedup (padrão: true; as duplicatas ignoradas voltam no resultado)
+
+Uso:
+    ankilab serve --port 8765 --workers 4
+    client = JobClient("http://127.0.0.1:8765")
+    job_id = client.submit("generate", text="...")
+    cards = client.wait_result(job_id)["cards"]
+"""
+
+import json
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from config import JOB_WORKERS
+from core.job_store import JobStore
+from core.jobs import CANCELLED, DONE, FAILED, QUEUED, RUNNING
+
+
+# Endereço padrão (só a máquina local)
+SERVICE_HOST = "127.0.0.1"
+SERVICE_PORT = 8765
+
+# Tamanho máximo do corpo de um pedido
+MAX_BODY_BYTES = 20 * 1024 * 1024
+
+# Espera máxima de uma thread ociosa antes de olhar a fila de novo (s)
+IDLE_POLL_SECONDS = 1.0
+
+_JOB_PATH = re.compile(r"^/jobs/(\d+)(/result)?$")
+
+
+# ==============================================================================
+# EXECUÇÃO DAS TAREFAS
+# ==============================================================================
+
+def _payload_cards(payload: Dict[str, Any]) -> List[Dict[str, str]]:
+    cards = payload.get("cards")
+    if not isinstance(cards, list) or not cards:
+        raise ValueError("'cards' deve ser uma lista não vazia de {\"q\", \"a\"}")
+    for card in cards:
+        if not isinstance(card, dict) or not isinstance(card.get("q"), str) \
+                or not isinstance(card.get("a"), str):
+            raise ValueError("cada card precisa de 'q' e 'a' (texto)")
+    return [{"q": c["q"], "a": c["a"]} for c in cards]
+
+
+def run_generate(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Gera (e opcionalmente refina) cards a partir de `text`."""
+    from core import generate_cards, refine_cards
+
+    text = payload["text"]
+    hard = bool(payload.get("hard"))
+    cards = generate_cards(text, str(payload.get("quantity", "AUTO")), hard)
+    if payload.get("refine") and cards:
+        cards = refine_cards(text, cards, hard)
+    return {"cards": cards}
+
+
+def run_refine(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Refina `cards` (com o texto-fonte `text`, se houver)."""
+    from core import refine_cards
+
+    cards = _payload_cards(payload)
+    return {"cards": refine_cards(payload.get("text", ""), cards, bool(payload.get("hard")))}
+
+
+def run_review(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Audita ou revisa `cards`; devolve os cards e o relatório."""
+    from core import (
+        dedup_cards,
+        describe_duplicates,
+        encode_deck,
+        extract_cards_from_review,
+        extract_new_cards_from_audit,
+        extract_report_from_review,
+        review_deck,
+        split_review_sections,
+    )
+
+    mode = payload.get("mode", "audit")
+    cards = _payload_cards(payload)
+    cards, duplicates = dedup_cards(cards) if payload.get("dedup", True) else (cards, [])
+    encoded = encode_deck(cards, payload.get("encoding", "full"))
+    response = review_deck(payload["subject"], encoded.text, mode)
+
+    sections = split_review_sections(response)
+    if mode == "audit":
+        result_cards, report = extract_new_cards_from_audit(sections), response
+    else:
+        result_cards, report = extract_cards_from_review(sections), extract_report_from_review(sections)
+    return {
+        "cards": result_cards, "report": report,
+        "duplicates": describe_duplicates(duplicates),
+    }
+
+
+# Tipo da tarefa → função que recebe o pedido e devolve o resultado (JSON)
+DEFAULT_HANDLERS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    "generate": run_generate,
+    "refine": run_refine,
+    "review": run_review,
+}
+
+
+def validate_payload(kind: str, payload: Dict[str, Any]) -> None:
+    """
+    Confere os campos obrigatórios antes de enfileirar.
+
+    Args:
+        kind: Tipo da tarefa.
+        payload: Pedido.
+
+    Raises:
+        ValueError: Se faltar algum campo ou o valor for inválido.
+    """
+    if kind == "generate":
+        text = payload.get("text")
+        if not isinstance(text, str) or not text.strip():
+            raise ValueError("'text' é obrigatório")
+    elif kind in ("refine", "review"):
+        _payload_cards(payload)
+
+    if kind == "review":
+        subject = payload.get("subject")
+        if not isinstance(subject, str) or not subject.strip():
+            raise ValueError("'subject' é obrigatório")
+        mode = payload.get("mode", "audit")
+        if mode not in ("audit", "final"):
+            raise ValueError("'mode' deve ser 'audit' ou 'final'")
+        if not isinstance(payload.get("dedup", True), bool):
+            raise ValueError("'dedup' deve ser true ou false")
+
+        from core.encoding import check_encoding_mode
+        check_encoding_mode(payload.get("encoding", "full"), mode)
+
+
+class JobService:
+    """
+    Pool de threads que processa a tabela persistente de tarefas.
+
+    Uso:
+        service = JobService(JobStore(), workers=4)
+        service.start()
+        job_id = service.submit("generate", {"text": "..."})
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        handlers: Optional[Dict[str, Callable[[Dict[str, Any]], Any]]] = None,
+        workers: int = JOB_WORKERS,
+        on_change: Optional[Callable[[int, str, str, Optional[str]], None]] = None
+    ):
+        """
+        Args:
+            store: Tabela de tarefas.
+            handlers: Tipo → função executada (padrão: DEFAULT_HANDLERS; um
+                backend substituto pode ser passado aqui para testes).
+            workers: Tarefas executadas ao mesmo tempo.
+            on_change: Recebe (id, tipo, estado, erro) a cada mudança de
+                estado, na thread que a causou.
+        """
+        self.store = store
+        self.handlers = DEFAULT_HANDLERS if handlers is None else handlers
+        self.workers = max(1, workers)
+        self.on_change = on_change
+
+        self.started = time.time()
+        self._wakeup = threading.Condition()
+        self._stopping = False
+        self._threads: List[threading.Thread] = []
+        self._busy = 0
+        self._busy_lock = threading.Lock()
+
+    def start(self) -> None:
+        """Inicia as threads do pool (daemon)."""
+        for i in range(self.workers):
+            thread = threading.Thread(
+                target=self._work, name=f"ankilab-service-{i + 1}", daemon=True
+            )
+            self._threads.append(thread)
+            thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Para o pool depois das tarefas em andamento (as que não terminarem
+        a tempo voltam para a fila na próxima abertura da tabela).
+
+        Args:
+            timeout: Espera máxima total, em segundos.
+        """
+        with self._wakeup:
+            self._stopping = True
+            self._wakeup.notify_all()
+        deadline = time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+
+    def submit(self, kind: str, payload: Dict[str, Any]) -> int:
+        """
+        Valida e enfileira uma tarefa.
+
+        Args:
+            kind: Tipo da tarefa (chave de `handlers`).
+            payload: Pedido.
+
+        Returns:
+            ID da tarefa.
+
+        Raises:
+            ValueError: Tipo desconhecido ou pedido inválido.
+        """
+        if not isinstance(kind, str) or kind not in self.handlers:
+            raise ValueError(f"tipo desconhecido: {kind} (use {', '.join(self.handlers)})")
+        validate_payload(kind, payload)
+
+        job_id = self.store.submit(kind, payload)
+        self._notify(job_id, kind, QUEUED, None)
+        with self._wakeup:
+            self._wakeup.notify()
+        return job_id
+
+    def cancel(self, job_id: int) -> bool:
+        """Cancela uma tarefa que ainda está na fila."""
+        if not self.store.cancel(job_id):
+            return False
+        job = self.store.get(job_id)
+        self._notify(job_id, job["kind"], CANCELLED, None)
+        return True
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Métricas do serviço.
+
+        Returns:
+            Contagens por estado, tempos médios, tarefas terminadas no
+            último minuto, workers ocupados e tempo no ar.
+        """
+        metrics = self.store.stats()
+        metrics.update({
+            "workers": self.workers,
+            "busy": self._busy,
+            "uptime": time.time() - self.started,
+        })
+        return metrics
+
+    def _work(self) -> None:
+        """Laço de uma thread do pool."""
+        while True:
+            with self._wakeup:
+                if self._stopping:
+                    return
+            claimed = self.store.claim()
+            if claimed is None:
+                with self._wakeup:
+                    if not self._stopping:
+                        self._wakeup.wait(IDLE_POLL_SECONDS)
+                continue
+            self._run(*claimed)
+
+    def _run(self, job_id: int, kind: str, payload: Dict[str, Any]) -> None:
+        """Executa uma tarefa e grava o resultado."""
+        with self._busy_lock:
+            self._busy += 1
+        self._notify(job_id, kind, RUNNING, None)
+        try:
+            handler = self.handlers.get(kind)
+            if handler is None:
+                raise ValueError(f"tipo desconhecido: {kind}")
+            result = handler(payload)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            self.store.fail(job_id, error)
+            self._notify(job_id, kind, FAILED, error)
+        else:
+            self.store.finish(job_id, result)
+            self._notify(job_id, kind, DONE, None)
+        finally:
+            with self._busy_lock:
+                self._busy -= 1
+
+    def _notify(self, job_id: int, kind: str, state: str, error: Optional[str]) -> None:
+        if self.on_change is None:
+            return
+        try:
+            self.on_change(job_id, kind, state, error)
+        except Exception as e:
+            print(f"[JobService] Erro: {e}")
+
+
+# ==============================================================================
+# HTTP
+# ==============================================================================
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """Rotas do serviço (o JobService fica em `self.server.service`)."""
+
+    server_version = "AnkiLab"
+
+    def log_message(self, format, *args):
+        # Os eventos das tarefas já são emitidos pelo JobService
+        pass
+
+    def _send(self, status: int, body: Any) -> None:
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _error(self, status: int, message: str, **extra: Any) -> None:
+        self._send(status, {"error": message, **extra})
+
+    def _read_json(self) -> Optional[Dict[str, Any]]:
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self._error(400, "Content-Length inválido")
+            return None
+        if length > MAX_BODY_BYTES:
+            self._error(413, f"pedido maior que {MAX_BODY_BYTES} bytes")
+            return None
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError as e:
+            self._error(400, f"JSON inválido: {e}")
+            return None
+        if not isinstance(body, dict):
+            self._error(400, "o corpo deve ser um objeto JSON")
+            return None
+        return body
+
+    def do_GET(self):
+        service: JobService = self.server.service
+        url = urlparse(self.path)
+
+        if url.path == "/health":
+            self._send(200, {"status": "ok"})
+        elif url.path == "/metrics":
+            self._send(200, service.metrics())
+        elif url.path == "/jobs":
+            query = parse_qs(url.query)
+            state = query.get("state", [None])[0]
+            try:
+                limit = int(query.get("limit", ["100"])[0])
+            except ValueError:
+                self._error(400, "'limit' deve ser um número")
+                return
+            self._send(200, {"jobs": service.store.list(state, limit)})
+        else:
+            match = _JOB_PATH.match(url.path)
+            if match is None:
+                self._error(404, "rota inexistente")
+                return
+
+            job_id = int(match.group(1))
+            job = service.store.get(job_id)
+            if job is None:
+                self._error(404, f"tarefa {job_id} inexistente")
+            elif not match.group(2):
+                self._send(200, job)
+            elif job["state"] != DONE:
+                self._error(409, "tarefa sem resultado", state=job["state"], detail=job["error"])
+            else:
+                self._send(200, {"id": job_id, "result": service.store.result(job_id)})
+
+    def do_POST(self):
+        service: JobService = self.server.service
+        if urlparse(self.path).path != "/jobs":
+            self._error(404, "rota inexistente")
+            return
+
+        body = self._read_json()
+        if body is None:
+            return
+        kind = body.pop("kind", None)
+        try:
+            job_id = service.submit(kind, body)
+        except ValueError as e:
+            self._error(400, str(e))
+            return
+        self._send(202, {"id": job_id, "state": QUEUED})
+
+    def do_DELETE(self):
+        service: JobService = self.server.service
+        match = _JOB_PATH.match(urlparse(self.path).path)
+        if match is None or match.group(2):
+            self._error(404, "rota inexistente")
+            return
+
+        job_id = int(match.group(1))
+        job = service.store.get(job_id)
+        if job is None:
+            self._error(404, f"tarefa {job_id} inexistente")
+            return
+        self._send(200, {"id": job_id, "cancelled": service.cancel(job_id)})
+
+
+class _ServiceHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # A fila de conexões padrão (5) recusa rajadas de clientes simultâneos
+    request_queue_size = 128
+
+
+def create_server(service: JobService, host: str = SERVICE_HOST, port: int = SERVICE_PORT) -> ThreadingHTTPServer:
+    """
+    Cria o servidor HTTP do serviço (sem iniciá-lo).
+
+    Args:
+        service: Serviço de tarefas.
+        host: Endereço de escuta.
+        port: Porta (0 = escolhida pelo sistema).
+
+    Returns:
+        ThreadingHTTPServer; chame `serve_forever()` para atender.
+    """
+    server = _ServiceHTTPServer((host, port), _RequestHandler)
+    server.service = service
+    return server
+
+
+# ==============================================================================
+# CLIENTE
+# ==============================================================================
+
+class ServiceError(Exception):
+    """Resposta de erro do serviço."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(f"{status}: {message}")
+        self.status = status
+
+
+class JobClient:
+    """
+    Cliente do serviço (só biblioteca padrão).
+
+    Uso:
+        client = JobClient("http://127.0.0.1:8765")
+        job_id = client.submit("refine", cards=[{"q": "...", "a": "..."}])
+        result = client.wait_result(job_id)
+    """
+
+    def __init__(self, base_url: str = f"http://{SERVICE_HOST}:{SERVICE_PORT}", timeout: float = 30.0):
+        """
+        Args:
+            base_url: Endereço do serviço.
+            timeout: Tempo máximo de cada requisição (s).
+        """
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def _request(self, method: str, path: str, body: Optional[Dict[str, Any]] = None) -> Any:
+        data = None if body is None else json.dumps(body).encode("utf-8")
+        request = urllib.request.Request(
+            self.base_url + path, data=data, method=method,
+            headers={"Content-Type": "application/json"}
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            try:
+                message = json.loads(e.read()).get("error", e.reason)
+            except ValueError:
+                message = e.reason
+            raise ServiceError(e.code, message)
+
+    def submit(self, kind: str, **payload: Any) -> int:
+        """Enfileira uma tarefa e devolve o ID."""
+        return self._request("POST", "/jobs", {"kind": kind, **payload})["id"]
+
+    def status(self, job_id: int) -> Dict[str, Any]:
+        """Estado e tempos de uma tarefa."""
+        return self._request("GET", f"/jobs/{job_id}")
+
+    def result(self, job_id: int) -> Any:
+        """Resultado de uma tarefa concluída (ServiceError 409 se não estiver)."""
+        return self._request("GET", f"/jobs/{job_id}/result")["result"]
+
+    def cancel(self, job_id: int) -> bool:
+        """Cancela uma tarefa ainda na fila."""
+        return self._request("DELETE", f"/jobs/{job_id}")["cancelled"]
+
+    def jobs(self, state: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """Tarefas mais recentes."""
+        query = f"?limit={limit}" + (f"&state={state}" if state else "")
+        return self._request("GET", f"/jobs{query}")["jobs"]
+
+    def metrics(self) -> Dict[str, Any]:
+        """Métricas do serviço."""
+        return self._request("GET", "/metrics")
+
+    def wait_result(self, job_id: int, poll: float = 0.5, timeout: Optional[float] = None) -> Any:
+        """
+        Espera a tarefa terminar e devolve o resultado.
+
+        Args:
+            job_id: ID da tarefa.
+            poll: Intervalo entre consultas (s).
+            timeout: Espera máxima (s; None = sem limite).
+
+        Returns:
+            Resultado da tarefa.
+
+        Raises:
+            ServiceError: Se a tarefa falhar ou for cancelada.
+            TimeoutError: Se o tempo acabar.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            job = self.status(job_id)
+            if job["state"] == DONE:
+                return self.result(job_id)
+            if job["state"] in (FAILED, CANCELLED):
+                raise ServiceError(409, job["error"] or job["state"])
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError(f"tarefa {job_id} ainda em {job['state']}")
+            time.sleep(poll)
@@ -6,15 +6,26 @@ Classe Principal da Aplicação
 Gerencia a janela principal, notebook de abas e coordenação geral.
 """
 
+import threading
 import tkinter as tk
 from tkinter import ttk, messagebox
 
-from config import APP_NAME, APP_VERSION, APP_TAGLINE, MODEL_NAME, MODEL_ADVANCED, MODEL_REFINEMENT
+from utils.validators import verificar_api_key
+from config import APP_NAME, APP_VERSION, APP_TAGLINE, get_profiles
+from core.jobs import Job, get_job_queue
 from .theme import NeuroTheme
+from .event_bus import EVENT_POLL_MS, STATUS, get_event_bus
+from .components.jobs_panel import JobsPanel
 from .tabs.generate_tab import GenerateTab
 from .tabs.review_tab import ReviewTab
 
 
+# Intervalo entre verificações do arquivo de perfis de modelo (ms)
+PROFILE_POLL_MS = 2000
+
+JOBS_TAB_TITLE = "  ⚙️ Tarefas  "
+
+
 class AnkiLabApp:
     """
     Aplicação principal AnkiLab.
@@ -32,6 +43,13 @@ class AnkiLabApp:
         self.root = root
         self.theme = NeuroTheme
         
+        # Eventos das threads de trabalho, drenados periodicamente na thread do Tk
+        self.events = get_event_bus()
+        self.events.subscribe(STATUS, self._apply_status)
+        
+        # Verificação da API Key em paralelo com a montagem da interface
+        self._start_preflight()
+        
         # Configuração da janela
         self._configure_window()
         
@@ -39,6 +57,12 @@ class AnkiLabApp:
         self._build_header()
         self._build_notebook()
         self._build_footer()
+        
+        # Perfis de modelo editados com o app aberto
+        self._profile_state = None
+        self._poll_profiles()
+        
+        self._poll_events()
     
     def _configure_window(self):
         """Configura propriedades da janela principal."""
@@ -105,11 +129,12 @@ class AnkiLabApp:
             bg=self.theme.BG_TERTIARY, fg=self.theme.ACCENT_PRIMARY
         ).pack(side="left", padx=(0, 3))
         
-        tk.Label(
-            model_frame, text=f"{MODEL_NAME} / {MODEL_ADVANCED} / {MODEL_REFINEMENT}",
+        self.model_label = tk.Label(
+            model_frame, text="",
             font=self.theme.get_mono_font(7),
             bg=self.theme.BG_TERTIARY, fg=self.theme.TEXT_PRIMARY
-        ).pack(side="left")
+        )
+        self.model_label.pack(side="left")
     
     def _build_notebook(self):
         """Constrói o notebook com as abas."""
@@ -149,6 +174,14 @@ class AnkiLabApp:
         self.notebook.add(tab_review, text="  🔍 Revisar Deck  ")
         self.review_tab = ReviewTab(tab_review, self.theme, self._update_status)
         
+        # Aba de Tarefas (fila compartilhada pelas outras abas)
+        self.tab_jobs = tk.Frame(self.notebook, bg=self.theme.BG_MAIN)
+        self.notebook.add(self.tab_jobs, text=JOBS_TAB_TITLE)
+        self.jobs_panel = JobsPanel(
+            self.tab_jobs, self.theme, get_job_queue(),
+            open_callback=self._open_job, count_callback=self._update_jobs_tab
+        )
+        
         # Atalho global
         self.root.bind("<Control-Return>", lambda e: self.generate_tab.gerar_cards())
     
@@ -187,14 +220,101 @@ class AnkiLabApp:
             bg=self.theme.BG_SECONDARY, fg=self.theme.TEXT_MUTED
         ).pack(side="right")
     
+    def _update_jobs_tab(self, active: int):
+        """
+        Mostra no título da aba o número de tarefas ativas.
+        
+        Args:
+            active: Tarefas na fila ou em execução.
+        """
+        title = f"  ⚙️ Tarefas ({active})  " if active else JOBS_TAB_TITLE
+        self.notebook.tab(self.tab_jobs, text=title)
+    
+    def _open_job(self, job: Job):
+        """
+        Abre o resultado de uma tarefa na aba de origem.
+        
+        Args:
+            job: Tarefa concluída.
+        """
+        if job.kind == "generation":
+            self.notebook.select(0)
+            self.generate_tab.show_job_result(job)
+        elif job.kind == "review":
+            self.notebook.select(1)
+            self.review_tab.show_job_result(job)
+    
+    def _poll_profiles(self):
+        """Atualiza os modelos exibidos quando o perfil ou o arquivo de perfis muda."""
+        profiles = get_profiles()
+        name = profiles.active
+        state = (name, profiles.version, profiles.error)
+        
+        if state != self._profile_state:
+            self._profile_state = state
+            generation, refinement, review = (
+                profiles.params(task).model for task in ("generation", "refinement", "review")
+            )
+            self.model_label.config(text=f"{name}: {generation} / {review} / {refinement}")
+            self.review_tab.model_label.config(text=f"Usando: {review}")
+            
+            if profiles.error:
+                self._update_status(f"Perfis ignorados: {profiles.error}", "error")
+        
+        self.root.after(PROFILE_POLL_MS, self._poll_profiles)
+    
+    def _start_preflight(self):
+        """Verifica a API Key e aquece a conexão em segundo plano."""
+        def verificar():
+            ok, mensagem = verificar_api_key()
+            self.events.call_soon(lambda: self._finish_preflight(ok, mensagem))
+        
+        threading.Thread(target=verificar, daemon=True).start()
+    
+    def _finish_preflight(self, ok: bool, mensagem: str):
+        """
+        Mostra o resultado da verificação da API Key.
+        
+        Args:
+            ok: Se a verificação passou.
+            mensagem: Texto para o usuário.
+        """
+        if ok:
+            # Não sobrescreve o status de uma operação já iniciada
+            if self.status_label.cget("text") == "Pronto":
+                self._update_status(f"Pronto • {mensagem}", "success")
+            return
+        
+        self._update_status(mensagem, "error")
+        messagebox.showwarning("Verificação da API Key", mensagem, parent=self.root)
+    
+    def _poll_events(self):
+        """Entrega os eventos publicados pelas threads desde a última drenagem."""
+        self.events.drain()
+        self.root.after(EVENT_POLL_MS, self._poll_events)
+    
     def _update_status(self, msg: str, status_type: str = "info"):
         """
         Atualiza o status no rodapé.
         
+        Pode ser chamado de qualquer thread: a mensagem passa pelo barramento
+        de eventos, e várias atualizações entre duas drenagens viram um só
+        redesenho (a última vence).
+        
         Args:
             msg: Mensagem de status.
             status_type: Tipo (info, success, warning, error).
         """
+        self.events.publish(STATUS, (msg, status_type), key=STATUS)
+    
+    def _apply_status(self, payload):
+        """
+        Aplica uma atualização de status (thread do Tk).
+        
+        Args:
+            payload: Tuple com (mensagem, tipo).
+        """
+        msg, status_type = payload
         color_map = {
             "info": self.theme.INFO,
             "success": self.theme.SUCCESS,
@@ -202,7 +322,5 @@ class AnkiLabApp:
             "error": self.theme.ERROR
         }
         
-        self.root.after(0, lambda: (
-            self.status_icon.config(fg=color_map.get(status_type, self.theme.INFO)),
-            self.status_label.config(text=msg)
-        ))
+        self.status_icon.config(fg=color_map.get(status_type, self.theme.INFO))
+        self.status_label.config(text=msg)
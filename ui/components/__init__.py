@@ -7,5 +7,9 @@ Diálogos e widgets reutilizáveis da interface.
 """
 
 from .export_dialog import ExportDialog
+from .export_runner import ExportRunner
+from .jobs_panel import JobsPanel
+from .text_counter import TextCounter
+from .text_renderer import LineClassifier, PagedText, RenderBuffer
 
-__all__ = ["ExportDialog"]
+__all__ = ["ExportDialog", "ExportRunner", "JobsPanel", "LineClassifier", "PagedText", "RenderBuffer", "TextCounter"]
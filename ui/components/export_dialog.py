@@ -6,15 +6,68 @@ Diálogo de Exportação
 Modal para seleção de formato e configuração de exportação.
 """
 
+import os
 import tkinter as tk
+from tkinter import messagebox
+from typing import Dict, Iterable, Optional
+
+from core.partition import DEFAULT_PART_SIZE, PARTITION_RULES
 from ui.theme import NeuroTheme
 
 
+# Opção do menu de divisão que mantém um deck único
+NO_PARTITION = "Deck único"
+
+
+def ask_update_existing(path: str) -> bool:
+    """
+    Pergunta se um .apkg existente deve ser atualizado em vez de recriado.
+    
+    Args:
+        path: Caminho escolhido para salvar.
+    
+    Returns:
+        True para atualizar o pacote (mantendo IDs das notas).
+    """
+    if not os.path.exists(path):
+        return False
+    
+    return messagebox.askyesno(
+        "Atualizar pacote",
+        "O arquivo já existe.\n\n"
+        "Atualizar o pacote mantendo as notas existentes? Apenas cards novos, "
+        "alterados ou removidos serão gravados, e o Anki reconhecerá as edições.\n\n"
+        "Escolha \"Não\" para recriar o pacote do zero."
+    )
+
+
+def format_update_summary(stats: Optional[Dict[str, int]]) -> str:
+    """
+    Formata o resumo de uma atualização incremental de .apkg.
+    
+    Args:
+        stats: Estatísticas retornadas por export_apkg (None = exportação completa).
+    
+    Returns:
+        Texto do resumo (vazio para exportação completa).
+    """
+    if not stats:
+        return ""
+    return (
+        f"\n\nPacote atualizado: {stats['added']} nova(s), "
+        f"{stats['changed']} alterada(s), {stats['removed']} removida(s), "
+        f"{stats['unchanged']} sem alteração"
+    )
+
+
 class ExportDialog(tk.Toplevel):
     """
     Diálogo modal para configuração de exportação de flashcards.
     
-    Permite escolher entre formatos: .apkg, .txt (Anki), .txt (Noji).
+    Permite escolher um ou mais formatos: .apkg, .txt (Anki), .txt (Noji),
+    .csv e .jsonl. Após fechar, `result` contém a lista de formatos
+    escolhidos (ou None se cancelado), e `partition`, `partition_size` e
+    `separate` a divisão do .apkg em subdecks.
     """
     
     def __init__(
@@ -22,7 +75,8 @@ class ExportDialog(tk.Toplevel):
         parent: tk.Tk,
         num_cards: int,
         theme: NeuroTheme,
-        title: str = "Exportar"
+        title: str = "Exportar",
+        partition_rules: Optional[Iterable[str]] = None
     ):
         """
         Inicializa o diálogo de exportação.
@@ -32,16 +86,23 @@ class ExportDialog(tk.Toplevel):
             num_cards: Número de cards a exportar.
             theme: Tema visual.
             title: Título da janela.
+            partition_rules: Regras de divisão oferecidas (padrão: todas;
+                ver core.partition.available_partition_rules).
         """
         super().__init__(parent)
         
         self.theme = theme
+        self.partition_rules = list(PARTITION_RULES if partition_rules is None else partition_rules)
         self.result = None
         self.deck_name = "Flashcards AnkiLab"
+        self.dedup = True
+        self.partition = None
+        self.partition_size = DEFAULT_PART_SIZE
+        self.separate = False
         
         # Configuração da janela
         self.title(title)
-        self.geometry("340x350")
+        self.geometry("340x560")
         self.resizable(False, False)
         self.transient(parent)
         self.grab_set()
@@ -50,7 +111,7 @@ class ExportDialog(tk.Toplevel):
         # Centralização
         self.update_idletasks()
         x = parent.winfo_x() + (parent.winfo_width() // 2) - 170
-        y = parent.winfo_y() + (parent.winfo_height() // 2) - 175
+        y = parent.winfo_y() + (parent.winfo_height() // 2) - 280
         self.geometry(f"+{x}+{y}")
         
         # Construção da interface
@@ -109,26 +170,35 @@ class ExportDialog(tk.Toplevel):
         
         # Label de formato
         tk.Label(
-            content, text="Formato:",
+            content, text="Formatos:",
             font=self.theme.get_ui_font(8),
             bg=self.theme.BG_MAIN, fg=self.theme.TEXT_SECONDARY
         ).pack(anchor="w", pady=(0, 6))
         
-        # Variável de seleção
-        self.formato_var = tk.StringVar(value="anki_apkg")
+        # Variáveis de seleção (vários formatos numa mesma exportação)
+        self.format_vars = {}
         
         # Opções de formato
         options = [
             ("anki_apkg", "📗 Anki (.apkg)", "Pacote nativo"),
             ("anki_txt", "📄 Anki (.txt)", "Texto tabulado"),
             ("noji_txt", "🟣 Noji (.txt)", "Para Noji"),
+            ("csv", "📊 CSV (.csv)", "Planilhas e outros apps"),
+            ("jsonl", "🧾 JSON Lines (.jsonl)", "Um card por linha"),
         ]
         
         for value, label, desc in options:
+            self.format_vars[value] = tk.BooleanVar(value=(value == "anki_apkg"))
             self._build_format_option(content, value, label, desc)
         
         # Campo de nome do deck
         self._build_deck_name_field(content)
+        
+        # Divisão em subdecks
+        self._build_partition_options(content)
+        
+        # Remoção de duplicatas
+        self._build_dedup_option(content)
     
     def _build_format_option(
         self,
@@ -149,12 +219,11 @@ class ExportDialog(tk.Toplevel):
         frame = tk.Frame(parent, bg=self.theme.BG_MAIN)
         frame.pack(fill="x", pady=1)
         
-        tk.Radiobutton(
-            frame, variable=self.formato_var, value=value,
+        tk.Checkbutton(
+            frame, variable=self.format_vars[value],
             bg=self.theme.BG_MAIN, fg=self.theme.TEXT_PRIMARY,
             activebackground=self.theme.BG_MAIN,
-            selectcolor=self.theme.BG_INPUT, highlightthickness=0,
-            command=self._toggle_deck_name
+            selectcolor=self.theme.BG_INPUT, highlightthickness=0
         ).pack(side="left")
         
         label_frame = tk.Frame(frame, bg=self.theme.BG_MAIN)
@@ -178,7 +247,7 @@ class ExportDialog(tk.Toplevel):
         self.deck_frame.pack(fill="x", pady=(10, 0))
         
         tk.Label(
-            self.deck_frame, text="Nome do Deck:",
+            self.deck_frame, text="Nome do Deck (e dos arquivos):",
             font=self.theme.get_ui_font(8),
             bg=self.theme.BG_MAIN, fg=self.theme.TEXT_SECONDARY
         ).pack(anchor="w", pady=(0, 3))
@@ -195,6 +264,75 @@ class ExportDialog(tk.Toplevel):
         self.deck_entry.insert(0, "Flashcards AnkiLab")
         self.deck_entry.pack(fill="x", ipady=3)
     
+    def _build_partition_options(self, parent: tk.Frame):
+        """Constrói as opções de divisão do .apkg em subdecks."""
+        frame = tk.Frame(parent, bg=self.theme.BG_MAIN)
+        frame.pack(fill="x", pady=(10, 0))
+        
+        tk.Label(
+            frame, text="Subdecks (.apkg):",
+            font=self.theme.get_ui_font(8),
+            bg=self.theme.BG_MAIN, fg=self.theme.TEXT_SECONDARY
+        ).pack(anchor="w", pady=(0, 3))
+        
+        row = tk.Frame(frame, bg=self.theme.BG_MAIN)
+        row.pack(fill="x")
+        
+        self.partition_var = tk.StringVar(value=NO_PARTITION)
+        menu = tk.OptionMenu(
+            row, self.partition_var, NO_PARTITION,
+            *(PARTITION_RULES[rule] for rule in self.partition_rules)
+        )
+        menu.config(
+            font=self.theme.get_ui_font(8),
+            bg=self.theme.BG_INPUT, fg=self.theme.TEXT_PRIMARY,
+            activebackground=self.theme.BG_SECONDARY,
+            activeforeground=self.theme.TEXT_PRIMARY,
+            relief="flat", highlightthickness=0
+        )
+        menu.pack(side="left")
+        
+        tk.Label(
+            row, text="Cards por parte:",
+            font=self.theme.get_ui_font(7),
+            bg=self.theme.BG_MAIN, fg=self.theme.TEXT_MUTED
+        ).pack(side="left", padx=(8, 3))
+        
+        self.partition_size_var = tk.StringVar(value=str(DEFAULT_PART_SIZE))
+        tk.Spinbox(
+            row, from_=10, to=100000, increment=100, width=7,
+            textvariable=self.partition_size_var,
+            font=self.theme.get_ui_font(8),
+            bg=self.theme.BG_INPUT, fg=self.theme.TEXT_PRIMARY,
+            insertbackground=self.theme.ACCENT_PRIMARY,
+            relief="flat", highlightthickness=0
+        ).pack(side="left")
+        
+        self.separate_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            frame, variable=self.separate_var,
+            text="Um pacote por subdeck (gravados em paralelo)",
+            font=self.theme.get_ui_font(8),
+            bg=self.theme.BG_MAIN, fg=self.theme.TEXT_PRIMARY,
+            activebackground=self.theme.BG_MAIN,
+            activeforeground=self.theme.TEXT_PRIMARY,
+            selectcolor=self.theme.BG_INPUT, highlightthickness=0
+        ).pack(anchor="w", pady=(4, 0))
+    
+    def _build_dedup_option(self, parent: tk.Frame):
+        """Constrói a opção de remover cards duplicados antes de exportar."""
+        self.dedup_var = tk.BooleanVar(value=True)
+        
+        tk.Checkbutton(
+            parent, variable=self.dedup_var,
+            text="Remover duplicatas e quase duplicatas",
+            font=self.theme.get_ui_font(8),
+            bg=self.theme.BG_MAIN, fg=self.theme.TEXT_PRIMARY,
+            activebackground=self.theme.BG_MAIN,
+            activeforeground=self.theme.TEXT_PRIMARY,
+            selectcolor=self.theme.BG_INPUT, highlightthickness=0
+        ).pack(anchor="w", pady=(8, 0))
+    
     def _build_buttons(self):
         """Constrói os botões de ação."""
         btn_frame = tk.Frame(self, bg=self.theme.BG_MAIN)
@@ -218,17 +356,26 @@ class ExportDialog(tk.Toplevel):
             command=self._exportar
         ).pack(side="right")
     
-    def _toggle_deck_name(self):
-        """Habilita/desabilita o campo de nome do deck conforme o formato."""
-        if self.formato_var.get() == "anki_apkg":
-            self.deck_entry.config(state="normal")
-        else:
-            self.deck_entry.config(state="disabled")
-    
     def _exportar(self):
         """Confirma a exportação e fecha o diálogo."""
+        formats = [key for key, var in self.format_vars.items() if var.get()]
+        if not formats:
+            messagebox.showwarning("Aviso", "Escolha ao menos um formato.", parent=self)
+            return
+        
         self.deck_name = self.deck_entry.get().strip() or "Flashcards AnkiLab"
-        self.result = self.formato_var.get()
+        self.dedup = bool(self.dedup_var.get())
+        
+        rules = {desc: key for key, desc in PARTITION_RULES.items()}
+        self.partition = rules.get(self.partition_var.get())
+        self.separate = self.partition is not None and bool(self.separate_var.get())
+        try:
+            self.partition_size = max(1, int(self.partition_size_var.get()))
+        except ValueError:
+            messagebox.showwarning("Aviso", "Cards por parte deve ser um número.", parent=self)
+            return
+        
+        self.result = formats
         self.destroy()
     
     def _cancelar(self):
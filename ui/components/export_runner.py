@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+"""
+Execução de Exportações
+=======================
+
+Liga o diálogo de exportação ao worker de utils.export_worker: escolhe os
+arquivos de destino, executa a exportação fora da thread do Tk, mostra o
+progresso na barra de status e transforma o botão de exportar em botão de
+cancelamento enquanto a exportação roda.
+"""
+
+import os
+import threading
+import tkinter as tk
+from tkinter import messagebox, filedialog
+from typing import Callable, Dict, List, Optional
+
+from ui.components.export_dialog import ask_update_existing, format_update_summary
+from ui.event_bus import get_event_bus
+from core.partition import DEFAULT_PART_SIZE
+from utils.export import safe_filename
+from utils.export_worker import (
+    EXPORT_FORMATS,
+    ExportCancelled,
+    ExportProgress,
+    ExportTarget,
+    format_export_progress,
+    run_exports,
+)
+
+
+# Arquivos listados na mensagem final (pacotes separados podem ser dezenas)
+MAX_LISTED_FILES = 12
+
+# Sufixo do nome do arquivo quando vários formatos vão para a mesma pasta
+_FILE_SUFFIXES = {
+    "anki_txt": "_anki",
+    "noji_txt": "_noji",
+}
+
+class ExportRunner:
+    """
+    Executa exportações em segundo plano para uma aba.
+
+    Uso:
+        self.export_runner = ExportRunner(self.parent, self.update_status, self.btn_exportar)
+        self.export_runner.start(cards, dialog.result, dialog.deck_name)
+    """
+
+    def __init__(
+        self,
+        widget: tk.Widget,
+        status_callback: Callable[[str, str], None],
+        button: tk.Button
+    ):
+        """
+        Inicializa o executor.
+
+        Args:
+            widget: Widget da aba (usado para agendar callbacks no Tk).
+            status_callback: Função para atualizar status.
+            button: Botão de exportar (vira "Cancelar" durante a exportação).
+        """
+        self.widget = widget
+        self.update_status = status_callback
+        self.button = button
+
+        self._cancel_event: Optional[threading.Event] = None
+        self._button_state: Optional[Dict] = None
+        self.events = get_event_bus()
+
+    @property
+    def running(self) -> bool:
+        """Indica se há uma exportação em andamento."""
+        return self._cancel_event is not None
+
+    # ==========================================================================
+    # DESTINOS
+    # ==========================================================================
+
+    def _ask_targets(
+        self,
+        formats: List[str],
+        deck_name: str,
+        partition: Optional[str] = None,
+        partition_size: int = DEFAULT_PART_SIZE,
+        separate: bool = False
+    ) -> Optional[List[ExportTarget]]:
+        """
+        Pergunta onde salvar cada formato.
+
+        Um formato: diálogo "Salvar como". Vários: uma pasta, com os nomes
+        dos arquivos derivados do nome do deck. A divisão em subdecks vale
+        só para o .apkg (e dispensa a pergunta de atualização, já que o
+        pacote é recriado).
+
+        Returns:
+            Lista de destinos ou None se o usuário cancelar.
+        """
+        base = safe_filename(deck_name)
+
+        if len(formats) == 1:
+            fmt = formats[0]
+            description, ext, _ = EXPORT_FORMATS[fmt]
+            if fmt == "anki_apkg":
+                initial = f"{base}.apkg"
+            elif fmt in _FILE_SUFFIXES:
+                initial = f"flashcards{_FILE_SUFFIXES[fmt]}{ext}"
+            else:
+                initial = f"{base}{ext}"
+
+            path = filedialog.asksaveasfilename(
+                defaultextension=ext,
+                filetypes=[(description, f"*{ext}")],
+                title=f"Salvar {ext}",
+                initialfile=initial
+            )
+            if not path:
+                return None
+            paths = {fmt: path}
+        else:
+            directory = filedialog.askdirectory(title="Pasta para os arquivos exportados")
+            if not directory:
+                return None
+            paths = {
+                fmt: os.path.join(
+                    directory, f"{base}{_FILE_SUFFIXES.get(fmt, '')}{EXPORT_FORMATS[fmt][1]}"
+                )
+                for fmt in formats
+            }
+
+            existing = [
+                os.path.basename(path) for fmt, path in paths.items()
+                if fmt != "anki_apkg" and os.path.exists(path)
+            ]
+            if existing and not messagebox.askyesno(
+                "Sobrescrever arquivos",
+                "Os arquivos abaixo já existem e serão substituídos:\n\n"
+                + "\n".join(f"• {name}" for name in existing)
+            ):
+                return None
+
+        return [
+            ExportTarget(
+                fmt, path, deck_name,
+                update=(fmt == "anki_apkg" and not partition and ask_update_existing(path)),
+                partition=partition if fmt == "anki_apkg" else None,
+                partition_size=partition_size,
+                separate=separate
+            )
+            for fmt, path in paths.items()
+        ]
+
+    # ==========================================================================
+    # EXECUÇÃO
+    # ==========================================================================
+
+    def start(
+        self,
+        cards,
+        formats: List[str],
+        deck_name: str,
+        label: str = "",
+        partition: Optional[str] = None,
+        partition_size: int = DEFAULT_PART_SIZE,
+        separate: bool = False
+    ) -> bool:
+        """
+        Escolhe os destinos e inicia a exportação em segundo plano.
+
+        Args:
+            cards: Cards a exportar.
+            formats: Formatos escolhidos no diálogo.
+            deck_name: Nome do deck.
+            label: Complemento da mensagem final (ex: duplicatas removidas).
+            partition: Regra de divisão do .apkg em subdecks (ou None).
+            partition_size: Cards por parte na regra "size".
+            separate: Um pacote .apkg por subdeck.
+
+        Returns:
+            True se a exportação foi iniciada.
+        """
+        if self.running:
+            return False
+
+        targets = self._ask_targets(formats, deck_name, partition, partition_size, separate)
+        if not targets:
+            return False
+
+        cancel_event = threading.Event()
+        self._cancel_event = cancel_event
+        self._set_cancel_button(True)
+        self.update_status(f"Exportando {len(cards)} cards...", "warning")
+
+        def progress(state: ExportProgress):
+            # O barramento agrupa as atualizações de status entre dois redesenhos
+            self.update_status(format_export_progress(state), "warning")
+
+        def exportar():
+            try:
+                results = run_exports(cards, targets, progress, cancel_event)
+                if len(results) < len(targets):
+                    # Cancelado durante a atualização de um .apkg, que foi concluída
+                    skipped = len(targets) - len(results)
+                    done_label = f"{label} • {skipped} formato(s) seguinte(s) cancelado(s)"
+                else:
+                    done_label = label
+                self.events.call_soon(lambda: self._finalizar(results, done_label))
+            except ExportCancelled:
+                self.events.call_soon(self._cancelado)
+            except Exception as e:
+                self.events.call_soon(lambda m=str(e): self._erro(m))
+
+        threading.Thread(target=exportar, daemon=True).start()
+        return True
+
+    def cancel(self):
+        """Solicita o cancelamento da exportação em andamento."""
+        if self._cancel_event is not None:
+            self._cancel_event.set()
+            self.button.config(state="disabled")
+            self.update_status("Cancelando exportação...", "warning")
+
+    def _set_cancel_button(self, exporting: bool):
+        """Alterna o botão entre exportar e cancelar."""
+        if exporting:
+            self._button_state = {
+                "text": self.button.cget("text"),
+                "command": self.button.cget("command"),
+            }
+            self.button.config(text="  ✖ Cancelar Exportação  ", command=self.cancel)
+        elif self._button_state is not None:
+            self.button.config(state="normal", **self._button_state)
+            self._button_state = None
+
+    def _encerrar(self):
+        """Restaura o estado após o fim da exportação."""
+        self._cancel_event = None
+        self._set_cancel_button(False)
+
+    def _finalizar(self, results: List[Dict], label: str):
+        """Mostra o resumo das exportações concluídas."""
+        self._encerrar()
+
+        count = results[0]["count"] if results else 0
+        paths = [path for r in results for path in r["paths"]]
+        files = "\n".join(f"• {os.path.basename(path)}" for path in paths[:MAX_LISTED_FILES])
+        if len(paths) > MAX_LISTED_FILES:
+            files += f"\n• ... e mais {len(paths) - MAX_LISTED_FILES} arquivo(s)"
+        summary = "".join(format_update_summary(r["stats"]) for r in results)
+        hint = "\n\nNo Anki: Arquivo → Importar" if any(
+            r["target"].fmt == "anki_apkg" for r in results
+        ) else ""
+
+        self.update_status(f"Exportado: {count} cards{label}", "success")
+        messagebox.showinfo(
+            "Sucesso",
+            f"✓ {count} cards exportados!{label}\n\n{files}{summary}{hint}"
+        )
+
+    def _cancelado(self):
+        """Informa o cancelamento."""
+        self._encerrar()
+        self.update_status("Exportação cancelada", "info")
+
+    def _erro(self, mensagem: str):
+        """Informa um erro na exportação."""
+        self._encerrar()
+        self.update_status("Erro na exportação", "error")
+        messagebox.showerror("Erro", mensagem)
@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+"""
+Painel de Tarefas
+=================
+
+Lista as tarefas da fila compartilhada (na fila, em execução, concluídas)
+com os tempos de espera e de execução. A lista é relida a cada
+JOBS_REFRESH_MS, o que também atualiza os cronômetros das tarefas em
+execução sem depender de eventos vindos das threads do pool.
+"""
+
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable, Dict, Optional, Tuple
+
+from core.jobs import CANCELLED, DONE, FAILED, JOB_STATES, QUEUED, RUNNING, Job, JobQueue
+
+
+# Intervalo entre atualizações da lista (ms)
+JOBS_REFRESH_MS = 500
+
+# Caracteres do texto/assunto usados na descrição de uma tarefa
+JOB_LABEL_CHARS = 40
+
+# Colunas: chave → (título, largura)
+_COLUMNS = {
+    "id": ("#", 40),
+    "label": ("Tarefa", 320),
+    "state": ("Estado", 100),
+    "wait": ("Espera", 80),
+    "run": ("Duração", 80),
+}
+
+
+def format_seconds(seconds: Optional[float]) -> str:
+    """
+    Formata uma duração para o painel.
+
+    Args:
+        seconds: Duração em segundos (None = ainda não começou).
+
+    Returns:
+        Texto como "4.2s" ou "3m05s" ("—" para None).
+    """
+    if seconds is None:
+        return "—"
+    if seconds < 60:
+        return f"{seconds:.1f}s"
+    return f"{int(seconds // 60)}m{int(seconds % 60):02d}s"
+
+
+class JobsPanel:
+    """
+    Painel com as tarefas da fila.
+
+    Uso:
+        panel = JobsPanel(frame, theme, get_job_queue(), open_callback=self._open_job)
+        # open_callback(job) é chamado no duplo clique ou em "Abrir resultado"
+    """
+
+    def __init__(
+        self,
+        parent: tk.Frame,
+        theme,
+        queue: JobQueue,
+        open_callback: Optional[Callable[[Job], None]] = None,
+        count_callback: Optional[Callable[[int], None]] = None
+    ):
+        """
+        Monta o painel e inicia as atualizações.
+
+        Args:
+            parent: Frame pai (container da aba).
+            theme: Classe de tema (NeuroTheme).
+            queue: Fila de tarefas exibida.
+            open_callback: Abre o resultado de uma tarefa concluída.
+            count_callback: Recebe o número de tarefas ativas quando muda.
+        """
+        self.parent = parent
+        self.theme = theme
+        self.queue = queue
+        self.open_callback = open_callback
+        self.count_callback = count_callback
+
+        self.summary_var = tk.StringVar(value="")
+        self._rows: Dict[str, Tuple] = {}
+        self._active = -1
+
+        self._build_ui()
+        self._refresh()
+
+    # ==========================================================================
+    # CONSTRUÇÃO DA INTERFACE
+    # ==========================================================================
+
+    def _build_ui(self):
+        """Constrói a barra de ações e a lista."""
+        container = tk.Frame(self.parent, bg=self.theme.BG_MAIN)
+        container.pack(fill="both", expand=True, padx=10, pady=10)
+
+        bar = tk.Frame(container, bg=self.theme.BG_MAIN)
+        bar.pack(fill="x", pady=(0, 6))
+
+        tk.Label(
+            bar, textvariable=self.summary_var,
+            font=self.theme.get_ui_font(8),
+            bg=self.theme.BG_MAIN, fg=self.theme.TEXT_SECONDARY
+        ).pack(side="left")
+
+        for text, command in (
+            ("  🧹 Limpar concluídas  ", self._clear_finished),
+            ("  ✖ Cancelar  ", self._cancel_selected),
+            ("  📂 Abrir resultado  ", self._open_selected),
+        ):
+            tk.Button(
+                bar, text=text, command=command,
+                font=self.theme.get_ui_font(8),
+                bg=self.theme.BG_TERTIARY, fg=self.theme.TEXT_PRIMARY,
+                activebackground=self.theme.BG_HOVER,
+                relief="flat", cursor="hand2", padx=6, pady=3
+            ).pack(side="right", padx=(5, 0))
+
+        style = ttk.Style()
+        style.configure(
+            "Jobs.Treeview",
+            background=self.theme.BG_INPUT,
+            fieldbackground=self.theme.BG_INPUT,
+            foreground=self.theme.TEXT_PRIMARY,
+            font=self.theme.get_mono_font(8),
+            rowheight=22,
+            borderwidth=0
+        )
+        style.configure(
+            "Jobs.Treeview.Heading",
+            background=self.theme.BG_TERTIARY,
+            foreground=self.theme.TEXT_PRIMARY,
+            font=self.theme.get_ui_font(8, "bold")
+        )
+        style.map("Jobs.Treeview", background=[("selected", self.theme.BG_HOVER)])
+
+        tree_frame = tk.Frame(container, bg=self.theme.BORDER, padx=1, pady=1)
+        tree_frame.pack(fill="both", expand=True)
+
+        self.tree = ttk.Treeview(
+            tree_frame, columns=tuple(_COLUMNS), show="headings",
+            style="Jobs.Treeview", selectmode="browse"
+        )
+        for key, (title, width) in _COLUMNS.items():
+            self.tree.heading(key, text=title)
+            self.tree.column(key, width=width, stretch=(key == "label"), anchor="w")
+
+        for state, color in (
+            (QUEUED, self.theme.TEXT_SECONDARY),
+            (RUNNING, self.theme.WARNING),
+            (DONE, self.theme.SUCCESS),
+            (FAILED, self.theme.ERROR),
+            (CANCELLED, self.theme.TEXT_MUTED),
+        ):
+            self.tree.tag_configure(state, foreground=color)
+
+        scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side="right", fill="y")
+        self.tree.pack(fill="both", expand=True, side="left")
+
+        self.tree.bind("<Double-1>", lambda e: self._open_selected())
+
+    # ==========================================================================
+    # ATUALIZAÇÃO
+    # ==========================================================================
+
+    def _refresh(self):
+        """Sincroniza a lista com a fila (só as linhas que mudaram)."""
+        jobs = self.queue.jobs()
+        seen = set()
+
+        for job in jobs:
+            iid = str(job.id)
+            seen.add(iid)
+            error = f" — {job.error}" if job.error is not None else ""
+            values = (
+                job.id, job.label, JOB_STATES[job.state] + error,
+                format_seconds(job.wait_time), format_seconds(job.run_time)
+            )
+            if self._rows.get(iid) == values:
+                continue
+            if iid in self._rows:
+                self.tree.item(iid, values=values, tags=(job.state,))
+            else:
+                # Mais novas no topo
+                self.tree.insert("", 0, iid=iid, values=values, tags=(job.state,))
+            self._rows[iid] = values
+
+        for iid in [iid for iid in self._rows if iid not in seen]:
+            self.tree.delete(iid)
+            del self._rows[iid]
+
+        running = sum(1 for job in jobs if job.state == RUNNING)
+        queued = sum(1 for job in jobs if job.state == QUEUED)
+        self.summary_var.set(
+            f"{running} em execução • {queued} na fila "
+            f"(até {self.queue.max_workers} simultâneas)"
+        )
+        if self.count_callback is not None and running + queued != self._active:
+            self._active = running + queued
+            self.count_callback(self._active)
+
+        self.parent.after(JOBS_REFRESH_MS, self._refresh)
+
+    # ==========================================================================
+    # AÇÕES
+    # ==========================================================================
+
+    def _selected_job(self) -> Optional[Job]:
+        """Tarefa selecionada na lista (None se nenhuma)."""
+        selection = self.tree.selection()
+        if not selection:
+            return None
+        job_id = int(selection[0])
+        return next((job for job in self.queue.jobs() if job.id == job_id), None)
+
+    def _open_selected(self):
+        """Abre o resultado da tarefa selecionada."""
+        job = self._selected_job()
+        if job is not None and job.state == DONE and self.open_callback is not None:
+            self.open_callback(job)
+
+    def _cancel_selected(self):
+        """Cancela a tarefa selecionada, se ainda estiver na fila."""
+        job = self._selected_job()
+        if job is not None:
+            self.queue.cancel(job.id)
+
+    def _clear_finished(self):
+        """Remove as tarefas terminadas da lista."""
+        self.queue.clear_finished()
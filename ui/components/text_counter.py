@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+Contador de Caracteres e Tokens
+===============================
+
+Mantém os contadores de um `tk.Text` sem trabalho por tecla: o evento
+<<Modified>> só agenda uma atualização (debounce), que conta os caracteres
+no próprio Tk e entrega o texto a uma thread para a contagem de tokens.
+"""
+
+import threading
+import tkinter as tk
+from typing import Callable, Optional
+
+from config import get_model_params
+from core.encoding import count_tokens
+from ui.event_bus import get_event_bus
+
+
+# Espera após a última alteração antes de recontar
+DEBOUNCE_MS = 300
+
+
+class TextCounter:
+    """
+    Conta caracteres e tokens de um widget de texto em segundo plano.
+
+    Uso:
+        counter = TextCounter(text_widget, self._show_counts)
+        # _show_counts(chars, tokens, exact) roda na thread da interface;
+        # tokens é None enquanto a contagem ainda não terminou
+    """
+
+    def __init__(
+        self,
+        widget: tk.Text,
+        on_update: Callable[[int, Optional[int], bool], None],
+        delay_ms: int = DEBOUNCE_MS
+    ):
+        """
+        Liga o contador ao widget.
+
+        Args:
+            widget: Widget de texto observado.
+            on_update: Recebe (caracteres, tokens, exato).
+            delay_ms: Espera após a última alteração.
+        """
+        self.widget = widget
+        self.on_update = on_update
+        self.delay_ms = delay_ms
+
+        self._pending: Optional[str] = None
+        # Geração da última alteração; resultados de gerações antigas são descartados
+        self._generation = 0
+        self._counting = False
+        self._dirty = False
+
+        widget.edit_modified(False)
+        widget.bind("<<Modified>>", self._on_modified, add="+")
+
+    def _on_modified(self, event=None) -> None:
+        """Rearma o evento <<Modified>> e reinicia a espera."""
+        if not self.widget.edit_modified():
+            return
+        self.widget.edit_modified(False)
+        self.schedule()
+
+    def schedule(self, delay_ms: Optional[int] = None) -> None:
+        """
+        Agenda uma recontagem (substitui a anterior ainda não executada).
+
+        Args:
+            delay_ms: Espera em ms (padrão: a do contador).
+        """
+        self._generation += 1
+        if self._pending is not None:
+            self.widget.after_cancel(self._pending)
+        self._pending = self.widget.after(
+            self.delay_ms if delay_ms is None else delay_ms, self._refresh
+        )
+
+    def _refresh(self) -> None:
+        """Conta os caracteres e dispara a contagem de tokens."""
+        self._pending = None
+
+        # Contagem feita pelo Tk, sem copiar o texto para o Python
+        counted = self.widget.count("1.0", "end-1c", "chars")
+        chars = counted[0] if counted else 0
+        self.on_update(chars, None, False)
+
+        if self._counting:
+            # Uma contagem por vez; a mais recente roda quando esta terminar
+            self._dirty = True
+            return
+
+        self._start_count(chars)
+
+    def _start_count(self, chars: int) -> None:
+        """Conta os tokens do texto atual numa thread."""
+        self._counting = True
+        self._dirty = False
+        generation = self._generation
+        text = self.widget.get("1.0", "end-1c")
+
+        def worker():
+            try:
+                tokens, exact = count_tokens(text, get_model_params("generation").model)
+            except Exception as e:
+                print(f"[TextCounter] Erro: {e}")
+                tokens, exact = chars // 4, False
+            get_event_bus().call_soon(
+                lambda: self._finish_count(generation, chars, tokens, exact)
+            )
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _finish_count(self, generation: int, chars: int, tokens: int, exact: bool) -> None:
+        """Publica a contagem (se ainda for atual) ou recomeça com o texto novo."""
+        self._counting = False
+
+        if self._dirty:
+            counted = self.widget.count("1.0", "end-1c", "chars")
+            self._start_count(counted[0] if counted else 0)
+            return
+
+        if generation == self._generation:
+            self.on_update(chars, tokens, exact)
@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+"""
+Renderização em Lote de Texto
+=============================
+
+Monta o conteúdo de um `tk.Text` como uma única string com os intervalos de
+tag já calculados (RenderBuffer) e aplica tudo de uma vez: um `insert` e um
+`tag_add` por tag, em vez de um `insert` por linha.
+
+LineClassifier escolhe a tag de cada linha de um texto livre (ex: resposta
+da IA) com uma única expressão pré-compilada.
+
+PagedText exibe listas longas (ex: milhares de cards) em páginas: só a
+primeira página é renderizada de início, e as seguintes entram conforme o
+usuário rola até perto do fim. O tempo para exibir não depende do tamanho
+da lista.
+"""
+
+import re
+import tkinter as tk
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+
+# Itens renderizados por página
+PAGE_SIZE = 50
+
+# Fração rolada (fim da área visível) a partir da qual a próxima página entra
+PREFETCH_AT = 0.85
+
+
+class LineClassifier:
+    """
+    Atribui tags a linhas pela primeira regra que casa.
+
+    As regras viram uma só alternância compilada, testada no início da
+    linha (espaços iniciais ignorados); a ordem das regras define a
+    prioridade. Para procurar um termo em qualquer posição, use ".*termo".
+
+    Uso:
+        classifier = LineClassifier([(r"Q:", "pergunta"), (r".*ALTA", "error")])
+        classifier.tag_for("  Q: O que é?")   # "pergunta"
+    """
+
+    __slots__ = ("_pattern", "_tags", "default")
+
+    def __init__(self, rules: Sequence[Tuple[str, str]], default: Optional[str] = None):
+        """
+        Compila as regras.
+
+        Args:
+            rules: Pares (expressão, tag), em ordem de prioridade.
+            default: Tag das linhas que não casam com nenhuma regra.
+        """
+        self._tags: Dict[str, str] = {}
+        groups = []
+        for i, (pattern, tag) in enumerate(rules):
+            self._tags[f"r{i}"] = tag
+            groups.append(f"(?P<r{i}>{pattern})")
+        self._pattern = re.compile(r"\s*(?:" + "|".join(groups) + ")")
+        self.default = default
+
+    def tag_for(self, line: str) -> Optional[str]:
+        """
+        Retorna a tag de uma linha.
+
+        Args:
+            line: Linha sem o "\\n" final.
+
+        Returns:
+            Tag da primeira regra que casa, ou a tag padrão.
+        """
+        match = self._pattern.match(line)
+        if match is None:
+            return self.default
+        return self._tags[match.lastgroup]
+
+
+class RenderBuffer:
+    """
+    Texto e intervalos de tag de uma renderização, montados fora do widget.
+
+    Não usa o Tk, então pode ser preenchido em qualquer thread; só `apply`
+    precisa rodar na thread da interface.
+
+    Uso:
+        buffer = RenderBuffer()
+        buffer.write("Título\\n", "header")
+        buffer.write("corpo\\n")
+        buffer.apply(text_widget, replace=True)
+    """
+
+    __slots__ = ("_parts", "_ranges", "_line", "_col")
+
+    def __init__(self):
+        self._parts: List[str] = []
+        self._ranges: Dict[str, List[Tuple[int, int, int, int]]] = {}
+        # Posição atual (linha relativa a partir de 1, coluna a partir de 0)
+        self._line = 1
+        self._col = 0
+
+    @property
+    def text(self) -> str:
+        """Texto completo da renderização."""
+        return "".join(self._parts)
+
+    def write(self, text: str, tag: Optional[str] = None) -> None:
+        """
+        Acrescenta um trecho, opcionalmente com uma tag.
+
+        Args:
+            text: Trecho de texto.
+            tag: Tag aplicada ao trecho inteiro.
+        """
+        if not text:
+            return
+
+        start_line, start_col = self._line, self._col
+        self._parts.append(text)
+
+        newlines = text.count("\n")
+        if newlines:
+            self._line += newlines
+            self._col = len(text) - text.rfind("\n") - 1
+        else:
+            self._col += len(text)
+
+        if tag:
+            self._ranges.setdefault(tag, []).append(
+                (start_line, start_col, self._line, self._col)
+            )
+
+    def write_lines(self, text: str, classifier: LineClassifier) -> None:
+        """
+        Acrescenta um texto linha a linha, com a tag de cada linha.
+
+        Linhas consecutivas com a mesma tag viram um único trecho (e um
+        único intervalo de tag). Cada linha termina com "\\n".
+
+        Args:
+            text: Texto com várias linhas.
+            classifier: Classificador que escolhe a tag de cada linha.
+        """
+        if not text:
+            return
+
+        run: List[str] = []
+        run_tag = None
+        for line in text.split("\n"):
+            tag = classifier.tag_for(line)
+            if run and tag != run_tag:
+                self.write("".join(run), run_tag)
+                run = []
+            run_tag = tag
+            run.append(line + "\n")
+        self.write("".join(run), run_tag)
+
+    def apply(self, widget: tk.Text, replace: bool = False) -> None:
+        """
+        Insere o conteúdo no fim do widget com todas as tags.
+
+        Args:
+            widget: Widget de texto (o estado "disabled" é preservado).
+            replace: Apaga o conteúdo atual antes de inserir.
+        """
+        state = widget.cget("state")
+        widget.config(state="normal")
+
+        if replace:
+            widget.delete("1.0", tk.END)
+
+        base_line, base_col = map(int, widget.index("end-1c").split("."))
+        widget.insert(tk.END, self.text)
+
+        def index(line: int, col: int) -> str:
+            # Só a primeira linha do trecho herda a coluna do ponto de inserção
+            if line == 1:
+                col += base_col
+            return f"{base_line + line - 1}.{col}"
+
+        for tag, ranges in self._ranges.items():
+            indices = []
+            for start_line, start_col, end_line, end_col in ranges:
+                indices.append(index(start_line, start_col))
+                indices.append(index(end_line, end_col))
+            widget.tag_add(tag, *indices)
+
+        widget.config(state=state)
+
+
+class PagedText:
+    """
+    Exibe uma lista longa num widget de texto, página por página.
+
+    Uso:
+        pages = PagedText(text_widget, scrollbar, self._render_cards)
+        pages.show(len(cards))              # primeira página
+        pages.show_message("Erro", "error") # substitui a lista
+    """
+
+    def __init__(
+        self,
+        widget: tk.Text,
+        scrollbar: tk.Scrollbar,
+        render_page: Callable[[RenderBuffer, int, int], None],
+        page_size: int = PAGE_SIZE
+    ):
+        """
+        Liga o widget à paginação.
+
+        Args:
+            widget: Widget de texto (passa a usar `_on_scroll` como
+                yscrollcommand).
+            scrollbar: Barra de rolagem do widget.
+            render_page: Função que escreve os itens [início, fim) no buffer.
+            page_size: Itens por página.
+        """
+        self.widget = widget
+        self.scrollbar = scrollbar
+        self.render_page = render_page
+        self.page_size = page_size
+
+        self.total = 0
+        self.rendered = 0
+        self._pending: Optional[str] = None
+
+        widget.config(yscrollcommand=self._on_scroll)
+
+    def show(self, total: int) -> None:
+        """
+        Substitui o conteúdo pela primeira página de uma nova lista.
+
+        Args:
+            total: Número de itens da lista.
+        """
+        self._cancel_pending()
+        self.total = total
+        self.rendered = 0
+        self._render_next(replace=True)
+
+    def show_message(self, text: str, tag: Optional[str] = None) -> None:
+        """
+        Substitui o conteúdo por uma mensagem (encerra a paginação).
+
+        Args:
+            text: Mensagem.
+            tag: Tag de formatação.
+        """
+        self._cancel_pending()
+        self.total = self.rendered = 0
+
+        buffer = RenderBuffer()
+        buffer.write(text, tag)
+        buffer.apply(self.widget, replace=True)
+
+    def _cancel_pending(self) -> None:
+        if self._pending is not None:
+            self.widget.after_cancel(self._pending)
+            self._pending = None
+
+    def _render_next(self, replace: bool = False) -> None:
+        """Renderiza a próxima página."""
+        self._pending = None
+        end = min(self.rendered + self.page_size, self.total)
+
+        buffer = RenderBuffer()
+        self.render_page(buffer, self.rendered, end)
+        buffer.apply(self.widget, replace=replace)
+        self.rendered = end
+
+    def _on_scroll(self, first: str, last: str) -> None:
+        """Atualiza a barra e agenda a próxima página perto do fim."""
+        self.scrollbar.set(first, last)
+        if (
+            self._pending is None
+            and self.rendered < self.total
+            and float(last) >= PREFETCH_AT
+        ):
+            self._pending = self.widget.after_idle(self._render_next)
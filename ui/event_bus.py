@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+Barramento de Eventos da Interface
+==================================
+
+Ponto único por onde as threads de trabalho falam com a interface. As
+threads só publicam eventos numa fila (seguro em qualquer thread); o
+AnkiLabApp drena a fila a cada EVENT_POLL_MS na thread do Tk e entrega os
+eventos aos assinantes.
+
+Eventos publicados com uma chave (ex: status, progresso) são agrupados:
+de uma drenagem para a outra só o último de cada chave é entregue. Assim,
+milhares de eventos de progresso por segundo viram no máximo
+1000 / EVENT_POLL_MS redesenhos.
+"""
+
+import threading
+from queue import Empty, SimpleQueue
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+
+# Intervalo entre drenagens da fila (ms): limita os redesenhos por segundo
+EVENT_POLL_MS = 100
+
+# Tópicos
+STATUS = "status"   # payload: (mensagem, tipo)
+CALL = "call"       # payload: função sem argumentos executada na thread do Tk
+
+
+class EventBus:
+    """
+    Fila de eventos das threads de trabalho para a interface.
+
+    Uso:
+        bus = get_event_bus()
+        bus.subscribe(STATUS, lambda payload: ...)
+        bus.publish(STATUS, ("Gerando...", "warning"), key=STATUS)  # qualquer thread
+        bus.call_soon(lambda: self._finalizar(result))              # qualquer thread
+        bus.drain()                                                 # thread do Tk
+    """
+
+    def __init__(self):
+        self._queue: "SimpleQueue[tuple]" = SimpleQueue()
+        self._subscribers: Dict[str, List[Callable[[Any], None]]] = {}
+
+    def subscribe(self, topic: str, callback: Callable[[Any], None]) -> None:
+        """
+        Registra um assinante (chamado na thread do Tk).
+
+        Args:
+            topic: Tópico do evento.
+            callback: Recebe o payload.
+        """
+        self._subscribers.setdefault(topic, []).append(callback)
+
+    def publish(self, topic: str, payload: Any = None, key: Optional[Hashable] = None) -> None:
+        """
+        Publica um evento (pode ser chamado de qualquer thread).
+
+        Args:
+            topic: Tópico do evento.
+            payload: Dados entregues aos assinantes.
+            key: Eventos do mesmo tópico com a mesma chave são agrupados
+                (só o último de cada drenagem é entregue). None = todos
+                são entregues, na ordem.
+        """
+        self._queue.put((topic, key, payload))
+
+    def call_soon(self, fn: Callable[[], None]) -> None:
+        """
+        Agenda uma função para a thread do Tk (substitui `after(0, fn)`
+        chamado de outra thread).
+
+        Args:
+            fn: Função sem argumentos.
+        """
+        self.publish(CALL, fn)
+
+    def drain(self) -> int:
+        """
+        Entrega os eventos pendentes (na thread do Tk).
+
+        Returns:
+            Número de eventos entregues, após o agrupamento.
+        """
+        events = []
+        while True:
+            try:
+                events.append(self._queue.get_nowait())
+            except Empty:
+                break
+
+        if not events:
+            return 0
+
+        # Posição do último evento de cada chave
+        last: Dict[tuple, int] = {}
+        for i, (topic, key, _) in enumerate(events):
+            if key is not None:
+                last[(topic, key)] = i
+
+        delivered = 0
+        for i, (topic, key, payload) in enumerate(events):
+            if key is not None and last[(topic, key)] != i:
+                continue
+            delivered += 1
+            try:
+                if topic == CALL:
+                    payload()
+                else:
+                    for callback in self._subscribers.get(topic, ()):
+                        callback(payload)
+            except Exception as e:
+                print(f"[EventBus] Erro em '{topic}': {e}")
+
+        return delivered
+
+
+# ==============================================================================
+# BARRAMENTO PADRÃO (Singleton)
+# ==============================================================================
+
+_event_bus: Optional[EventBus] = None
+_event_bus_lock = threading.Lock()
+
+
+def get_event_bus() -> EventBus:
+    """
+    Retorna o barramento de eventos compartilhado (criado uma única vez).
+
+    Returns:
+        Instância compartilhada de EventBus.
+    """
+    global _event_bus
+    with _event_bus_lock:
+        if _event_bus is None:
+            _event_bus = EventBus()
+        return _event_bus
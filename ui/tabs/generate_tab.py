@@ -6,15 +6,22 @@ Aba de Geração de Flashcards
 Interface e lógica para criação de novos flashcards a partir de texto.
 """
 
-import threading
 import tkinter as tk
-from tkinter import messagebox, filedialog
-from typing import Callable, List, Dict
+from tkinter import messagebox
+from typing import Callable, Dict, Iterable, List, Mapping, Optional
 
 from ui.theme import NeuroTheme
 from ui.components.export_dialog import ExportDialog
+from ui.components.export_runner import ExportRunner
+from ui.components.jobs_panel import JOB_LABEL_CHARS
+from ui.components.text_counter import TextCounter
+from ui.components.text_renderer import PagedText, RenderBuffer
+from ui.event_bus import get_event_bus
 from core.api import generate_cards, refine_cards
-from utils.export import export_apkg, export_txt
+from core.jobs import CANCELLED, DONE, Job, get_job_queue
+from core.cards import CardStore
+from core.dedup import dedup_cards
+from core.partition import available_partition_rules
 from core.parser import format_cards_for_export_tab
 
 
@@ -44,7 +51,12 @@ class GenerateTab:
         self.update_status = status_callback
         
         # Dados
-        self.cards_data: List[Dict[str, str]] = []
+        self.cards_data = CardStore()
+        
+        # Fila compartilhada; o preview acompanha a última geração enviada
+        self.jobs = get_job_queue()
+        self.events = get_event_bus()
+        self._latest_job_id = 0
         
         # Variáveis de controle
         self.qtd_var = tk.StringVar(value="AUTO")
@@ -69,7 +81,8 @@ class GenerateTab:
         self._build_options_panel()
         self._build_actions_bar()
         
-        self._update_char_counter()
+        # Contadores atualizados em segundo plano a cada pausa na digitação
+        self.input_counter = TextCounter(self.text_input, self._update_char_counter)
     
     def _build_left_panel(self, parent: tk.Frame):
         """Constrói o painel esquerdo (entrada de texto)."""
@@ -106,7 +119,6 @@ class GenerateTab:
             relief="flat", padx=8, pady=6, highlightthickness=0
         )
         self.text_input.pack(fill="both", expand=True)
-        self.text_input.bind("<KeyRelease>", self._update_char_counter)
         self.text_input.bind(
             "<FocusIn>",
             lambda e: text_border.config(bg=self.theme.BORDER_FOCUS)
@@ -252,6 +264,9 @@ class GenerateTab:
         self.preview.pack(fill="both", expand=True, side="left")
         scrollbar.config(command=self.preview.yview)
         
+        # Renderização paginada (só as páginas visíveis entram no widget)
+        self.preview_pages = PagedText(self.preview, scrollbar, self._render_preview_page)
+        
         # Configuração de tags de formatação
         self._configure_preview_tags()
         self._show_preview_placeholder()
@@ -443,6 +458,7 @@ class GenerateTab:
             command=self.exportar_cards
         )
         self.btn_exportar.pack(side="left", padx=(0, 5))
+        self.export_runner = ExportRunner(self.parent, self.update_status, self.btn_exportar)
         
         self.btn_copiar = self._create_button(
             actions_content,
@@ -543,12 +559,20 @@ class GenerateTab:
     # MÉTODOS DE ATUALIZAÇÃO DA INTERFACE
     # ==========================================================================
     
-    def _update_char_counter(self, event=None):
-        """Atualiza os contadores de caracteres e tokens."""
-        texto = self.text_input.get("1.0", tk.END).strip()
-        chars = len(texto)
+    def _update_char_counter(self, chars: int, tokens: Optional[int], exact: bool):
+        """
+        Atualiza os contadores de caracteres e tokens.
+        
+        Args:
+            chars: Número de caracteres da entrada.
+            tokens: Número de tokens (None enquanto a contagem não termina).
+            exact: Se a contagem veio do tokenizador do modelo.
+        """
         self.char_counter_label.config(text=f"{chars:,} chars")
-        self.token_counter_label.config(text=f"~{chars // 4:,} tokens")
+        if tokens is not None:
+            self.token_counter_label.config(
+                text=f"{tokens:,} tokens" if exact else f"~{tokens:,} tokens"
+            )
     
     def _update_mode_display(self):
         """Atualiza o indicador de modo (Normal/Hard)."""
@@ -559,8 +583,6 @@ class GenerateTab:
     
     def _show_preview_placeholder(self):
         """Exibe o placeholder inicial no preview."""
-        self.preview.config(state="normal")
-        self.preview.delete("1.0", tk.END)
         placeholder = """
 
    ╭──────────────────────────────╮
@@ -573,67 +595,61 @@ class GenerateTab:
    │                              │
    ╰──────────────────────────────╯
 """
-        self.preview.insert("1.0", placeholder, "processing")
-        self.preview.config(state="disabled")
+        self.preview_pages.show_message(placeholder, "processing")
     
-    def _insert_preview_formatted(self, cards: List[Dict[str, str]]):
+    def _insert_preview_formatted(self, cards: Iterable[Mapping[str, str]]):
         """
-        Insere os cards formatados no preview.
+        Exibe os cards formatados no preview.
+        
+        Só a primeira página é renderizada agora; as demais entram ao rolar
+        (ver `_render_preview_page`).
         
         Args:
             cards: Lista de cards para exibir.
         """
-        self.preview.config(state="normal")
-        self.preview.delete("1.0", tk.END)
-        
         if not cards:
-            self.preview.insert("1.0", "Nenhum card gerado.", "error")
-            self.preview.config(state="disabled")
+            self.preview_pages.show_message("Nenhum card gerado.", "error")
             return
         
         self.cards_count_var.set(str(len(cards)))
-        self.cards_data = cards
-        
-        for i, c in enumerate(cards):
-            self.preview.insert(tk.END, f"┌─ Card {i + 1}\n", "card_num")
-            self.preview.insert(tk.END, f"│ Q: {c['q']}\n", "pergunta")
-            
-            a_lines = c['a'].split('\n')
-            for j, line in enumerate(a_lines):
-                prefix = "│ A: " if j == 0 else "│    "
-                self.preview.insert(tk.END, f"{prefix}{line}\n", "resposta")
-            
-            separator = "└─────────────────────────────\n"
-            if i < len(cards) - 1:
-                separator += "\n"
-            self.preview.insert(tk.END, separator, "separator")
-        
-        self.preview.config(state="disabled")
+        self.cards_data = cards if isinstance(cards, CardStore) else CardStore.from_dicts(cards)
+        self.preview_pages.show(len(self.cards_data))
     
-    def _set_busy(self, is_busy: bool, msg: str = ""):
+    def _render_preview_page(self, buffer: RenderBuffer, start: int, end: int):
         """
-        Define o estado ocupado da interface.
+        Escreve os cards [start, end) do preview no buffer.
         
         Args:
-            is_busy: Se True, desabilita botões.
-            msg: Mensagem de status.
+            buffer: Buffer da página.
+            start: Índice do primeiro card.
+            end: Índice após o último card.
         """
-        state = "disabled" if is_busy else "normal"
+        last = len(self.cards_data) - 1
         
-        self.btn_gerar.config(state=state)
-        self.btn_exportar.config(state=state)
-        self.btn_copiar.config(state=state)
-        self.btn_limpar.config(state=state)
-        
-        if is_busy:
-            self.update_status(msg if msg else "Processando...", "warning")
+        for i, c in enumerate(self.cards_data[start:end], start):
+            buffer.write(f"┌─ Card {i + 1}\n", "card_num")
+            buffer.write(f"│ Q: {c['q']}\n", "pergunta")
+            
+            # Uma única escrita por resposta: as linhas seguintes levam o recuo
+            answer = c['a'].replace('\n', '\n│    ')
+            buffer.write(f"│ A: {answer}\n", "resposta")
+            
+            separator = "└─────────────────────────────\n"
+            if i < last:
+                separator += "\n"
+            buffer.write(separator, "separator")
     
     # ==========================================================================
     # AÇÕES PRINCIPAIS
     # ==========================================================================
     
     def gerar_cards(self):
-        """Inicia o processo de geração de flashcards."""
+        """
+        Enfileira a geração de flashcards para o texto atual.
+        
+        Cada clique cria uma tarefa na fila compartilhada; o usuário pode
+        colar outro texto e enfileirar mais gerações enquanto esta roda.
+        """
         texto = self.text_input.get("1.0", tk.END).strip()
         if not texto:
             messagebox.showerror("Erro", "Insira um texto para análise.")
@@ -641,60 +657,83 @@ class GenerateTab:
         
         hard = bool(self.hard_var.get())
         do_refine = bool(self.refine_var.get())
-        
-        self._set_busy(True, "Gerando flashcards...")
+        qtd = self.qtd_var.get().strip()
+        
+        def tarefa() -> List[Dict[str, str]]:
+            cards = generate_cards(texto, qtd, hard)
+            if do_refine and len(cards) >= 1:
+                cards = refine_cards(texto, cards, hard)
+            return cards
+        
+        resumo = " ".join(texto.split())[:JOB_LABEL_CHARS]
+        job = self.jobs.submit(
+            "generation",
+            f"Gerar {'HARD ' if hard else ''}{qtd}: {resumo}",
+            tarefa,
+            on_finish=lambda j: self.events.call_soon(
+                lambda: self._finalizar_geracao(j, hard, do_refine)
+            )
+        )
+        self._latest_job_id = job.id
         
         # Mostra indicador de processamento
-        self.preview.config(state="normal")
-        self.preview.delete("1.0", tk.END)
-        msg = "\n\n    ⏳ Processando...\n"
+        msg = f"\n\n    ⏳ Processando (tarefa #{job.id})...\n"
         if do_refine:
             msg += "    (Refinamento ativado)\n"
-        self.preview.insert(tk.END, msg, "processing")
-        self.preview.config(state="disabled")
+        self.preview_pages.show_message(msg, "processing")
         
         self.cards_count_var.set("...")
-        
-        def chamar_api():
-            try:
-                qtd = self.qtd_var.get().strip()
-                
-                self.update_status("Gerando (1ª passada)...", "warning")
-                cards = generate_cards(texto, qtd, hard)
-                
-                if do_refine and len(cards) >= 1:
-                    self.update_status("Refinando (2ª passada)...", "warning")
-                    cards = refine_cards(texto, cards, hard)
-                
-                self.parent.after(
-                    0,
-                    lambda: self._finalizar_geracao(cards, hard, do_refine)
-                )
-                
-            except Exception as e:
-                self.parent.after(0, lambda m=str(e): self._erro_geracao(m))
-        
-        threading.Thread(target=chamar_api, daemon=True).start()
+        self.update_status(f"Tarefa #{job.id} enviada para a fila", "warning")
     
-    def _finalizar_geracao(
-        self,
-        cards: List[Dict[str, str]],
-        hard: bool,
-        refined: bool
-    ):
+    def _finalizar_geracao(self, job: Job, hard: bool, refined: bool):
         """
-        Finaliza o processo de geração.
+        Finaliza uma tarefa de geração.
+        
+        Só a última geração enviada ocupa o preview; as anteriores ficam
+        disponíveis no painel de tarefas.
         
         Args:
-            cards: Cards gerados.
+            job: Tarefa concluída, com erro ou cancelada.
             hard: Se modo hard estava ativo.
             refined: Se refinamento foi aplicado.
         """
-        self._insert_preview_formatted(cards)
+        latest = job.id == self._latest_job_id
+        
+        if job.state == CANCELLED:
+            if latest:
+                self._show_preview_placeholder()
+                self.cards_count_var.set(str(len(self.cards_data)))
+            self.update_status(f"Tarefa #{job.id} cancelada", "info")
+            return
+        
+        if job.state != DONE:
+            if latest:
+                self._erro_geracao(str(job.error))
+            else:
+                self.update_status(f"Tarefa #{job.id}: erro na geração", "error")
+            return
+        
         mode_txt = "HARD" if hard else "NORMAL"
         ref_txt = " + refinado" if refined else ""
-        self._set_busy(False)
-        self.update_status(f"✓ {len(cards)} card(s) • {mode_txt}{ref_txt}", "success")
+        if latest:
+            self._insert_preview_formatted(job.result)
+            self.update_status(f"✓ {len(job.result)} card(s) • {mode_txt}{ref_txt}", "success")
+        else:
+            self.update_status(
+                f"✓ Tarefa #{job.id}: {len(job.result)} card(s) • abra no painel de tarefas",
+                "success"
+            )
+    
+    def show_job_result(self, job: Job):
+        """
+        Exibe no preview os cards de uma tarefa de geração concluída.
+        
+        Args:
+            job: Tarefa de geração no estado DONE.
+        """
+        self._latest_job_id = job.id
+        self._insert_preview_formatted(job.result)
+        self.update_status(f"Tarefa #{job.id}: {len(job.result)} card(s)", "info")
     
     def _erro_geracao(self, mensagem: str):
         """
@@ -703,12 +742,8 @@ class GenerateTab:
         Args:
             mensagem: Mensagem de erro.
         """
-        self.preview.config(state="normal")
-        self.preview.delete("1.0", tk.END)
-        self.preview.insert(tk.END, f"\n  ❌ Erro:\n\n  {mensagem}", "error")
-        self.preview.config(state="disabled")
+        self.preview_pages.show_message(f"\n  ❌ Erro:\n\n  {mensagem}", "error")
         self.cards_count_var.set("0")
-        self._set_busy(False)
         self.update_status("Erro na geração", "error")
         messagebox.showerror("Erro", mensagem)
     
@@ -721,48 +756,27 @@ class GenerateTab:
         dialog = ExportDialog(
             self.parent.winfo_toplevel(),
             len(self.cards_data),
-            self.theme
+            self.theme,
+            partition_rules=available_partition_rules(self.cards_data)
         )
         self.parent.winfo_toplevel().wait_window(dialog)
         
         if not dialog.result:
             return
         
-        if dialog.result == "anki_apkg":
-            path = filedialog.asksaveasfilename(
-                defaultextension=".apkg",
-                filetypes=[("Pacote Anki", "*.apkg")],
-                title="Salvar .apkg",
-                initialfile=f"{dialog.deck_name}.apkg"
-            )
-            if path:
-                try:
-                    export_apkg(path, dialog.deck_name, self.cards_data)
-                    self.update_status(f"Exportado: {len(self.cards_data)} cards", "success")
-                    messagebox.showinfo(
-                        "Sucesso",
-                        f"✓ {len(self.cards_data)} cards exportados!\n\nNo Anki: Arquivo → Importar"
-                    )
-                except Exception as e:
-                    messagebox.showerror("Erro", str(e))
-        else:
-            target = "anki" if dialog.result == "anki_txt" else "noji"
-            filename = f"flashcards_{target}.txt"
-            path = filedialog.asksaveasfilename(
-                defaultextension=".txt",
-                filetypes=[("Texto", "*.txt")],
-                initialfile=filename
-            )
-            if path:
-                try:
-                    export_txt(path, self.cards_data)
-                    self.update_status(f"Exportado: {len(self.cards_data)} cards", "success")
-                    messagebox.showinfo(
-                        "Sucesso",
-                        f"✓ {len(self.cards_data)} cards exportados!"
-                    )
-                except Exception as e:
-                    messagebox.showerror("Erro", str(e))
+        cards_to_export = self.cards_data
+        dup_txt = ""
+        
+        if dialog.dedup:
+            cards_to_export, duplicates = dedup_cards(self.cards_data)
+            if duplicates:
+                dup_txt = f" ({len(duplicates)} duplicata(s) removida(s))"
+        
+        self.export_runner.start(
+            cards_to_export, dialog.result, dialog.deck_name, dup_txt,
+            partition=dialog.partition, partition_size=dialog.partition_size,
+            separate=dialog.separate
+        )
     
     def copiar_clipboard(self):
         """Copia os cards para a área de transferência."""
@@ -782,9 +796,8 @@ class GenerateTab:
         self.qtd_var.set("AUTO")
         self.hard_var.set(False)
         self.refine_var.set(False)
-        self.cards_data = []
+        self.cards_data = CardStore()
         self.cards_count_var.set("0")
         self._show_preview_placeholder()
-        self._update_char_counter()
         self._update_mode_display()
         self.update_status("Campos limpos", "info")
@@ -9,24 +9,85 @@ Interface e lógica para auditoria e revisão de decks existentes.
 import threading
 import tkinter as tk
 from tkinter import messagebox, filedialog
-from typing import Callable, List, Dict
+from typing import Callable, Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple
 import os
 
-from config import MODEL_ADVANCED
+from config import get_model_params
 from ui.theme import NeuroTheme
 from ui.components.export_dialog import ExportDialog
+from ui.components.export_runner import ExportRunner
+from ui.components.jobs_panel import JOB_LABEL_CHARS
+from ui.components.text_renderer import LineClassifier, RenderBuffer
+from ui.event_bus import get_event_bus
 from core.api import review_deck
+from core.jobs import CANCELLED, DONE, Job, get_job_queue
+from core.cards import CardStore
+from core.dedup import dedup_cards
+from core.partition import available_partition_rules
+from core.importer import import_files
+from core.review_cache import IncrementalPlan, ReviewCache, plan_incremental_review
 from core.parser import (
+    LoadCancelled,
     parse_apkg_cards,
     parse_flashcard_file,
     parse_csv_cards,
-    format_cards_for_prompt,
     format_cards_for_export_tab,
     extract_new_cards_from_audit,
     extract_cards_from_review,
     extract_report_from_review,
 )
-from utils.export import export_apkg, export_txt
+from core.encoding import (
+    AUDIT_ONLY_ENCODINGS,
+    DECK_ENCODINGS,
+    EncodedDeck,
+    check_encoding_mode,
+    encode_deck,
+    encoding_savings,
+    resolve_card_refs,
+)
+from core.sections import (
+    ReviewSections,
+    split_review_sections,
+    SECTION_PROBLEMS,
+    SECTION_REPORT,
+)
+
+
+# Tags das linhas da resposta de auditoria (primeira regra que casa)
+AUDIT_LINES = LineClassifier([
+    (r"===", "header"),
+    (r"Q:", "pergunta"),
+    (r"A:", "resposta"),
+    (r".*ALTA", "error"),
+    (r".*MÉDIA", "warning"),
+    (r".*BAIXA", "info"),
+    (r"[•-]", "info"),
+    (r"[1-9]\d?\.", "info"),
+])
+
+# Tags das linhas do relatório da revisão final
+REPORT_LINES = LineClassifier([
+    (r".*REMOVIDOS", "error"),
+    (r".*MODIFICADOS", "warning"),
+    (r".*DIVIDIDOS", "info"),
+    (r".*ADICIONADOS", "success"),
+    (r".*ESTATÍSTICAS|===", "subheader"),
+    (r"[•-]", "muted"),
+])
+
+
+class ReviewResult(NamedTuple):
+    """
+    Resultado de uma revisão, preparado fora da thread da interface.
+    
+    `cards` é o que a aba exibe (na revisão final incremental, já somado aos
+    cards em cache); `extracted` são só os cards extraídos da resposta, que
+    é o que `IncrementalPlan.commit` espera.
+    """
+    cards: CardStore
+    card_refs: Dict[int, List[str]]
+    rendered: RenderBuffer
+    extracted: List[Dict[str, str]]
 
 
 class ReviewTab:
@@ -55,12 +116,26 @@ class ReviewTab:
         self.update_status = status_callback
         
         # Dados
-        self.loaded_csv_cards: List[Dict[str, str]] = []
-        self.review_cards_data: List[Dict[str, str]] = []
+        self.loaded_csv_cards = CardStore()
+        self.review_cards_data = CardStore()
+        self.review_card_refs: Dict[int, List[str]] = {}
+        self._review_cache: Optional[ReviewCache] = None
+        self._review_cache_lock = threading.Lock()
+        self._load_cancel: Optional[threading.Event] = None
+        self._previous_preview = ""
+        
+        # Fila compartilhada; o resultado acompanha a última revisão enviada
+        self.jobs = get_job_queue()
+        self.events = get_event_bus()
+        self._latest_job_id = 0
         
         # Variáveis de controle
         self.assunto_var = tk.StringVar(value="")
         self.review_mode_var = tk.StringVar(value="audit")
+        self.encoding_var = tk.StringVar(value=DECK_ENCODINGS["full"])
+        self.encoding_info_var = tk.StringVar(value="")
+        self.incremental_var = tk.BooleanVar(value=True)
+        self.dedup_var = tk.BooleanVar(value=True)
         self.loaded_count_var = tk.StringVar(value="0 cards carregados")
         self.review_count_var = tk.StringVar(value="0")
         
@@ -108,6 +183,9 @@ class ReviewTab:
         # Modo de revisão
         self._build_review_mode_selector(content_frame)
         
+        # Formato do deck no prompt
+        self._build_encoding_selector(content_frame)
+        
         # Separador
         tk.Frame(content_frame, bg=self.theme.BORDER, height=1).pack(fill="x", pady=15)
         
@@ -169,6 +247,16 @@ class ReviewTab:
         )
         self.btn_load_csv.pack(side="left")
         
+        self.btn_load_dir = tk.Button(
+            load_frame, text="  📂 Pasta  ",
+            font=self.theme.get_ui_font(8),
+            bg=self.theme.BG_TERTIARY, fg=self.theme.TEXT_PRIMARY,
+            activebackground=self.theme.BG_HOVER,
+            relief="flat", cursor="hand2", padx=6, pady=4,
+            command=self._load_directory
+        )
+        self.btn_load_dir.pack(side="left", padx=(5, 0))
+        
         self.loaded_label = tk.Label(
             load_frame, textvariable=self.loaded_count_var,
             font=self.theme.get_mono_font(7),
@@ -177,8 +265,8 @@ class ReviewTab:
         self.loaded_label.pack(side="left", padx=(10, 0))
 
     def _load_file(self):
-        """Carrega um arquivo de flashcards (CSV, TXT ou APKG)."""
-        path = filedialog.askopenfilename(
+        """Carrega um ou mais arquivos de flashcards (CSV, TXT ou APKG)."""
+        paths = filedialog.askopenfilenames(
             filetypes=[
                 ("Todos Suportados", "*.apkg *.csv *.txt *.tsv"),
                 ("Pacote Anki", "*.apkg"),
@@ -186,65 +274,287 @@ class ReviewTab:
                 ("Texto", "*.txt *.tsv"),
                 ("Todos", "*.*")
             ],
-            title="Carregar arquivo de flashcards"
+            title="Carregar arquivo(s) de flashcards"
         )
-        if not path:
+        if not paths:
             return
         
-        try:
-            # Usa a função unificada que detecta o formato
-            cards = parse_flashcard_file(path)
-            
-            if not cards:
-                ext = os.path.splitext(path)[1].lower()
-                if ext == '.apkg':
-                    msg = (
-                        "Não foi possível extrair cards do arquivo .apkg.\n\n"
-                        "Possíveis causas:\n"
-                        "• O deck pode estar vazio\n"
-                        "• Formato de nota incompatível (precisa ter 2+ campos)\n"
-                        "• Arquivo corrompido"
-                    )
-                else:
-                    msg = (
-                        "Não foi possível extrair cards do arquivo.\n"
-                        "Verifique o formato (2 colunas: pergunta, resposta)."
-                    )
-                messagebox.showerror("Erro", msg)
-                return
-            
-            self.loaded_csv_cards = cards
-            
-            # Detecta o tipo de arquivo para exibir
-            ext = os.path.splitext(path)[1].lower()
-            file_type = "APKG" if ext == ".apkg" else "CSV/TXT"
-            self.loaded_count_var.set(f"{len(cards)} cards ({file_type})")
-            
-            # Atualiza preview
-            self.loaded_preview.config(state="normal")
-            self.loaded_preview.delete("1.0", tk.END)
-            
-            preview_text = f"Fonte: {os.path.basename(path)}\n"
-            preview_text += f"Total: {len(cards)} cards\n\n"
-            
-            for i, c in enumerate(cards[:5]):
-                q_short = c['q'][:60] + "..." if len(c['q']) > 60 else c['q']
-                # Remove quebras de linha para preview compacto
-                q_short = q_short.replace('\n', ' ')
-                preview_text += f"{i+1}. {q_short}\n"
-            
-            if len(cards) > 5:
-                preview_text += f"\n... e mais {len(cards) - 5} cards"
-            
-            self.loaded_preview.insert("1.0", preview_text)
-            self.loaded_preview.config(state="disabled")
-            
-            self.update_status(f"Arquivo carregado: {len(cards)} cards", "success")
+        # Vários arquivos: importação em lote
+        if len(paths) > 1:
+            self._load_bulk(list(paths))
+            return
+        
+        self._load_single(paths[0])
+    
+    def _load_single(self, path: str):
+        """
+        Carrega um arquivo numa thread, com progresso e cancelamento.
+        
+        O botão "Carregar Arquivo" vira "Cancelar" durante a leitura, e os
+        primeiros cards aparecem no preview assim que o primeiro lote é lido.
+        
+        Args:
+            path: Caminho do arquivo.
+        """
+        name = os.path.basename(path)
+        cancel_event = threading.Event()
+        self._load_cancel = cancel_event
+        # O primeiro lote substitui o preview; sem sucesso, o anterior volta
+        self._previous_preview = self.loaded_preview.get("1.0", "end-1c")
+        self._set_busy(True, f"Carregando {name}...")
+        self.btn_load_csv.config(
+            state="normal", text="  ✖ Cancelar  ", command=self._cancel_load
+        )
+        
+        first_batch = [True]
+        
+        def progress(batch: List[Dict[str, str]], done: int, total: int):
+            if first_batch[0] and batch:
+                first_batch[0] = False
+                preview = self._format_file_preview(
+                    name, batch, f"Carregando: {done:,}/{total:,} notas"
+                )
+                self.events.call_soon(lambda: self._set_loaded_preview(preview))
             
-        except FileNotFoundError:
-            messagebox.showerror("Erro", "Arquivo não encontrado.")
-        except Exception as e:
-            messagebox.showerror("Erro", f"Erro ao carregar arquivo:\n{str(e)}")
+            # O barramento agrupa as atualizações de status entre dois redesenhos
+            self.update_status(f"Carregando {name}: {done:,}/{total:,} notas", "warning")
+        
+        def carregar():
+            try:
+                # Usa a função unificada que detecta o formato
+                cards = parse_flashcard_file(path, progress, cancel_event)
+                self.events.call_soon(lambda: self._finalizar_carregamento(path, cards))
+            except LoadCancelled:
+                self.events.call_soon(self._carregamento_cancelado)
+            except FileNotFoundError:
+                self.events.call_soon(lambda: self._erro_carregamento("Arquivo não encontrado."))
+            except Exception as e:
+                self.events.call_soon(
+                    lambda m=str(e): self._erro_carregamento(f"Erro ao carregar arquivo:\n{m}")
+                )
+        
+        threading.Thread(target=carregar, daemon=True).start()
+    
+    def _cancel_load(self):
+        """Solicita o cancelamento do carregamento em andamento."""
+        if self._load_cancel is not None:
+            self._load_cancel.set()
+            self.btn_load_csv.config(state="disabled")
+            self.update_status("Cancelando carregamento...", "warning")
+    
+    def _encerrar_carregamento(self):
+        """Restaura o botão e a interface após o carregamento."""
+        self._load_cancel = None
+        self.btn_load_csv.config(text="  📁 Carregar Arquivo  ", command=self._load_file)
+        self._set_busy(False)
+    
+    def _format_file_preview(
+        self,
+        name: str,
+        cards: List[Dict[str, str]],
+        total_line: str,
+        limit: int = 5
+    ) -> str:
+        """
+        Monta o texto do preview de um arquivo carregado.
+        
+        Args:
+            name: Nome do arquivo.
+            cards: Cards (só os primeiros `limit` são listados).
+            total_line: Linha com o total (ou o progresso da leitura).
+            limit: Número de cards listados.
+        
+        Returns:
+            Texto do preview.
+        """
+        preview_text = f"Fonte: {name}\n{total_line}\n\n"
+        
+        for i, c in enumerate(cards[:limit]):
+            q_short = c['q'][:60] + "..." if len(c['q']) > 60 else c['q']
+            # Remove quebras de linha para preview compacto
+            q_short = q_short.replace('\n', ' ')
+            preview_text += f"{i+1}. {q_short}\n"
+        
+        return preview_text
+    
+    def _set_loaded_preview(self, text: str):
+        """Substitui o texto do preview do arquivo carregado."""
+        self.loaded_preview.config(state="normal")
+        self.loaded_preview.delete("1.0", tk.END)
+        self.loaded_preview.insert("1.0", text)
+        self.loaded_preview.config(state="disabled")
+    
+    def _finalizar_carregamento(self, path: str, cards: List[Dict[str, str]]):
+        """
+        Finaliza o carregamento de um arquivo.
+        
+        Args:
+            path: Caminho do arquivo.
+            cards: Cards lidos.
+        """
+        self._encerrar_carregamento()
+        ext = os.path.splitext(path)[1].lower()
+        
+        if not cards:
+            if ext == '.apkg':
+                msg = (
+                    "Não foi possível extrair cards do arquivo .apkg.\n\n"
+                    "Possíveis causas:\n"
+                    "• O deck pode estar vazio\n"
+                    "• Formato de nota incompatível (precisa ter 2+ campos)\n"
+                    "• Arquivo corrompido"
+                )
+            else:
+                msg = (
+                    "Não foi possível extrair cards do arquivo.\n"
+                    "Verifique o formato (2 colunas: pergunta, resposta)."
+                )
+            self._restore_loaded_preview()
+            self.update_status("Nenhum card carregado", "error")
+            messagebox.showerror("Erro", msg)
+            return
+        
+        self.loaded_csv_cards = CardStore.from_dicts(cards)
+        
+        # Detecta o tipo de arquivo para exibir
+        file_type = "APKG" if ext == ".apkg" else "CSV/TXT"
+        self.loaded_count_var.set(f"{len(cards)} cards ({file_type})")
+        
+        # Atualiza preview
+        preview_text = self._format_file_preview(
+            os.path.basename(path), cards, f"Total: {len(cards)} cards"
+        )
+        if len(cards) > 5:
+            preview_text += f"\n... e mais {len(cards) - 5} cards"
+        self._set_loaded_preview(preview_text)
+        
+        self._update_encoding_info()
+        self.update_status(f"Arquivo carregado: {len(cards)} cards", "success")
+    
+    def _restore_loaded_preview(self):
+        """Volta o preview do deck carregado antes (após cancelamento ou erro)."""
+        self._set_loaded_preview(self._previous_preview)
+    
+    def _carregamento_cancelado(self):
+        """Informa o cancelamento do carregamento."""
+        self._encerrar_carregamento()
+        self._restore_loaded_preview()
+        self.update_status("Carregamento cancelado", "info")
+    
+    def _erro_carregamento(self, mensagem: str):
+        """
+        Trata erro durante o carregamento de um arquivo.
+        
+        Args:
+            mensagem: Mensagem de erro.
+        """
+        self._encerrar_carregamento()
+        self._restore_loaded_preview()
+        self.update_status("Erro ao carregar arquivo", "error")
+        messagebox.showerror("Erro", mensagem)
+
+    def _load_directory(self):
+        """Carrega todos os arquivos suportados de uma pasta (recursivo)."""
+        directory = filedialog.askdirectory(title="Carregar pasta de flashcards")
+        if not directory:
+            return
+        
+        self._load_bulk([directory])
+    
+    def _load_bulk(self, inputs: List[str]):
+        """
+        Importa vários arquivos em paralelo e combina em um único deck.
+        
+        Args:
+            inputs: Arquivos ou diretórios a importar.
+        """
+        self._set_busy(True, "Importando arquivos...")
+        
+        def importar():
+            try:
+                def progress(result, done, total):
+                    name = os.path.basename(result["path"])
+                    self.update_status(f"Importando {done}/{total}: {name}", "warning")
+                
+                cards, stats = import_files(inputs, progress_callback=progress)
+                
+                self.events.call_soon(lambda: self._finalizar_importacao(cards, stats))
+                
+            except Exception as e:
+                self.events.call_soon(lambda m=str(e): self._erro_importacao(m))
+        
+        threading.Thread(target=importar, daemon=True).start()
+    
+    def _finalizar_importacao(self, cards: CardStore, stats: Dict):
+        """
+        Finaliza a importação em lote.
+        
+        Args:
+            cards: Cards combinados de todos os arquivos.
+            stats: Estatísticas da importação.
+        """
+        self._set_busy(False)
+        
+        if not cards:
+            self.update_status("Nenhum card importado", "error")
+            messagebox.showerror(
+                "Erro",
+                "Não foi possível extrair cards dos arquivos selecionados.\n\n"
+                + self._format_import_errors(stats)
+            )
+            return
+        
+        self.loaded_csv_cards = cards
+        self.loaded_count_var.set(f"{len(cards)} cards ({stats['files_ok']} arquivos)")
+        
+        # Atualiza preview
+        self.loaded_preview.config(state="normal")
+        self.loaded_preview.delete("1.0", tk.END)
+        
+        preview_text = f"Fontes: {stats['files_ok']} de {stats['files']} arquivos\n"
+        preview_text += f"Total: {len(cards)} cards\n\n"
+        
+        for info in stats["per_file"]:
+            name = os.path.basename(info["path"])
+            status = f"{info['count']} cards" if not info["error"] else "erro"
+            preview_text += f"• {name}: {status}\n"
+        
+        self.loaded_preview.insert("1.0", preview_text)
+        self.loaded_preview.config(state="disabled")
+        
+        self._update_encoding_info()
+        self.update_status(
+            f"Importados: {len(cards)} cards de {stats['files_ok']} arquivos",
+            "success" if not stats["errors"] else "warning"
+        )
+        
+        if stats["errors"]:
+            messagebox.showwarning(
+                "Importação parcial",
+                f"{stats['files_failed']} arquivo(s) com erro:\n\n"
+                + self._format_import_errors(stats)
+            )
+    
+    def _format_import_errors(self, stats: Dict, limit: int = 10) -> str:
+        """Formata a lista de erros por arquivo para exibição."""
+        lines = [
+            f"• {os.path.basename(path)}: {error}"
+            for path, error in stats["errors"][:limit]
+        ]
+        if len(stats["errors"]) > limit:
+            lines.append(f"... e mais {len(stats['errors']) - limit}")
+        return "\n".join(lines)
+    
+    def _erro_importacao(self, mensagem: str):
+        """
+        Trata erro durante a importação em lote.
+        
+        Args:
+            mensagem: Mensagem de erro.
+        """
+        self._set_busy(False)
+        self.update_status("Erro na importação", "error")
+        messagebox.showerror("Erro", f"Erro ao importar arquivos:\n{mensagem}")
 
     def _build_review_mode_selector(self, parent: tk.Frame):
         """Constrói o seletor de modo de revisão."""
@@ -274,6 +584,99 @@ class ReviewTab:
             description="Melhora, remove, modifica e adiciona cards"
         )
     
+    def _build_encoding_selector(self, parent: tk.Frame):
+        """Constrói o seletor de codificação do deck enviado à IA."""
+        frame = tk.Frame(parent, bg=self.theme.BG_SECONDARY)
+        frame.pack(fill="x", pady=(8, 0))
+        
+        tk.Label(
+            frame, text="Formato do deck:",
+            font=self.theme.get_ui_font(8, "bold"),
+            bg=self.theme.BG_SECONDARY, fg=self.theme.TEXT_PRIMARY
+        ).pack(side="left", padx=(0, 6))
+        
+        menu = self._encoding_menu = tk.OptionMenu(
+            frame, self.encoding_var, *DECK_ENCODINGS.values(),
+            command=lambda _: self._update_encoding_info()
+        )
+        menu.config(
+            font=self.theme.get_ui_font(8),
+            bg=self.theme.BG_INPUT, fg=self.theme.TEXT_PRIMARY,
+            activebackground=self.theme.BG_HOVER,
+            relief="flat", highlightthickness=0
+        )
+        menu.pack(side="left")
+        
+        tk.Label(
+            parent, textvariable=self.encoding_info_var,
+            font=self.theme.get_mono_font(7),
+            bg=self.theme.BG_SECONDARY, fg=self.theme.TEXT_MUTED, anchor="w"
+        ).pack(fill="x", pady=(2, 0))
+        
+        tk.Checkbutton(
+            parent, variable=self.incremental_var,
+            text="Revisão incremental (só cards novos ou alterados)",
+            font=self.theme.get_ui_font(8),
+            bg=self.theme.BG_SECONDARY, fg=self.theme.TEXT_PRIMARY,
+            activebackground=self.theme.BG_SECONDARY,
+            activeforeground=self.theme.TEXT_PRIMARY,
+            selectcolor=self.theme.BG_INPUT, highlightthickness=0
+        ).pack(anchor="w", pady=(6, 0))
+        
+        tk.Checkbutton(
+            parent, variable=self.dedup_var,
+            text="Ignorar duplicatas e quase duplicatas (listadas no resultado)",
+            font=self.theme.get_ui_font(8),
+            bg=self.theme.BG_SECONDARY, fg=self.theme.TEXT_PRIMARY,
+            activebackground=self.theme.BG_SECONDARY,
+            activeforeground=self.theme.TEXT_PRIMARY,
+            selectcolor=self.theme.BG_INPUT, highlightthickness=0
+        ).pack(anchor="w", pady=(2, 0))
+        
+        self.review_mode_var.trace_add("write", lambda *_: self._sync_encoding_options())
+        self._sync_encoding_options()
+    
+    def _sync_encoding_options(self):
+        """Desabilita as codificações sem respostas fora do modo auditoria."""
+        final = self.review_mode_var.get() != "audit"
+        menu = self._encoding_menu["menu"]
+        for index, key in enumerate(DECK_ENCODINGS):
+            state = "disabled" if final and key in AUDIT_ONLY_ENCODINGS else "normal"
+            menu.entryconfig(index, state=state)
+        
+        if final and self._selected_encoding() in AUDIT_ONLY_ENCODINGS:
+            self.encoding_var.set(DECK_ENCODINGS["full"])
+            self._update_encoding_info()
+    
+    def _get_review_cache(self) -> ReviewCache:
+        """Abre o cache de revisões na primeira utilização (Tk ou fila de tarefas)."""
+        with self._review_cache_lock:
+            if self._review_cache is None:
+                self._review_cache = ReviewCache()
+            return self._review_cache
+    
+    def _selected_encoding(self) -> str:
+        """Retorna a chave da codificação selecionada."""
+        label = self.encoding_var.get()
+        for key, value in DECK_ENCODINGS.items():
+            if value == label:
+                return key
+        return "full"
+    
+    def _update_encoding_info(self):
+        """Mostra a estimativa de tokens e a economia do formato escolhido."""
+        if not self.loaded_csv_cards:
+            self.encoding_info_var.set("")
+            return
+        
+        encoding = self._selected_encoding()
+        info = encoding_savings(self.loaded_csv_cards, ["full", encoding])[encoding]
+        
+        text = f"~{info['tokens']:,} tokens"
+        if encoding != "full":
+            text += f" • economia ~{info['saved_tokens']:,} ({info['saved_pct']:.0f}%)"
+        self.encoding_info_var.set(text)
+    
     def _build_radio_option(
         self,
         parent: tk.Frame,
@@ -461,6 +864,7 @@ class ReviewTab:
             command=self._exportar_review
         )
         self.btn_export_review.pack(side="left", padx=(0, 5))
+        self.export_runner = ExportRunner(self.parent, self.update_status, self.btn_export_review)
         
         self.btn_copy_review = self._create_button(
             actions_content,
@@ -477,11 +881,12 @@ class ReviewTab:
         self.btn_clear_review.pack(side="left")
         
         # Indicador de modelo
-        tk.Label(
-            actions_content, text=f"Usando: {MODEL_ADVANCED}",
+        self.model_label = tk.Label(
+            actions_content, text=f"Usando: {get_model_params('review').model}",
             font=self.theme.get_mono_font(6),
             bg=self.theme.BG_TERTIARY, fg=self.theme.TEXT_MUTED
-        ).pack(side="right")
+        )
+        self.model_label.pack(side="right")
     
     def _create_button(
         self,
@@ -543,10 +948,20 @@ class ReviewTab:
     # MÉTODOS DE ATUALIZAÇÃO DA INTERFACE
     # ==========================================================================
     
+    def _show_result_message(self, text: str, tag: str):
+        """
+        Substitui o resultado por uma mensagem.
+        
+        Args:
+            text: Mensagem.
+            tag: Tag de formatação.
+        """
+        buffer = RenderBuffer()
+        buffer.write(text, tag)
+        buffer.apply(self.review_result, replace=True)
+    
     def _show_review_placeholder(self):
         """Exibe o placeholder inicial no resultado."""
-        self.review_result.config(state="normal")
-        self.review_result.delete("1.0", tk.END)
         placeholder = """
 
    ╭──────────────────────────────────╮
@@ -560,18 +975,20 @@ class ReviewTab:
    │                                  │
    ╰──────────────────────────────────╯
 """
-        self.review_result.insert("1.0", placeholder, "processing")
-        self.review_result.config(state="disabled")
+        self._show_result_message(placeholder, "processing")
     
     def _set_busy(self, is_busy: bool, msg: str = ""):
         """Define o estado ocupado da interface."""
         state = "disabled" if is_busy else "normal"
         
         self.btn_revisar.config(state=state)
-        self.btn_export_review.config(state=state)
+        if not self.export_runner.running:
+            # Durante a exportação o botão serve para cancelá-la
+            self.btn_export_review.config(state=state)
         self.btn_copy_review.config(state=state)
         self.btn_clear_review.config(state=state)
         self.btn_load_csv.config(state=state)
+        self.btn_load_dir.config(state=state)
         
         if is_busy:
             self.update_status(msg if msg else "Processando...", "warning")
@@ -600,7 +1017,7 @@ class ReviewTab:
                 )
                 return
             
-            self.loaded_csv_cards = cards
+            self.loaded_csv_cards = CardStore.from_dicts(cards)
             self.loaded_count_var.set(f"{len(cards)} cards carregados")
             
             # Atualiza preview
@@ -618,13 +1035,20 @@ class ReviewTab:
             self.loaded_preview.insert("1.0", preview_text)
             self.loaded_preview.config(state="disabled")
             
+            self._update_encoding_info()
             self.update_status(f"CSV carregado: {len(cards)} cards", "success")
             
         except Exception as e:
             messagebox.showerror("Erro", f"Erro ao carregar arquivo:\n{str(e)}")
     
     def _executar_revisao(self):
-        """Inicia o processo de revisão do deck."""
+        """
+        Enfileira a revisão do deck carregado.
+        
+        Cada clique cria uma tarefa na fila compartilhada com o deck e as
+        opções atuais; outros decks podem ser carregados e enfileirados
+        enquanto esta roda.
+        """
         assunto = self.assunto_var.get().strip()
         if not assunto or assunto.startswith("Ex:"):
             messagebox.showerror("Erro", "Informe o tema/assunto do deck.")
@@ -635,162 +1059,300 @@ class ReviewTab:
             return
         
         mode = self.review_mode_var.get()
-        
-        self._set_busy(True, "Executando revisão...")
+        encoding = self._selected_encoding()
+        try:
+            check_encoding_mode(encoding, mode)
+        except ValueError as e:
+            messagebox.showerror("Erro", str(e))
+            return
+        incremental = self.incremental_var.get()
+        dedup = self.dedup_var.get()
+        deck = self.loaded_csv_cards
+        
+        def tarefa():
+            # Duplicatas não precisam ser pagas na revisão
+            cards, duplicates = dedup_cards(deck) if dedup else (deck, [])
+            dup_txt = f" • {len(duplicates)} duplicata(s) ignorada(s)" if duplicates else ""
+            
+            plan = None
+            if incremental:
+                # Cards já revisados sem alteração vão apenas como resumo
+                plan = plan_incremental_review(
+                    self._get_review_cache(), assunto, mode, cards
+                )
+                if not plan.changed:
+                    return mode, None, plan, duplicates
+                encoded = plan.build_prompt_deck(encoding)
+                cards = plan.changed
+                if plan.cached:
+                    dup_txt += f" • {len(plan.cached)} card(s) sem alteração"
+            else:
+                encoded = encode_deck(cards, encoding)
+            
+            self.update_status(
+                f"Processando com {get_model_params('review').model} "
+                f"(~{encoded.tokens:,} tokens)...{dup_txt}",
+                "warning"
+            )
+            
+            response = review_deck(assunto, encoded.text, mode)
+            result = self._montar_resultado(response, mode, encoded, cards, plan, duplicates)
+            return mode, result, plan, duplicates
+        
+        mode_txt = "Auditoria" if mode == "audit" else "Revisão final"
+        job = self.jobs.submit(
+            "review",
+            f"{mode_txt}: {assunto[:JOB_LABEL_CHARS]} ({len(deck)} cards)",
+            tarefa,
+            on_finish=lambda j: self.events.call_soon(lambda: self._concluir_tarefa(j))
+        )
+        self._latest_job_id = job.id
         
         # Mostra indicador de processamento
-        self.review_result.config(state="normal")
-        self.review_result.delete("1.0", tk.END)
-        
         if mode == "audit":
-            msg = "\n\n    ⏳ Executando Auditoria de Cobertura...\n\n"
+            msg = f"\n\n    ⏳ Executando Auditoria de Cobertura (tarefa #{job.id})...\n\n"
             msg += "    Analisando lacunas e sugerindo novos cards...\n"
         else:
-            msg = "\n\n    ⏳ Executando Revisão Final Completa...\n\n"
+            msg = f"\n\n    ⏳ Executando Revisão Final Completa (tarefa #{job.id})...\n\n"
             msg += "    Melhorando, removendo e adicionando cards...\n"
         
-        self.review_result.insert(tk.END, msg, "processing")
-        self.review_result.config(state="disabled")
+        self._show_result_message(msg, "processing")
         
         self.review_count_var.set("...")
+        self.update_status(f"Tarefa #{job.id} enviada para a fila", "warning")
+    
+    def _concluir_tarefa(self, job: Job):
+        """
+        Trata o fim de uma tarefa de revisão.
         
-        def chamar_api():
+        O cache de revisões é atualizado para toda tarefa concluída, mas só
+        a última revisão enviada ocupa o painel de resultado; as anteriores
+        ficam disponíveis no painel de tarefas.
+        
+        Args:
+            job: Tarefa concluída, com erro ou cancelada.
+        """
+        latest = job.id == self._latest_job_id
+        
+        if job.state == CANCELLED:
+            if latest:
+                self._show_review_placeholder()
+                self.review_count_var.set(str(len(self.review_cards_data)))
+            self.update_status(f"Tarefa #{job.id} cancelada", "info")
+            return
+        
+        if job.state != DONE:
+            if latest:
+                self._erro_revisao(str(job.error))
+            else:
+                self.update_status(f"Tarefa #{job.id}: erro na revisão", "error")
+            return
+        
+        mode, result, plan, _ = job.result
+        if result is not None and plan is not None:
             try:
-                cards_text = format_cards_for_prompt(self.loaded_csv_cards)
-                
-                self.update_status(f"Processando com {MODEL_ADVANCED}...", "warning")
-                
-                response = review_deck(assunto, cards_text, mode)
-                
-                self.parent.after(
-                    0,
-                    lambda: self._finalizar_revisao(response, mode)
-                )
-                
+                plan.commit(self._get_review_cache(), result.extracted)
             except Exception as e:
-                self.parent.after(0, lambda m=str(e): self._erro_revisao(m))
+                print(f"[ReviewTab] Erro ao atualizar cache de revisões: {e}")
         
-        threading.Thread(target=chamar_api, daemon=True).start()
+        if latest:
+            self.show_job_result(job)
+        else:
+            summary = f"{len(result.cards)} cards" if result is not None else "sem alterações"
+            self.update_status(
+                f"✓ Tarefa #{job.id}: {summary} • abra no painel de tarefas", "success"
+            )
     
-    def _finalizar_revisao(self, response: str, mode: str):
+    def show_job_result(self, job: Job):
         """
-        Finaliza o processo de revisão.
+        Exibe o resultado de uma tarefa de revisão concluída.
+        
+        Args:
+            job: Tarefa de revisão no estado DONE.
+        """
+        self._latest_job_id = job.id
+        mode, result, plan, duplicates = job.result
+        if result is None:
+            self._revisao_sem_alteracoes(plan, duplicates)
+        else:
+            self._finalizar_revisao(result, mode)
+    
+    def _montar_resultado(
+        self,
+        response: str,
+        mode: str,
+        encoded: Optional[EncodedDeck] = None,
+        sent_cards: Optional[CardStore] = None,
+        plan: Optional[IncrementalPlan] = None,
+        duplicates: Sequence[Tuple] = ()
+    ) -> ReviewResult:
+        """
+        Extrai os cards e monta a exibição da resposta.
+        
+        Não usa o Tk: roda na thread da chamada à API, e a interface só
+        aplica o texto já montado.
         
         Args:
             response: Resposta completa da IA.
             mode: Modo de revisão ("audit" ou "final").
+            encoded: Deck codificado enviado no prompt.
+            sent_cards: Cards enviados (para mapear referências aos IDs).
+            plan: Plano de revisão incremental (None para revisão completa).
+            duplicates: Duplicatas ignoradas antes do envio (ver `dedup_cards`).
+        
+        Returns:
+            ReviewResult com cards, citações e texto formatado.
         """
-        self.review_result.config(state="normal")
-        self.review_result.delete("1.0", tk.END)
+        # Tokeniza a resposta uma única vez para extração e exibição
+        sections = split_review_sections(response)
+        buffer = RenderBuffer()
         
         if mode == "audit":
             # Extrai novos cards sugeridos
-            new_cards = extract_new_cards_from_audit(response)
-            self.review_cards_data = new_cards
-            self.review_count_var.set(str(len(new_cards)))
-            
-            # Mostra resposta formatada
-            self._format_audit_response(response)
+            extracted = extract_new_cards_from_audit(sections)
+            cards = CardStore.from_dicts(extracted)
+            self._format_audit_response(buffer, sections)
         else:
             # Extrai cards finais e relatório
-            final_cards = extract_cards_from_review(response)
-            report = extract_report_from_review(response)
+            extracted = extract_cards_from_review(sections)
+            report = extract_report_from_review(sections)
             
-            self.review_cards_data = final_cards
-            self.review_count_var.set(str(len(final_cards)))
+            final_cards = extracted
+            if plan is not None:
+                # Deck final = cards sem alteração + cards revisados agora
+                final_cards = plan.merge(extracted)
             
-            # Mostra relatório e cards
-            self._format_review_response(report, final_cards)
+            cards = CardStore.from_dicts(final_cards)
+            self._format_review_response(buffer, report, cards)
         
-        self.review_result.config(state="disabled")
-        self._set_busy(False)
+        if duplicates:
+            buffer.write("\n" + self._duplicates_text(duplicates), "muted")
+        
+        # Liga as citações da resposta aos cards originais
+        card_refs = {}
+        if encoded is not None and sent_cards is not None:
+            cited = sections.get(SECTION_PROBLEMS if mode == "audit" else SECTION_REPORT)
+            if cited is not None:
+                card_refs = resolve_card_refs(cited.text, encoded, sent_cards)
+        
+        return ReviewResult(cards, card_refs, buffer, extracted)
+    
+    def _finalizar_revisao(self, result: ReviewResult, mode: str):
+        """
+        Exibe o resultado de uma revisão.
+        
+        Args:
+            result: Resultado montado por `_montar_resultado`.
+            mode: Modo de revisão ("audit" ou "final").
+        """
+        self.review_cards_data = result.cards
+        self.review_card_refs = result.card_refs
+        self.review_count_var.set(str(len(result.cards)))
+        
+        # Uma única inserção, com as tags aplicadas em lote
+        result.rendered.apply(self.review_result, replace=True)
         
         mode_txt = "Auditoria" if mode == "audit" else "Revisão Final"
+        refs_txt = f" • {len(self.review_card_refs)} card(s) citados" if self.review_card_refs else ""
         self.update_status(
-            f"✓ {mode_txt} concluída • {len(self.review_cards_data)} cards",
+            f"✓ {mode_txt} concluída • {len(self.review_cards_data)} cards{refs_txt}",
             "success"
         )
     
-    def _format_audit_response(self, response: str):
+    def _revisao_sem_alteracoes(self, plan: IncrementalPlan, duplicates: Sequence[Tuple] = ()):
         """
-        Formata a resposta de auditoria para exibição.
+        Conclui uma revisão incremental em que nenhum card mudou.
         
         Args:
-            response: Resposta completa da IA.
+            plan: Plano de revisão incremental.
+            duplicates: Duplicatas ignoradas antes do envio.
+        """
+        self.review_card_refs = {}
+        self.review_cards_data = plan.merge(CardStore())
+        self.review_count_var.set(str(len(self.review_cards_data)))
+        
+        self._show_result_message(
+            f"\n\n    ✓ Nenhum card novo ou alterado desde a última revisão.\n\n"
+            f"    {len(plan.cached)} card(s) já revisados para este assunto.\n"
+            f"    Desmarque \"Revisão incremental\" para revisar o deck inteiro.\n"
+            + (f"\n{self._duplicates_text(duplicates)}" if duplicates else ""),
+            "processing"
+        )
+        
+        self.update_status("Nenhuma alteração desde a última revisão", "info")
+    
+    @staticmethod
+    def _duplicates_text(duplicates: Sequence[Tuple]) -> str:
         """
-        lines = response.split('\n')
+        Lista as duplicatas que ficaram fora da revisão.
         
-        for line in lines:
-            line_stripped = line.strip()
+        Args:
+            duplicates: Lista de (duplicata, card mantido, similaridade).
+        
+        Returns:
+            Texto com uma linha por duplicata.
+        """
+        lines = [f"DUPLICATAS IGNORADAS ({len(duplicates)}):"]
+        for duplicate, kept, similarity in duplicates:
+            line = f"  • {duplicate['q'][:80]}"
+            if kept is not None:
+                line += f"  ≈ {kept['q'][:60]} ({similarity:.0%})"
+            lines.append(line)
+        return "\n".join(lines) + "\n"
+    
+    def _format_audit_response(self, buffer: RenderBuffer, sections: ReviewSections):
+        """
+        Formata a resposta de auditoria para exibição.
+        
+        Args:
+            buffer: Buffer que recebe o texto formatado.
+            sections: Seções da resposta completa da IA.
+        """
+        for section in sections:
+            if section.marker:
+                buffer.write(section.header + "\n", "header")
             
-            if line_stripped.startswith("==="):
-                self.review_result.insert(tk.END, line + "\n", "header")
-            elif line_stripped.startswith("Q:"):
-                self.review_result.insert(tk.END, line + "\n", "pergunta")
-            elif line_stripped.startswith("A:"):
-                self.review_result.insert(tk.END, line + "\n", "resposta")
-            elif "ALTA" in line_stripped:
-                self.review_result.insert(tk.END, line + "\n", "error")
-            elif "MÉDIA" in line_stripped:
-                self.review_result.insert(tk.END, line + "\n", "warning")
-            elif "BAIXA" in line_stripped:
-                self.review_result.insert(tk.END, line + "\n", "info")
-            elif line_stripped.startswith("•") or line_stripped.startswith("-"):
-                self.review_result.insert(tk.END, line + "\n", "info")
-            elif any(line_stripped.startswith(str(i) + ".") for i in range(1, 100)):
-                self.review_result.insert(tk.END, line + "\n", "info")
-            else:
-                self.review_result.insert(tk.END, line + "\n")
+            body = section.body
+            if body.endswith('\n'):
+                body = body[:-1]
+            
+            buffer.write_lines(body, AUDIT_LINES)
     
-    def _format_review_response(self, report: str, cards: List[Dict[str, str]]):
+    def _format_review_response(
+        self,
+        buffer: RenderBuffer,
+        report: str,
+        cards: Iterable[Mapping[str, str]]
+    ):
         """
         Formata a resposta de revisão final para exibição.
         
         Args:
+            buffer: Buffer que recebe o texto formatado.
             report: Relatório de alterações.
             cards: Cards finais.
         """
-        # Header do relatório
-        self.review_result.insert(tk.END, "═" * 50 + "\n", "muted")
-        self.review_result.insert(tk.END, "  RELATÓRIO DE ALTERAÇÕES\n", "header")
-        self.review_result.insert(tk.END, "═" * 50 + "\n\n", "muted")
+        rule = "═" * 50 + "\n"
         
-        # Conteúdo do relatório
-        lines = report.split('\n')
-        for line in lines:
-            line_stripped = line.strip()
-            
-            if "REMOVIDOS" in line_stripped:
-                self.review_result.insert(tk.END, line + "\n", "error")
-            elif "MODIFICADOS" in line_stripped:
-                self.review_result.insert(tk.END, line + "\n", "warning")
-            elif "DIVIDIDOS" in line_stripped:
-                self.review_result.insert(tk.END, line + "\n", "info")
-            elif "ADICIONADOS" in line_stripped:
-                self.review_result.insert(tk.END, line + "\n", "success")
-            elif "ESTATÍSTICAS" in line_stripped or line_stripped.startswith("==="):
-                self.review_result.insert(tk.END, line + "\n", "subheader")
-            elif line_stripped.startswith("•") or line_stripped.startswith("-"):
-                self.review_result.insert(tk.END, line + "\n", "muted")
-            else:
-                self.review_result.insert(tk.END, line + "\n")
+        # Header e conteúdo do relatório
+        buffer.write(rule, "muted")
+        buffer.write("  RELATÓRIO DE ALTERAÇÕES\n", "header")
+        buffer.write(rule + "\n", "muted")
+        buffer.write_lines(report, REPORT_LINES)
         
         # Header dos cards finais
-        self.review_result.insert(tk.END, "\n" + "═" * 50 + "\n", "muted")
-        self.review_result.insert(tk.END, f"  CARDS FINAIS ({len(cards)} cards)\n", "header")
-        self.review_result.insert(tk.END, "═" * 50 + "\n\n", "muted")
+        buffer.write("\n" + rule, "muted")
+        buffer.write(f"  CARDS FINAIS ({len(cards)} cards)\n", "header")
+        buffer.write(rule + "\n", "muted")
         
         # Lista de cards
+        footer = "└" + "─" * 40 + "\n\n"
         for i, c in enumerate(cards):
-            self.review_result.insert(tk.END, f"┌─ Card {i + 1}\n", "subheader")
-            self.review_result.insert(tk.END, f"│ Q: {c['q']}\n", "pergunta")
-            
-            a_lines = c['a'].split('\n')
-            for j, aline in enumerate(a_lines):
-                prefix = "│ A: " if j == 0 else "│    "
-                self.review_result.insert(tk.END, f"{prefix}{aline}\n", "resposta")
-            
-            self.review_result.insert(tk.END, "└" + "─" * 40 + "\n\n", "muted")
+            buffer.write(f"┌─ Card {i + 1}\n", "subheader")
+            buffer.write(f"│ Q: {c['q']}\n", "pergunta")
+            answer = c['a'].replace('\n', '\n│    ')
+            buffer.write(f"│ A: {answer}\n", "resposta")
+            buffer.write(footer, "muted")
     
     def _erro_revisao(self, mensagem: str):
         """
@@ -799,12 +1361,8 @@ class ReviewTab:
         Args:
             mensagem: Mensagem de erro.
         """
-        self.review_result.config(state="normal")
-        self.review_result.delete("1.0", tk.END)
-        self.review_result.insert(tk.END, f"\n  ❌ Erro:\n\n  {mensagem}", "error")
-        self.review_result.config(state="disabled")
+        self._show_result_message(f"\n  ❌ Erro:\n\n  {mensagem}", "error")
         self.review_count_var.set("0")
-        self._set_busy(False)
         self.update_status("Erro na revisão", "error")
         messagebox.showerror("Erro", mensagem)
     
@@ -840,54 +1398,24 @@ class ReviewTab:
             self.parent.winfo_toplevel(),
             len(cards_to_export),
             self.theme,
-            title="Exportar Resultado da Revisão"
+            title="Exportar Resultado da Revisão",
+            partition_rules=available_partition_rules(cards_to_export)
         )
         self.parent.winfo_toplevel().wait_window(dialog)
         
         if not dialog.result:
             return
         
-        if dialog.result == "anki_apkg":
-            path = filedialog.asksaveasfilename(
-                defaultextension=".apkg",
-                filetypes=[("Pacote Anki", "*.apkg")],
-                title="Salvar .apkg",
-                initialfile=f"{dialog.deck_name}.apkg"
-            )
-            if path:
-                try:
-                    export_apkg(path, dialog.deck_name, cards_to_export)
-                    self.update_status(
-                        f"Exportado: {len(cards_to_export)} cards ({export_label})",
-                        "success"
-                    )
-                    messagebox.showinfo(
-                        "Sucesso",
-                        f"✓ {len(cards_to_export)} cards exportados!\n\nNo Anki: Arquivo → Importar"
-                    )
-                except Exception as e:
-                    messagebox.showerror("Erro", str(e))
-        else:
-            target = "anki" if dialog.result == "anki_txt" else "noji"
-            filename = f"flashcards_{target}.txt"
-            path = filedialog.asksaveasfilename(
-                defaultextension=".txt",
-                filetypes=[("Texto", "*.txt")],
-                initialfile=filename
-            )
-            if path:
-                try:
-                    export_txt(path, cards_to_export)
-                    self.update_status(
-                        f"Exportado: {len(cards_to_export)} cards ({export_label})",
-                        "success"
-                    )
-                    messagebox.showinfo(
-                        "Sucesso",
-                        f"✓ {len(cards_to_export)} cards exportados!"
-                    )
-                except Exception as e:
-                    messagebox.showerror("Erro", str(e))
+        if dialog.dedup:
+            cards_to_export, duplicates = dedup_cards(cards_to_export)
+            if duplicates:
+                export_label += f", {len(duplicates)} duplicata(s) removida(s)"
+        
+        self.export_runner.start(
+            cards_to_export, dialog.result, dialog.deck_name, f" ({export_label})",
+            partition=dialog.partition, partition_size=dialog.partition_size,
+            separate=dialog.separate
+        )
     
     def _copiar_review(self):
         """Copia os cards da revisão para a área de transferência."""
@@ -904,8 +1432,8 @@ class ReviewTab:
     def _limpar_review(self):
         """Limpa todos os campos da aba de revisão."""
         self.assunto_var.set("")
-        self.loaded_csv_cards = []
-        self.review_cards_data = []
+        self.loaded_csv_cards = CardStore()
+        self.review_cards_data = CardStore()
         self.loaded_count_var.set("0 cards carregados")
         self.review_count_var.set("0")
         self.review_mode_var.set("audit")
@@ -914,5 +1442,7 @@ class ReviewTab:
         self.loaded_preview.delete("1.0", tk.END)
         self.loaded_preview.config(state="disabled")
         
+        self.encoding_info_var.set("")
+        
         self._show_review_placeholder()
         self.update_status("Campos limpos", "info")
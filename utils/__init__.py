@@ -6,7 +6,29 @@ Módulo de Utilitários
 Funções auxiliares para validação, exportação e outras operações.
 """
 
-from .validators import validar_api_key
-from .export import export_apkg, export_txt
+from .validators import validar_api_key, verificar_api_key
+from .export import export_apkg, export_apkg_packages, export_txt
+from .apkg_writer import ApkgWriter, write_apkg, update_apkg
+from .deck_registry import DeckRegistry, deck_id_for, get_deck_registry
+from .stream_export import STREAM_FORMATS, write_cards
+from .export_worker import EXPORT_FORMATS, ExportCancelled, ExportTarget, run_exports
 
-__all__ = ["validar_api_key", "export_apkg", "export_txt"]
+__all__ = [
+    "validar_api_key",
+    "verificar_api_key",
+    "export_apkg",
+    "export_apkg_packages",
+    "export_txt",
+    "ApkgWriter",
+    "write_apkg",
+    "update_apkg",
+    "DeckRegistry",
+    "deck_id_for",
+    "get_deck_registry",
+    "STREAM_FORMATS",
+    "write_cards",
+    "EXPORT_FORMATS",
+    "ExportCancelled",
+    "ExportTarget",
+    "run_exports",
+]
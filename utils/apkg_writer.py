@@ -0,0 +1,519 @@
+# -*- coding: utf-8 -*-
+"""
+Escritor Direto de Pacotes .apkg
+================================
+
+Gera o banco `collection.anki2` diretamente com sqlite3, sem criar um objeto
+`genanki.Note` por card.
+
+As notas chegam por um iterador e são gravadas em lotes com `executemany`
+dentro de uma única transação. O esquema, a coleção inicial e o JSON de
+deck/modelo são os mesmos do genanki, então o pacote resultante tem o mesmo
+conteúdo que `genanki.Package.write_to_file` produziria para o mesmo modelo.
+
+O genanki só é importado quando um pacote é de fato gravado (o GUID não
+depende dele), para não pesar na abertura da interface.
+"""
+
+import difflib
+import hashlib
+import itertools
+import json
+import os
+import sqlite3
+import tempfile
+import time
+import zipfile
+from collections import Counter
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import genanki
+
+
+# Notas gravadas por chamada de executemany
+DEFAULT_BATCH_SIZE = 5000
+
+# Semelhança mínima (0-1) entre o verso antigo e o novo para que uma nota com
+# a mesma frente seja tratada como o mesmo card editado (update_apkg)
+EDIT_SIMILARITY = 0.6
+
+# Nota pronta para gravação: (campos, guid) ou (campos, guid, tags)
+NoteRow = Tuple
+
+# Mesma tabela de genanki.util.BASE91_TABLE (formato de GUID do Anki)
+_BASE91 = (
+    "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
+    "!#$%&()*+,-./:;<=>?@[]^_`{|}~"
+)
+
+
+def guid_for(*values: object) -> str:
+    """
+    Calcula o GUID de uma nota, idêntico a `genanki.guid_for`.
+
+    Usa int.from_bytes e divmod em vez do laço byte a byte do genanki,
+    que dominava o tempo de exportação de decks grandes.
+
+    Args:
+        values: Valores que identificam a nota (ex: pergunta e resposta).
+
+    Returns:
+        GUID no formato base91 do Anki.
+    """
+    data = "__".join(str(v) for v in values).encode("utf-8")
+    number = int.from_bytes(hashlib.sha256(data).digest()[:8], "big")
+
+    digits = []
+    while number:
+        number, rest = divmod(number, 91)
+        digits.append(_BASE91[rest])
+    return "".join(reversed(digits))
+
+
+def _required_ords(model: "genanki.Model") -> List[Tuple[int, object, List[int]]]:
+    """Regras de geração de cards do modelo (template, any/all, campos)."""
+    return [
+        (card_ord, {"any": any, "all": all}[any_or_all], field_ords)
+        for card_ord, any_or_all, field_ords in model._req
+    ]
+
+
+def _format_tags(tags: Optional[str]) -> str:
+    """Tags no formato da coluna notes.tags (" tag1 tag2 ", igual ao genanki)."""
+    return f" {' '.join(tags.split())} " if tags else "  "
+
+
+def _note_rows(
+    notes: Iterable[NoteRow],
+    id_gen: Iterator[int],
+    model: "genanki.Model",
+    deck_id: int,
+    mod: int
+) -> Iterator[Tuple[tuple, List[tuple]]]:
+    """Converte notas em linhas das tabelas notes e cards (formato genanki)."""
+    mid = model.model_id
+    req = _required_ords(model)
+    sort_index = model.sort_field_index
+
+    for note in notes:
+        fields, guid = note[0], note[1]
+        tags = _format_tags(note[2] if len(note) > 2 else None)
+        note_id = next(id_gen)
+        note_row = (
+            note_id, guid, mid, mod, -1, tags,
+            "\x1f".join(fields), fields[sort_index], 0, 0, "",
+        )
+        card_rows = [
+            (next(id_gen), note_id, deck_id, card_ord, mod, -1,
+             0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, "")
+            for card_ord, op, field_ords in req
+            if op(fields[i] for i in field_ords)
+        ]
+        yield note_row, card_rows
+
+
+def _insert_rows(
+    conn: sqlite3.Connection,
+    rows: Iterator[Tuple[tuple, List[tuple]]],
+    batch_size: int,
+    after_batch: Optional[Callable[[int], None]] = None
+) -> int:
+    """Insere notas e cards em lotes com executemany."""
+    added = 0
+
+    while True:
+        batch = list(itertools.islice(rows, batch_size))
+        if not batch:
+            break
+
+        conn.executemany(
+            "INSERT INTO notes VALUES (?,?,?,?,?,?,?,?,?,?,?)",
+            [note for note, _ in batch]
+        )
+        conn.executemany(
+            "INSERT INTO cards VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)",
+            [card for _, cards in batch for card in cards]
+        )
+        added += len(batch)
+        if after_batch is not None:
+            after_batch(added)
+
+    return added
+
+
+def _register_deck_and_model(
+    cursor: sqlite3.Cursor,
+    deck_id: int,
+    deck_name: str,
+    model: "genanki.Model",
+    timestamp: float
+) -> None:
+    """Registra deck e modelo no JSON da coleção (igual ao genanki)."""
+    import genanki
+
+    decks_json, = cursor.execute("SELECT decks FROM col").fetchone()
+    decks = json.loads(decks_json)
+    decks[str(deck_id)] = genanki.Deck(deck_id, deck_name).to_json()
+    cursor.execute("UPDATE col SET decks = ?", (json.dumps(decks),))
+
+    models_json, = cursor.execute("SELECT models FROM col").fetchone()
+    models = json.loads(models_json)
+    models.update({model.model_id: model.to_json(timestamp, deck_id)})
+    cursor.execute("UPDATE col SET models = ?", (json.dumps(models),))
+
+
+class ApkgWriter:
+    """
+    Escreve um pacote .apkg em streaming.
+
+    Uso:
+        with ApkgWriter(path, deck_id, "Deck", ANKI_MODEL) as writer:
+            writer.add_notes((campos, guid) for ...)
+            writer.add_deck(sub_id, "Deck::Subdeck")
+            writer.add_notes(outras_notas, deck_id=sub_id)
+    """
+
+    def __init__(
+        self,
+        path: str,
+        deck_id: int,
+        deck_name: str,
+        model: "genanki.Model",
+        timestamp: Optional[float] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE
+    ):
+        """
+        Cria o banco temporário com esquema, deck e modelo.
+
+        Args:
+            path: Caminho do arquivo .apkg de saída.
+            deck_id: ID do deck.
+            deck_name: Nome do deck.
+            model: Modelo de nota (ex: ANKI_MODEL).
+            timestamp: Data de modificação das notas (padrão: agora).
+            batch_size: Notas por lote de inserção.
+        """
+        self.path = path
+        self.deck_id = deck_id
+        self.model = model
+        self.batch_size = batch_size
+        self.timestamp = time.time() if timestamp is None else timestamp
+        self.count = 0
+
+        # Mesma sequência de IDs do genanki: nota, card(s), nota, ...
+        self._id_gen = itertools.count(int(self.timestamp * 1000))
+
+        fd, self._db_path = tempfile.mkstemp(suffix=".anki2")
+        os.close(fd)
+
+        self._conn = sqlite3.connect(self._db_path)
+        # Banco temporário: durabilidade não importa, só velocidade
+        self._conn.execute("PRAGMA journal_mode = OFF")
+        self._conn.execute("PRAGMA synchronous = OFF")
+        from genanki.apkg_col import APKG_COL
+        from genanki.apkg_schema import APKG_SCHEMA
+
+        self._conn.executescript(APKG_SCHEMA)
+        self._conn.executescript(APKG_COL)
+        _register_deck_and_model(
+            self._conn.cursor(), deck_id, deck_name, model, self.timestamp
+        )
+        self._conn.commit()
+        self._conn.execute("BEGIN")
+
+    def add_deck(self, deck_id: int, deck_name: str) -> None:
+        """
+        Registra outro deck no pacote (ex: subdeck "Pai::Filho").
+
+        Args:
+            deck_id: ID do deck.
+            deck_name: Nome completo do deck.
+        """
+        import genanki
+
+        cursor = self._conn.cursor()
+        decks_json, = cursor.execute("SELECT decks FROM col").fetchone()
+        decks = json.loads(decks_json)
+        decks[str(deck_id)] = genanki.Deck(deck_id, deck_name).to_json()
+        cursor.execute("UPDATE col SET decks = ?", (json.dumps(decks),))
+
+    def add_notes(
+        self,
+        notes: Iterable[NoteRow],
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        deck_id: Optional[int] = None
+    ) -> int:
+        """
+        Grava notas em lotes.
+
+        Args:
+            notes: Iterador de (campos, guid[, tags]).
+            progress_callback: Chamado após cada lote com (notas gravadas no
+                total, tamanho atual do banco em bytes). Uma exceção lançada
+                pelo callback interrompe a gravação.
+            deck_id: Deck dos cards (padrão: o deck principal; outros decks
+                devem ser registrados com `add_deck`).
+
+        Returns:
+            Número de notas gravadas nesta chamada.
+        """
+        rows = _note_rows(
+            notes, self._id_gen, self.model,
+            self.deck_id if deck_id is None else deck_id, int(self.timestamp)
+        )
+        start = self.count
+
+        def after_batch(added: int) -> None:
+            if progress_callback is not None:
+                progress_callback(start + added, os.path.getsize(self._db_path))
+
+        added = _insert_rows(self._conn, rows, self.batch_size, after_batch)
+        self.count += added
+        return added
+
+    def close(self) -> None:
+        """Conclui a transação e compacta o banco no arquivo .apkg."""
+        try:
+            self._conn.commit()
+            self._conn.close()
+
+            with zipfile.ZipFile(self.path, "w") as outzip:
+                outzip.write(self._db_path, "collection.anki2")
+                outzip.writestr("media", json.dumps({}))
+        finally:
+            os.remove(self._db_path)
+
+    def abort(self) -> None:
+        """Descarta o pacote sem gerar o arquivo .apkg."""
+        try:
+            self._conn.close()
+        finally:
+            os.remove(self._db_path)
+
+    def __enter__(self) -> "ApkgWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def write_apkg(
+    path: str,
+    deck_id: int,
+    deck_name: str,
+    model: "genanki.Model",
+    notes: Iterable[NoteRow],
+    timestamp: Optional[float] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    progress_callback: Optional[Callable[[int, int], None]] = None
+) -> int:
+    """
+    Gera um pacote .apkg a partir de um iterador de notas.
+
+    Args:
+        path: Caminho do arquivo de saída.
+        deck_id: ID do deck.
+        deck_name: Nome do deck.
+        model: Modelo de nota.
+        notes: Iterador de (campos, guid[, tags]).
+        timestamp: Data de modificação das notas (padrão: agora).
+        batch_size: Notas por lote de inserção.
+        progress_callback: Ver `ApkgWriter.add_notes`.
+
+    Returns:
+        Número de notas gravadas.
+    """
+    with ApkgWriter(path, deck_id, deck_name, model, timestamp, batch_size) as writer:
+        writer.add_notes(notes, progress_callback)
+    return writer.count
+
+
+# ==============================================================================
+# ATUALIZAÇÃO INCREMENTAL
+# ==============================================================================
+
+def _find_collection(directory: str) -> Optional[str]:
+    """Localiza o banco SQLite extraído de um .apkg."""
+    for db_name in ("collection.anki2", "collection.anki21"):
+        candidate = os.path.join(directory, db_name)
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+
+def update_apkg(
+    path: str,
+    deck_id: int,
+    deck_name: str,
+    model: "genanki.Model",
+    notes: Iterable[NoteRow],
+    timestamp: Optional[float] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> Tuple[Dict[str, int], List[str]]:
+    """
+    Atualiza um pacote .apkg existente mantendo IDs e GUIDs das notas.
+
+    Cada nota informada é ligada a uma nota existente do mesmo modelo pelo
+    GUID ou pelos campos idênticos. Um card editado (mesma frente) só herda
+    a nota antiga se a ligação for inequívoca (uma única nota antiga e uma
+    única nota nova com essa frente) e o verso ainda tiver semelhança de
+    pelo menos EDIT_SIMILARITY; caso contrário entra como nota nova e a
+    antiga é removida. Só notas novas, alteradas ou removidas são gravadas; as demais (e notas de outros modelos) ficam intactas.
+    Se o pacote já tiver um deck com o mesmo nome, as notas novas vão para
+    ele (pacotes antigos podem ter outro ID).
+
+    Args:
+        path: Caminho do .apkg existente (sobrescrito no final).
+        deck_id: ID do deck das notas novas (se o pacote não tiver o deck).
+        deck_name: Nome do deck.
+        model: Modelo de nota.
+        notes: Iterador de (campos, guid preferido[, tags]).
+        timestamp: Data de modificação das notas alteradas (padrão: agora).
+        batch_size: Notas por lote de inserção.
+
+    Returns:
+        Tuple com (estatísticas {"added", "changed", "removed", "unchanged"},
+        GUID final de cada nota, na ordem recebida).
+
+    Raises:
+        ValueError: Se o arquivo não contiver uma coleção do Anki.
+    """
+    timestamp = time.time() if timestamp is None else timestamp
+    mod = int(timestamp)
+    stats = {"added": 0, "changed": 0, "removed": 0, "unchanged": 0}
+    guids: List[str] = []
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        with zipfile.ZipFile(path, "r") as zin:
+            zin.extractall(temp_dir)
+            members = zin.namelist()
+
+        db_path = _find_collection(temp_dir)
+        if db_path is None:
+            raise ValueError("Pacote .apkg sem coleção do Anki.")
+
+        conn = sqlite3.connect(db_path)
+        try:
+            decks_json, = conn.execute("SELECT decks FROM col").fetchone()
+            for info in json.loads(decks_json).values():
+                if info.get("name") == deck_name:
+                    deck_id = int(info["id"])
+                    break
+
+            existing = conn.execute(
+                "SELECT id, guid, flds, tags FROM notes WHERE mid = ?", (model.model_id,)
+            ).fetchall()
+
+            by_guid = {guid: (note_id, flds, tags) for note_id, guid, flds, tags in existing}
+            by_fields: Dict[str, str] = {}
+            by_front: Dict[str, List[str]] = {}
+            for _, guid, flds, _ in existing:
+                by_fields.setdefault(flds, guid)
+                front = flds.partition("\x1f")[0]
+                if front:
+                    by_front.setdefault(front, []).append(guid)
+
+            matched = set()
+            changed = []
+            added = []
+
+            def claim(guid: Optional[str]) -> Optional[str]:
+                if guid is not None and guid in by_guid and guid not in matched:
+                    matched.add(guid)
+                    return guid
+                return None
+
+            # 1ª passada: GUID e campos idênticos (antes das edições, para que
+            # um card editado não tome a nota de outro que ficou igual)
+            notes = list(notes)
+            found_guids = [
+                claim(note[1]) or claim(by_fields.get("\x1f".join(note[0])))
+                for note in notes
+            ]
+
+            # 2ª passada: mesma frente, só se inequívoca e com verso semelhante
+            new_fronts = Counter(note[0][0] for note in notes)
+            for i, note in enumerate(notes):
+                fields = note[0]
+                candidates = by_front.get(fields[0], ())
+                if (
+                    found_guids[i] is None
+                    and len(candidates) == 1
+                    and new_fronts[fields[0]] == 1
+                    and candidates[0] not in matched
+                ):
+                    old_back = by_guid[candidates[0]][1].partition("\x1f")[2]
+                    new_back = fields[1] if len(fields) > 1 else ""
+                    if difflib.SequenceMatcher(None, old_back, new_back).ratio() >= EDIT_SIMILARITY:
+                        found_guids[i] = claim(candidates[0])
+
+            for note, found in zip(notes, found_guids):
+                fields, guid = note[0], note[1]
+                tags = _format_tags(note[2] if len(note) > 2 else None)
+                flds = "\x1f".join(fields)
+
+                if found is None:
+                    # GUID repetido no próprio lote vira uma nota nova
+                    if guid in by_guid or guid in matched:
+                        guid = guid_for(*fields, len(guids))
+                    matched.add(guid)
+                    added.append((fields, guid, tags.strip()))
+                    guids.append(guid)
+                    continue
+
+                guids.append(found)
+                note_id, old_flds, old_tags = by_guid[found]
+                if old_flds == flds and old_tags == tags:
+                    stats["unchanged"] += 1
+                else:
+                    changed.append(
+                        (flds, fields[model.sort_field_index], tags, mod, note_id)
+                    )
+
+            removed = [
+                (note_id,) for guid, (note_id, _, _) in by_guid.items()
+                if guid not in matched
+            ]
+
+            # Próximos IDs depois dos maiores existentes
+            max_id = conn.execute(
+                "SELECT MAX(m) FROM (SELECT MAX(id) AS m FROM notes "
+                "UNION ALL SELECT MAX(id) FROM cards)"
+            ).fetchone()[0] or 0
+            id_gen = itertools.count(max(max_id + 1, int(timestamp * 1000)))
+
+            with conn:
+                _register_deck_and_model(conn.cursor(), deck_id, deck_name, model, timestamp)
+
+                conn.executemany(
+                    "UPDATE notes SET flds = ?, sfld = ?, tags = ?, mod = ?, usn = -1 WHERE id = ?",
+                    changed
+                )
+                conn.executemany("DELETE FROM cards WHERE nid = ?", removed)
+                conn.executemany("DELETE FROM notes WHERE id = ?", removed)
+                stats["added"] = _insert_rows(
+                    conn, _note_rows(added, id_gen, model, deck_id, mod), batch_size
+                )
+
+            stats["changed"] = len(changed)
+            stats["removed"] = len(removed)
+        finally:
+            conn.close()
+
+        # Reescreve o pacote preservando mídia e demais arquivos
+        fd, tmp_path = tempfile.mkstemp(suffix=".apkg", dir=os.path.dirname(os.path.abspath(path)))
+        os.close(fd)
+        try:
+            with zipfile.ZipFile(tmp_path, "w") as zout:
+                for name in members:
+                    zout.write(os.path.join(temp_dir, name), name)
+            os.replace(tmp_path, path)
+        except Exception:
+            os.remove(tmp_path)
+            raise
+
+    return stats, guids
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""
+Registro de Decks
+=================
+
+IDs de deck determinísticos e registro persistente dos decks exportados.
+
+O ID é derivado do nome por SHA-256 (igual em qualquer execução ou máquina),
+então exportar o mesmo deck de novo atualiza o deck existente no Anki em vez
+de criar outro. O registro (DATA_DIR/decks.json) guarda o ID de cada nome,
+resolve colisões e lembra a última exportação.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from config import DATA_DIR
+
+
+# Faixa dos IDs gerados: acima dos IDs reservados do Anki e abaixo de 2**53,
+# para não perder precisão no JSON lido pelo Anki
+_ID_MIN = 1 << 31
+_ID_MAX = 1 << 52
+
+
+def deck_id_for(deck_name: str) -> int:
+    """
+    Deriva um ID de deck estável a partir do nome.
+
+    Args:
+        deck_name: Nome do deck (espaços nas pontas são ignorados).
+
+    Returns:
+        ID inteiro, igual entre execuções.
+    """
+    digest = hashlib.sha256(deck_name.strip().encode("utf-8")).digest()
+    return _ID_MIN + int.from_bytes(digest[:8], "big") % (_ID_MAX - _ID_MIN)
+
+
+class DeckRegistry:
+    """
+    Registro persistente nome do deck → ID e dados da última exportação.
+
+    Uso:
+        registry = get_deck_registry()
+        deck_id = registry.deck_id("Python Básico")
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Carrega o registro.
+
+        Args:
+            path: Caminho do arquivo JSON (padrão: DATA_DIR/decks.json).
+        """
+        self.path = path or os.path.join(DATA_DIR, "decks.json")
+        self._lock = threading.Lock()
+        self._decks: Dict[str, Dict] = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        """Lê o arquivo do registro (vazio se não existir ou estiver inválido)."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            print(f"[DeckRegistry] Registro ignorado: {e}")
+            return {}
+
+    def _save(self) -> None:
+        """Grava o registro de forma atômica."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._decks, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def get(self, deck_name: str) -> Optional[Dict]:
+        """
+        Retorna os dados registrados de um deck.
+
+        Args:
+            deck_name: Nome do deck.
+
+        Returns:
+            Dicionário com "id" e dados da última exportação, ou None.
+        """
+        with self._lock:
+            entry = self._decks.get(deck_name.strip())
+            return dict(entry) if entry else None
+
+    def deck_id(self, deck_name: str) -> int:
+        """
+        Retorna o ID do deck, registrando-o na primeira vez.
+
+        Em caso de colisão com outro nome já registrado, o próximo ID livre
+        é usado (e fica registrado para este nome).
+
+        Args:
+            deck_name: Nome do deck.
+
+        Returns:
+            ID do deck.
+        """
+        name = deck_name.strip()
+
+        with self._lock:
+            entry = self._decks.get(name)
+            if entry:
+                return entry["id"]
+
+            used = {e["id"] for e in self._decks.values()}
+            deck_id = deck_id_for(name)
+            while deck_id in used:
+                deck_id = deck_id + 1 if deck_id + 1 < _ID_MAX else _ID_MIN
+
+            self._decks[name] = {"id": deck_id, "created": time.time()}
+            self._save()
+            return deck_id
+
+    def record_export(self, deck_name: str, path: str, num_cards: int) -> None:
+        """
+        Registra uma exportação do deck.
+
+        Args:
+            deck_name: Nome do deck.
+            path: Arquivo gerado.
+            num_cards: Número de cards exportados.
+        """
+        name = deck_name.strip()
+        deck_id = self.deck_id(name)
+
+        with self._lock:
+            self._decks[name].update({
+                "id": deck_id,
+                "last_export": time.time(),
+                "path": os.path.abspath(path),
+                "cards": num_cards,
+            })
+            self._save()
+
+
+_registry: Optional[DeckRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_deck_registry() -> DeckRegistry:
+    """
+    Retorna o registro de decks padrão (carregado uma única vez).
+
+    Returns:
+        Instância compartilhada de DeckRegistry.
+    """
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = DeckRegistry()
+        return _registry
@@ -6,29 +6,28 @@ Funções de Exportação
 Exportação de flashcards para diferentes formatos.
 """
 
-from typing import List, Dict
-import genanki
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import get_context
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 
-from core.parser import format_cards_for_export_tab
+from core.cards import Card
+from core.partition import DEFAULT_PART_SIZE, partition_cards
+from .apkg_writer import ApkgWriter, guid_for, update_apkg, write_apkg
+from .deck_registry import deck_id_for, get_deck_registry
+from .stream_export import escape_field, write_cards
+
+if TYPE_CHECKING:
+    import genanki
 
 
 # ==============================================================================
 # MODELO ANKI PADRÃO
 # ==============================================================================
 
-ANKI_MODEL = genanki.Model(
-    1607392319,
-    "AnkiLab Card",
-    fields=[
-        {"name": "Frente"},
-        {"name": "Verso"}
-    ],
-    templates=[{
-        "name": "Card 1",
-        "qfmt": "{{Frente}}",
-        "afmt": '{{FrontSide}}<hr id="answer">{{Verso}}',
-    }],
-    css="""
+# CSS dos cards (o texto, com a indentação, faz parte do modelo gravado no .apkg)
+_ANKI_MODEL_CSS = """
         .card {
             font-family: 'Segoe UI', Arial, sans-serif;
             font-size: 18px;
@@ -48,63 +47,370 @@ ANKI_MODEL = genanki.Model(
             white-space: pre;
         }
     """
-)
+
+# Criado no primeiro uso: importar o genanki só vale a pena ao exportar .apkg
+_anki_model = None
+
+
+def get_anki_model() -> "genanki.Model":
+    """
+    Retorna o modelo de nota padrão do AnkiLab (Frente/Verso).
+    
+    Returns:
+        genanki.Model compartilhado.
+    """
+    global _anki_model
+    
+    if _anki_model is None:
+        import genanki
+        _anki_model = genanki.Model(
+            1607392319,
+            "AnkiLab Card",
+            fields=[
+                {"name": "Frente"},
+                {"name": "Verso"}
+            ],
+            templates=[{
+                "name": "Card 1",
+                "qfmt": "{{Frente}}",
+                "afmt": '{{FrontSide}}<hr id="answer">{{Verso}}',
+            }],
+            css=_ANKI_MODEL_CSS
+        )
+    
+    return _anki_model
+
+
+def __getattr__(name: str):
+    """Mantém `utils.export.ANKI_MODEL` disponível sem importar o genanki antes da hora."""
+    if name == "ANKI_MODEL":
+        return get_anki_model()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Indicadores de código, montados uma única vez. A busca por substring do
+# CPython é mais rápida que uma alternância regex com os mesmos literais
+# (ver benchmarks/bench_code_detection.py).
+CODE_INDICATORS = ('\n', 'def ', 'function ', '{', '=>', 'import ', 'const ', 'let ', 'var ')
+
+
+def is_code_answer(answer: str) -> bool:
+    """
+    Detecta se a resposta contém código.
+    
+    Args:
+        answer: Resposta com quebras de linha já normalizadas.
+    
+    Returns:
+        True se algum indicador de código estiver presente.
+    """
+    return any(map(answer.__contains__, CODE_INDICATORS))
+
+
+def format_answer_html(answer: str) -> str:
+    """
+    Formata a resposta para o campo Verso, envolvendo código em <pre><code>.
+    
+    Args:
+        answer: Resposta com quebras de linha já normalizadas.
+    
+    Returns:
+        Resposta pronta para a nota, com &, < e > escapados (a detecção de
+        código só decide o <pre><code>).
+    """
+    escaped = escape_field(answer)
+    if not is_code_answer(answer):
+        return escaped
+    return f"<pre><code>{escaped}</code></pre>"
+
+
+def format_note_fields(card: Mapping[str, str]) -> List[str]:
+    """
+    Converte um card nos campos (Frente, Verso) do ANKI_MODEL.
+    
+    Args:
+        card: Card com chaves 'q' e 'a'.
+    
+    Returns:
+        Lista [pergunta, resposta] pronta para a nota (HTML escapado).
+    """
+    # Normaliza quebras de linha
+    question = card["q"].replace('\\n', '\n')
+    answer = card["a"].replace('\\n', '\n')
+    
+    return [escape_field(question), format_answer_html(answer)]
+
+
+_UNSAFE_FILENAME = re.compile(r'[\\/:*?"<>|]+')
+
+
+def safe_filename(name: str) -> str:
+    """
+    Remove caracteres inválidos em nomes de arquivo.
+    
+    Args:
+        name: Nome original (ex: nome do deck).
+    
+    Returns:
+        Nome seguro para o sistema de arquivos.
+    """
+    return _UNSAFE_FILENAME.sub("_", name).strip() or "flashcards"
 
 
-def export_apkg(path: str, deck_name: str, cards: List[Dict[str, str]]) -> None:
+def package_path(path: str, child: str) -> str:
+    """
+    Caminho do pacote de um subdeck ("Deck.apkg" → "Deck - Parte 01.apkg").
+    
+    Args:
+        path: Caminho escolhido para o deck inteiro.
+        child: Nome do subdeck.
+    
+    Returns:
+        Caminho do pacote separado.
+    """
+    root, ext = os.path.splitext(path)
+    return f"{root} - {safe_filename(child)}{ext or '.apkg'}"
+
+
+def _note_tuple(card: Mapping[str, str]) -> Tuple[List[str], str, Optional[str]]:
+    """Converte um card em (campos, guid, tags) para utils.apkg_writer."""
+    # Cards vindos de um .apkg mantêm o GUID original da nota
+    return (
+        format_note_fields(card),
+        card.get("guid") or guid_for(card["q"], card["a"]),
+        card.get("tags"),
+    )
+
+
+def _resolve_deck_id(registry, deck_name: str) -> int:
+    """ID do deck pelo registro, ou derivado do nome se o registro falhar."""
+    if registry is not None:
+        try:
+            return registry.deck_id(deck_name)
+        except OSError as e:
+            print(f"[export_apkg] Registro de decks indisponível: {e}")
+    return deck_id_for(deck_name)
+
+
+def _record_export(registry, deck_name: str, path: str, count: int) -> None:
+    """Registra a exportação, sem interromper a exportação em caso de falha."""
+    if registry is None:
+        return
+    try:
+        registry.record_export(deck_name, path, count)
+    except OSError as e:
+        print(f"[export_apkg] Falha ao registrar exportação: {e}")
+
+
+def export_apkg(
+    path: str,
+    deck_name: str,
+    cards: Iterable[Mapping[str, str]],
+    update: bool = False,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    partition: Optional[str] = None,
+    partition_size: int = DEFAULT_PART_SIZE
+) -> Optional[Dict[str, int]]:
     """
     Exporta flashcards para formato .apkg (Anki).
     
+    As notas são geradas em streaming e gravadas direto no SQLite do pacote
+    (ver utils.apkg_writer), sem um objeto genanki.Note por card.
+    
     Args:
         path: Caminho do arquivo de saída.
         deck_name: Nome do deck.
-        cards: Lista de cards com chaves 'q' e 'a'.
+        cards: Lista de cards com chaves 'q' e 'a' (ou CardStore).
+        update: Se True e o arquivo existir, atualiza o pacote mantendo os
+            IDs e GUIDs das notas (edições não viram notas novas no Anki).
+            Ignorado quando há divisão em subdecks (o pacote é recriado).
+        progress_callback: Chamado com (cards gravados, bytes) durante a
+            exportação completa (ver utils.apkg_writer).
+        partition: Regra de divisão em subdecks "Deck::Parte" (ver
+            core.partition.PARTITION_RULES); None grava um deck único.
+        partition_size: Cards por subdeck na regra "size".
+    
+    Returns:
+        Estatísticas da atualização ({"added", "changed", "removed",
+        "unchanged"}) ou None numa exportação completa.
     
     Raises:
         Exception: Se houver erro na exportação.
     """
-    # Cria o deck com ID único baseado no nome
-    deck_id = abs(hash(deck_name)) % (10 ** 10)
-    deck = genanki.Deck(deck_id, deck_name)
+    # ID estável: o mesmo nome gera o mesmo deck no Anki em qualquer execução
+    registry = get_deck_registry()
+    deck_id = _resolve_deck_id(registry, deck_name)
     
-    for card in cards:
-        # Normaliza quebras de linha
-        question = card["q"].replace('\\n', '\n')
-        answer = card["a"].replace('\\n', '\n')
-        
-        # Detecta se a resposta contém código
-        code_indicators = ['def ', 'function ', '{', '=>', 'import ', 'const ', 'let ', 'var ']
-        is_code = '\n' in answer or any(ind in answer for ind in code_indicators)
-        
-        if is_code:
-            answer = f"<pre><code>{answer}</code></pre>"
+    if partition:
+        parts = partition_cards(cards, partition, partition_size)
+        with ApkgWriter(path, deck_id, deck_name, get_anki_model()) as writer:
+            for child, part in parts.items():
+                child_name = f"{deck_name}::{child}"
+                child_id = _resolve_deck_id(registry, child_name)
+                writer.add_deck(child_id, child_name)
+                writer.add_notes(
+                    map(_note_tuple, part), progress_callback, deck_id=child_id
+                )
+        _record_export(registry, deck_name, path, writer.count)
+        return None
+    
+    update = update and os.path.exists(path)
+    if update:
+        cards = list(cards)
+    
+    notes = map(_note_tuple, cards)
+    
+    if update:
+        stats, guids = update_apkg(path, deck_id, deck_name, get_anki_model(), notes)
         
-        # Cria a nota
-        note = genanki.Note(
-            model=ANKI_MODEL,
-            fields=[question, answer],
-            guid=genanki.guid_for(card["q"], card["a"])
+        # Guarda o GUID em cada Card para as próximas atualizações
+        for card, guid in zip(cards, guids):
+            if isinstance(card, Card):
+                card.guid = guid
+        count = len(guids)
+        if progress_callback is not None:
+            progress_callback(count, os.path.getsize(path))
+    else:
+        stats = None
+        count = write_apkg(
+            path, deck_id, deck_name, get_anki_model(), notes,
+            progress_callback=progress_callback
         )
-        deck.add_note(note)
     
-    # Salva o pacote
-    genanki.Package(deck).write_to_file(path)
+    _record_export(registry, deck_name, path, count)
+    return stats
 
 
-def export_txt(path: str, cards: List[Dict[str, str]]) -> None:
+def _write_package(
+    path: str,
+    deck_id: int,
+    deck_name: str,
+    cards: Sequence[Tuple[str, str, Optional[str], Optional[str]]]
+) -> Tuple[str, int]:
     """
-    Exporta flashcards para formato .txt (tabulado).
+    Grava um pacote num processo de trabalho (ver `export_apkg_packages`).
     
-    Compatível com importação no Anki e Noji.
+    Args:
+        cards: Tuplas (pergunta, resposta, guid, tags).
+    
+    Returns:
+        Tuple com (caminho, número de cards).
+    """
+    notes = (_note_tuple(Card(q, a, guid=guid, tags=tags)) for q, a, guid, tags in cards)
+    count = write_apkg(path, deck_id, deck_name, get_anki_model(), notes)
+    return path, count
+
+
+def export_apkg_packages(
+    path: str,
+    deck_name: str,
+    cards: Iterable[Mapping[str, str]],
+    partition: str,
+    partition_size: int = DEFAULT_PART_SIZE,
+    max_workers: Optional[int] = None,
+    progress_callback: Optional[Callable[[int, int], None]] = None
+) -> List[str]:
+    """
+    Exporta cada subdeck num pacote .apkg separado, em paralelo.
+    
+    Cada pacote é gravado num processo de trabalho (formatação das notas,
+    SQLite e compactação não disputam o GIL). Os IDs dos decks são
+    resolvidos antes, neste processo, para o registro continuar consistente.
+    
+    Args:
+        path: Caminho base ("Deck.apkg" gera "Deck - <subdeck>.apkg").
+        deck_name: Nome do deck pai (cada pacote contém "Deck::<subdeck>").
+        cards: Lista de cards com chaves 'q' e 'a' (ou CardStore).
+        partition: Regra de divisão (ver core.partition.PARTITION_RULES).
+        partition_size: Cards por pacote na regra "size".
+        max_workers: Número de processos (padrão: núcleos disponíveis,
+            limitado ao número de pacotes).
+        progress_callback: Chamado com (cards gravados, bytes gravados) a
+            cada pacote concluído. Uma exceção lançada pelo callback cancela
+            os pacotes pendentes.
+    
+    Returns:
+        Caminhos dos pacotes gerados, na ordem dos subdecks.
+    
+    Raises:
+        Exception: Se houver erro na exportação (pacotes já gravados nesta
+            chamada são removidos).
+    """
+    registry = get_deck_registry()
+    parts = partition_cards(cards, partition, partition_size)
+    
+    jobs = []
+    for child, part in parts.items():
+        child_name = f"{deck_name}::{child}"
+        jobs.append((
+            package_path(path, child),
+            _resolve_deck_id(registry, child_name),
+            child_name,
+            # Só tuplas simples atravessam o limite entre processos
+            [(card["q"], card["a"], card.get("guid"), card.get("tags")) for card in part],
+        ))
+    
+    if max_workers is None:
+        max_workers = min(os.cpu_count() or 1, len(jobs)) or 1
+    
+    done = 0
+    written = 0
+    
+    # "spawn": um fork do processo da interface (Tk, threads) não é seguro
+    with ProcessPoolExecutor(max_workers, mp_context=get_context("spawn")) as executor:
+        futures = [executor.submit(_write_package, *job) for job in jobs]
+        try:
+            for future in as_completed(futures):
+                package, count = future.result()
+                done += count
+                written += os.path.getsize(package)
+                if progress_callback is not None:
+                    progress_callback(done, written)
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True, cancel_futures=True)
+            for future in futures:
+                if future.done() and not future.cancelled() and future.exception() is None:
+                    package = future.result()[0]
+                    if os.path.exists(package):
+                        os.remove(package)
+            raise
+    
+    for package_file, _, child_name, part in jobs:
+        _record_export(registry, child_name, package_file, len(part))
+    
+    return [job[0] for job in jobs]
+
+
+def export_txt(
+    path: str,
+    cards: Iterable[Mapping[str, str]],
+    fmt: str = "tab",
+    compress: Optional[bool] = None,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    deck_name: Optional[str] = None
+) -> int:
+    """
+    Exporta flashcards para formato .txt (tabulado) ou outro formato texto.
+    
+    Compatível com importação no Anki e Noji. Os cards são gravados um a um
+    (ver utils.stream_export), sem montar o arquivo inteiro na memória.
     
     Args:
         path: Caminho do arquivo de saída.
-        cards: Lista de cards com chaves 'q' e 'a'.
+        cards: Lista de cards com chaves 'q' e 'a' (ou CardStore).
+        fmt: "tab" (padrão), "anki_txt", "csv" ou "jsonl".
+        compress: gzip (None = automático pela extensão ".gz").
+        progress_callback: Chamado com (cards gravados, bytes gravados).
+        deck_name: Deck de destino (cabeçalho #deck do formato "anki_txt").
+    
+    Returns:
+        Número de cards gravados.
     
     Raises:
         Exception: Se houver erro na escrita do arquivo.
     """
-    content = format_cards_for_export_tab(cards)
-    
-    with open(path, "w", encoding="utf-8") as f:
-        f.write(content)
+    return write_cards(
+        path, cards, fmt, compress, deck_name=deck_name, progress_callback=progress_callback
+    )
@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+"""
+Exportação em Segundo Plano
+===========================
+
+Executa uma ou mais exportações (vários formatos do mesmo deck) fora da
+thread da interface, com progresso (cards, bytes, tempo restante) e
+cancelamento.
+
+Os cards são materializados uma única vez para todos os destinos, e
+destinos com o mesmo conteúdo (mesmo formato de texto e deck) são gravados
+uma vez e copiados.
+"""
+
+import os
+import shutil
+import threading
+import time
+from collections.abc import Mapping
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from core.partition import DEFAULT_PART_SIZE
+from .export import export_apkg, export_apkg_packages, export_txt
+
+
+# Formatos disponíveis: chave → (descrição, extensão, formato de texto)
+EXPORT_FORMATS = {
+    "anki_apkg": ("Pacote Anki", ".apkg", None),
+    "anki_txt": ("Anki (texto tabulado)", ".txt", "anki_txt"),
+    "noji_txt": ("Noji (texto tabulado)", ".txt", "tab"),
+    "csv": ("CSV", ".csv", "csv"),
+    "jsonl": ("JSON Lines", ".jsonl", "jsonl"),
+}
+
+
+class ExportCancelled(Exception):
+    """Exportação interrompida pelo usuário."""
+
+
+class ExportTarget:
+    """
+    Destino de uma exportação.
+
+    Atributos:
+        fmt: Chave de EXPORT_FORMATS.
+        path: Arquivo de saída.
+        deck_name: Nome do deck (formato .apkg e cabeçalho #deck do .txt do Anki).
+        update: Atualizar um .apkg existente em vez de recriá-lo.
+        partition: Regra de divisão em subdecks (formato .apkg; ver
+            core.partition.PARTITION_RULES) ou None.
+        partition_size: Cards por parte na regra "size".
+        separate: Gravar cada subdeck num pacote próprio, em paralelo.
+    """
+
+    __slots__ = (
+        "fmt", "path", "deck_name", "update", "partition", "partition_size", "separate"
+    )
+
+    def __init__(
+        self,
+        fmt: str,
+        path: str,
+        deck_name: str = "",
+        update: bool = False,
+        partition: Optional[str] = None,
+        partition_size: int = DEFAULT_PART_SIZE,
+        separate: bool = False
+    ):
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Formato de exportação desconhecido: {fmt}")
+        self.fmt = fmt
+        self.path = path
+        self.deck_name = deck_name
+        self.update = update
+        self.partition = partition
+        self.partition_size = partition_size
+        self.separate = separate
+
+
+class ExportProgress:
+    """
+    Estado de uma exportação em andamento.
+
+    Atributos:
+        target: Destino sendo gravado.
+        index: Posição do destino (1-based).
+        num_targets: Total de destinos.
+        done: Cards gravados em todos os destinos.
+        total: Cards a gravar em todos os destinos.
+        bytes_written: Bytes do arquivo atual.
+        elapsed: Segundos desde o início.
+    """
+
+    __slots__ = ("target", "index", "num_targets", "done", "total", "bytes_written", "elapsed")
+
+    def __init__(
+        self,
+        target: ExportTarget,
+        index: int,
+        num_targets: int,
+        done: int,
+        total: int,
+        bytes_written: int,
+        elapsed: float
+    ):
+        self.target = target
+        self.index = index
+        self.num_targets = num_targets
+        self.done = done
+        self.total = total
+        self.bytes_written = bytes_written
+        self.elapsed = elapsed
+
+    @property
+    def eta(self) -> Optional[float]:
+        """Segundos restantes estimados (None até haver progresso)."""
+        if not self.done or self.elapsed <= 0:
+            return None
+        return self.elapsed / self.done * (self.total - self.done)
+
+
+def run_exports(
+    cards: Iterable[Mapping[str, str]],
+    targets: List[ExportTarget],
+    progress_callback: Optional[Callable[[ExportProgress], None]] = None,
+    cancel_event: Optional[threading.Event] = None
+) -> List[Dict]:
+    """
+    Executa as exportações em sequência.
+
+    Args:
+        cards: Cards a exportar (lista ou CardStore).
+        targets: Destinos.
+        progress_callback: Chamado com ExportProgress durante a gravação
+            (na thread que executa esta função).
+        cancel_event: Quando sinalizado, interrompe a exportação atual e
+            remove o arquivo incompleto. A atualização de um .apkg existente
+            é feita no lugar e não é interrompida no meio: o cancelamento só
+            vale antes de ela começar; depois, ela termina e as exportações
+            seguintes são puladas (o resultado devolvido fica mais curto que
+            `targets`).
+
+    Returns:
+        Lista de resultados por destino: {"target", "count", "stats", "paths"}
+        (stats = estatísticas da atualização de .apkg, ou None; paths =
+        arquivos gerados, vários quando o deck é dividido em pacotes).
+
+    Raises:
+        ExportCancelled: Se o cancelamento for solicitado.
+    """
+    cards = cards if hasattr(cards, "__len__") else list(cards)
+    total = len(cards) * len(targets)
+    start = time.perf_counter()
+    results = []
+    written: Dict[Tuple[str, str], str] = {}
+
+    for index, target in enumerate(targets, 1):
+        base_done = (index - 1) * len(cards)
+
+        def notify(done: int, bytes_written: int) -> None:
+            if progress_callback is not None:
+                progress_callback(ExportProgress(
+                    target, index, len(targets), base_done + done, total,
+                    bytes_written, time.perf_counter() - start
+                ))
+
+        def report(done: int, bytes_written: int) -> None:
+            if cancel_event is not None and cancel_event.is_set():
+                raise ExportCancelled()
+            notify(done, bytes_written)
+
+        text_fmt = EXPORT_FORMATS[target.fmt][2]
+        content_key = (text_fmt, target.deck_name)
+        stats = None
+        paths = [target.path]
+        updating = False
+
+        try:
+            if text_fmt is not None and content_key in written:
+                # Mesmo conteúdo já gravado para outro destino
+                shutil.copyfile(written[content_key], target.path)
+                report(len(cards), os.path.getsize(target.path))
+            elif text_fmt is not None:
+                export_txt(
+                    target.path, cards, text_fmt,
+                    deck_name=target.deck_name or None, progress_callback=report
+                )
+                written[content_key] = target.path
+            elif target.partition and target.separate:
+                paths = export_apkg_packages(
+                    target.path, target.deck_name, cards, target.partition,
+                    target.partition_size, progress_callback=report
+                )
+            else:
+                updating = target.update and not target.partition and os.path.exists(target.path)
+                if updating:
+                    # Depois de iniciada, a atualização vai até o fim
+                    report(0, 0)
+                stats = export_apkg(
+                    target.path, target.deck_name, cards,
+                    update=target.update, progress_callback=notify if updating else report,
+                    partition=target.partition, partition_size=target.partition_size
+                )
+        except ExportCancelled:
+            # Texto incompleto é removido; o .apkg só é gravado ao final
+            # (ou substituído de forma atômica na atualização)
+            if text_fmt is not None and os.path.exists(target.path):
+                os.remove(target.path)
+            raise
+
+        results.append({
+            "target": target, "count": len(cards), "stats": stats, "paths": paths
+        })
+        if updating and cancel_event is not None and cancel_event.is_set():
+            # Cancelado durante uma atualização, que já foi gravada
+            break
+
+    return results
+
+
+def format_export_progress(progress: ExportProgress) -> str:
+    """
+    Formata o progresso para a barra de status.
+
+    Args:
+        progress: Estado atual.
+
+    Returns:
+        Texto como "Exportando .apkg (1/2): 5,000/20,000 cards • 1.2 MB • ~3s restantes".
+    """
+    ext = EXPORT_FORMATS[progress.target.fmt][1]
+    text = f"Exportando {ext}"
+    if progress.num_targets > 1:
+        text += f" ({progress.index}/{progress.num_targets})"
+    text += f": {progress.done:,}/{progress.total:,} cards"
+    text += f" • {progress.bytes_written / (1024 * 1024):.1f} MB"
+
+    eta = progress.eta
+    if eta is not None:
+        text += f" • ~{eta:.0f}s restantes"
+    return text
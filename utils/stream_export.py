@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+Exportação em Streaming
+=======================
+
+Escritores de texto que gravam card a card a partir de um iterador, com
+buffer de saída e compressão gzip opcional. O uso de memória não depende do
+tamanho do deck.
+
+Formatos:
+- tab: texto tabulado (mesmo conteúdo de `format_cards_for_export_tab`)
+- anki_txt: texto tabulado com cabeçalho do Anki (#separator, #html, ...);
+  como o cabeçalho declara HTML, &, < e > são escapados (como no .apkg)
+- csv: CSV com cabeçalho "frente,verso"
+- jsonl: um objeto JSON por linha ({"q", "a"[, "source", "guid"]})
+"""
+
+import csv
+import gzip
+import io
+import json
+from collections.abc import Mapping
+from typing import Callable, Iterable, Optional, TextIO
+
+
+STREAM_FORMATS = {
+    "tab": ".txt",
+    "anki_txt": ".txt",
+    "csv": ".csv",
+    "jsonl": ".jsonl",
+}
+
+# Tamanho do buffer de escrita
+BUFFER_SIZE = 1 << 16
+
+# Intervalo (em cards) entre chamadas do callback de progresso
+PROGRESS_EVERY = 500
+
+
+def open_export_file(path: str, compress: Optional[bool] = None) -> TextIO:
+    """
+    Abre o arquivo de saída em modo texto com buffer.
+
+    Args:
+        path: Caminho do arquivo.
+        compress: Força (True) ou desativa (False) gzip; None usa gzip
+            quando o caminho termina em ".gz".
+
+    Returns:
+        Arquivo texto UTF-8 aberto para escrita.
+    """
+    if compress is None:
+        compress = path.lower().endswith(".gz")
+
+    if compress:
+        raw = gzip.open(path, "wb")
+        return io.TextIOWrapper(
+            io.BufferedWriter(raw, BUFFER_SIZE), encoding="utf-8", newline=""
+        )
+    return open(path, "w", encoding="utf-8", newline="", buffering=BUFFER_SIZE)
+
+
+def escape_field(text: str) -> str:
+    """
+    Escapa &, < e > de um campo de nota (os campos do Anki são HTML).
+
+    Args:
+        text: Texto do card.
+
+    Returns:
+        Texto exibido literalmente pelo Anki.
+    """
+    # "&" primeiro para não escapar duas vezes
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _tab_field(text: str) -> str:
+    """Converte quebras de linha em <br> (formato tabulado)."""
+    return text.replace('\\n', '\n').replace('\n', '<br>')
+
+
+def _html_field(text: str) -> str:
+    """Campo do .txt do Anki (#html:true): HTML escapado e quebras em <br>."""
+    return _tab_field(escape_field(text))
+
+
+def _bytes_written(f: TextIO) -> int:
+    """Bytes gravados até agora (sem compressão)."""
+    f.flush()
+    return f.buffer.tell()
+
+
+def _write_tab(f: TextIO, card: Mapping) -> None:
+    f.write(f"{_tab_field(card['q'])}\t{_tab_field(card['a'])}\n")
+
+
+def _write_anki_txt(f: TextIO, card: Mapping) -> None:
+    f.write(f"{_html_field(card['q'])}\t{_html_field(card['a'])}\n")
+
+
+def _write_jsonl(f: TextIO, card: Mapping) -> None:
+    record = dict(card)
+    record["q"] = card['q'].replace('\\n', '\n')
+    record["a"] = card['a'].replace('\\n', '\n')
+    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def write_cards(
+    path: str,
+    cards: Iterable[Mapping[str, str]],
+    fmt: str = "tab",
+    compress: Optional[bool] = None,
+    deck_name: Optional[str] = None,
+    progress_callback: Optional[Callable[[int, int], None]] = None
+) -> int:
+    """
+    Grava os cards no formato escolhido, um por vez.
+
+    Args:
+        path: Caminho do arquivo de saída.
+        cards: Cards (lista, CardStore ou qualquer iterador).
+        fmt: Uma das chaves de STREAM_FORMATS.
+        compress: gzip (None = automático pela extensão ".gz").
+        deck_name: Deck de destino (cabeçalho #deck do formato anki_txt).
+        progress_callback: Chamado com (cards gravados, bytes gravados)
+            a cada PROGRESS_EVERY cards e ao final.
+
+    Returns:
+        Número de cards gravados.
+
+    Raises:
+        ValueError: Se o formato não existir.
+    """
+    if fmt not in STREAM_FORMATS:
+        raise ValueError(f"Formato de exportação desconhecido: {fmt}")
+
+    count = 0
+
+    with open_export_file(path, compress) as f:
+        if fmt == "csv":
+            writer = csv.writer(f, lineterminator="\n")
+            writer.writerow(["frente", "verso"])
+            write = lambda c: writer.writerow([
+                c['q'].replace('\\n', '\n'), c['a'].replace('\\n', '\n')
+            ])
+        elif fmt == "jsonl":
+            write = lambda c: _write_jsonl(f, c)
+        else:
+            if fmt == "anki_txt":
+                f.write("#separator:tab\n#html:true\n#columns:Frente\tVerso\n")
+                if deck_name:
+                    f.write(f"#deck:{deck_name}\n")
+                write = lambda c: _write_anki_txt(f, c)
+            else:
+                write = lambda c: _write_tab(f, c)
+
+        for card in cards:
+            write(card)
+            count += 1
+            if progress_callback and count % PROGRESS_EVERY == 0:
+                progress_callback(count, _bytes_written(f))
+
+        if progress_callback:
+            progress_callback(count, _bytes_written(f))
+
+    return count
@@ -7,26 +7,43 @@ Funções de validação para a aplicação.
 """
 
 import os
-import tkinter as tk
-from tkinter import messagebox
-from typing import Optional
+import time
+from typing import TYPE_CHECKING, Optional, Tuple
 
+from config import get_model_params, get_openai_client
 
-def validar_api_key() -> Optional[str]:
+if TYPE_CHECKING:
+    import tkinter as tk
+
+
+# Tempo máximo da verificação da API Key (segundos)
+PREFLIGHT_TIMEOUT = 10.0
+
+
+def validar_api_key(parent: Optional["tk.Tk"] = None) -> Optional[str]:
     """
     Valida a existência da API Key da OpenAI.
     
     Verifica se a variável de ambiente OPENAI_API_KEY está definida.
     Exibe um erro visual caso não esteja.
     
+    Args:
+        parent: Janela principal já criada (o erro é exibido sobre ela, sem
+            criar outra instância do Tk). Sem ela, uma janela temporária é
+            usada.
+    
     Returns:
         A API key se existir, None caso contrário.
     """
     key = os.getenv("OPENAI_API_KEY")
     
     if not key:
-        # Cria janela temporária para exibir o erro
-        root = tk.Tk()
+        # O Tk só é carregado para exibir o erro (o modo CLI não tem tela)
+        import tkinter as tk
+        from tkinter import messagebox
+        
+        # Sem janela principal: cria uma temporária para exibir o erro
+        root = parent if parent is not None else tk.Tk()
         root.withdraw()
         
         messagebox.showerror(
@@ -35,10 +52,51 @@ def validar_api_key() -> Optional[str]:
             "Linux/Mac:\n"
             "  export OPENAI_API_KEY='sua-chave'\n\n"
             "Windows:\n"
-            "  set OPENAI_API_KEY=sua-chave"
+            "  set OPENAI_API_KEY=sua-chave",
+            parent=root
         )
         
-        root.destroy()
+        if parent is None:
+            root.destroy()
         return None
     
     return key
+
+
+def verificar_api_key(timeout: float = PREFLIGHT_TIMEOUT) -> Tuple[bool, str]:
+    """
+    Verifica a API Key no serviço e aquece a conexão do cliente.
+    
+    Consulta o modelo de geração do perfil em uso (requisição leve, sem custo de tokens) com
+    o cliente compartilhado de config.get_openai_client, então a conexão
+    HTTPS aberta aqui é reaproveitada pela primeira geração. Feita para
+    rodar em segundo plano enquanto a interface é montada.
+    
+    Args:
+        timeout: Tempo máximo da requisição, em segundos (sem novas tentativas).
+    
+    Returns:
+        Tuple com (sucesso, mensagem para o usuário).
+    """
+    import openai
+    
+    model = get_model_params("generation").model
+    start = time.perf_counter()
+    try:
+        client = get_openai_client().with_options(timeout=timeout, max_retries=0)
+        client.models.retrieve(model)
+    except ValueError as e:
+        return False, str(e)
+    except openai.AuthenticationError:
+        return False, "API Key inválida ou revogada (OPENAI_API_KEY)."
+    except openai.PermissionDeniedError:
+        return False, "A API Key não tem permissão para usar a API."
+    except openai.NotFoundError:
+        return False, f"Modelo {model} indisponível para esta API Key."
+    except openai.APIConnectionError as e:
+        return False, f"Sem conexão com a OpenAI: {e}"
+    except openai.APIError as e:
+        return False, f"Falha ao verificar a API Key: {e}"
+    
+    elapsed = (time.perf_counter() - start) * 1000
+    return True, f"API conectada ({elapsed:.0f} ms)"
@@ -0,0 +1,361 @@
+# -*- coding: utf-8 -*-
+"""
+Modo Watch (Ingestão de Pastas)
+===============================
+
+Observa diretórios e converte cada texto novo ou alterado (.txt, .md, ...)
+num deck gravado ao lado do arquivo: geração → refinamento → exportação,
+na fila de tarefas (core.jobs) com até JOB_WORKERS arquivos em paralelo.
+
+- Debounce: um arquivo só é processado depois de ficar DEBOUNCE_SECONDS
+  sem mudar de tamanho nem de mtime (cópias e salvamentos em andamento
+  não disparam gerações pela metade).
+- Registro por hash (core.ingest_ledger): arquivos cujo conteúdo já foi
+  convertido nunca são reenviados, mesmo após reiniciar o daemon.
+- Arquivos com erro só são tentados de novo quando mudam (ou no próximo
+  início do daemon).
+
+A varredura é por polling (só biblioteca padrão), que funciona igual em
+pastas locais e compartilhadas de rede.
+
+Uso:
+    ankilab watch /compartilhado/textos --format anki_apkg --workers 4
+    ankilab watch textos/ --once      # processa o que mudou e sai (cron)
+"""
+
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Tuple
+
+from core.cards import CardStore
+from core.importer import TEXT_EXTENSIONS
+from core.ingest_ledger import IngestLedger, content_hash
+from core.jobs import DONE, Job, JobQueue
+from utils.export_worker import EXPORT_FORMATS, ExportTarget, run_exports
+
+
+# Intervalo entre varreduras (s)
+POLL_SECONDS = 2.0
+
+# Tempo sem alterações antes de processar um arquivo (s)
+DEBOUNCE_SECONDS = 3.0
+
+# Marca dos decks de texto gravados ao lado das fontes (aula.md.cards.txt),
+# para que não sejam tratados como novos textos
+OUTPUT_MARK = ".cards"
+
+# Assinatura de um arquivo na varredura: (mtime_ns, tamanho)
+Signature = Tuple[int, int]
+
+
+def output_path_for(source: str, fmt: str) -> str:
+    """
+    Caminho do deck gerado a partir de um texto.
+
+    Args:
+        source: Arquivo-fonte.
+        fmt: Chave de EXPORT_FORMATS.
+
+    Returns:
+        Arquivo no mesmo diretório, com a extensão da fonte no nome para que
+        aula.md e aula.txt não gravem o mesmo deck (ex: aula.md → aula.md.apkg,
+        aula.md.cards.txt).
+    """
+    ext = EXPORT_FORMATS[fmt][1]
+    if ext in TEXT_EXTENSIONS:
+        return source + OUTPUT_MARK + ext
+    return source + ext
+
+
+def deck_name_for(source: str, root: str) -> str:
+    """
+    Nome do deck de um texto, pelo caminho relativo à pasta observada.
+
+    Arquivos homônimos em pastas diferentes recebem decks diferentes (e IDs
+    diferentes no registro de decks).
+
+    Args:
+        source: Arquivo-fonte.
+        root: Pasta observada que contém o arquivo.
+
+    Returns:
+        Nome hierárquico do Anki (ex: textos/bio/aula.md → "textos::bio::aula.md").
+    """
+    root = os.path.abspath(root)
+    relative = os.path.relpath(os.path.abspath(source), root)
+    parts = [os.path.basename(root) or root] + relative.split(os.sep)
+    return "::".join(parts)
+
+
+def is_source_name(name: str) -> bool:
+    """Indica se um nome de arquivo é um texto-fonte (e não oculto/temporário/deck)."""
+    lower = name.lower()
+    return (
+        lower.endswith(TEXT_EXTENSIONS)
+        and not name.startswith((".", "~"))
+        and not os.path.splitext(lower)[0].endswith(OUTPUT_MARK)
+    )
+
+
+class FolderWatcher:
+    """
+    Converte em decks os textos novos ou alterados de um conjunto de pastas.
+
+    Uso:
+        watcher = FolderWatcher(["textos/"], IngestLedger(), on_event=print_event)
+        watcher.run()              # até Ctrl+C
+        watcher.run(once=True)     # uma passada, espera as tarefas e sai
+    """
+
+    def __init__(
+        self,
+        directories: Iterable[str],
+        ledger: IngestLedger,
+        queue: Optional[JobQueue] = None,
+        fmt: str = "anki_apkg",
+        quantity: str = "AUTO",
+        hard: bool = False,
+        refine: bool = True,
+        debounce: float = DEBOUNCE_SECONDS,
+        recursive: bool = True,
+        on_event: Optional[Callable[..., None]] = None
+    ):
+        """
+        Args:
+            directories: Pastas observadas.
+            ledger: Registro dos arquivos já convertidos.
+            queue: Fila de tarefas (padrão: uma fila própria com JOB_WORKERS).
+            fmt: Formato dos decks (chave de EXPORT_FORMATS).
+            quantity: Cards por texto ou "AUTO".
+            hard: Prompt focado em aplicação.
+            refine: Refina os cards antes de exportar.
+            debounce: Segundos sem alterações antes de processar.
+            recursive: Observa subpastas.
+            on_event: Recebe (evento, **dados) a cada arquivo enfileirado,
+                ignorado, concluído ou com erro (em qualquer thread).
+        """
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Formato de exportação desconhecido: {fmt}")
+
+        self.directories = list(directories)
+        self.ledger = ledger
+        self.queue = queue or JobQueue()
+        self.fmt = fmt
+        self.quantity = quantity
+        self.hard = hard
+        self.refine = refine
+        self.debounce = debounce
+        self.recursive = recursive
+        self.on_event = on_event
+        self.failed = 0
+
+        # Última assinatura vista e desde quando está estável
+        self._seen: Dict[str, Tuple[Signature, float]] = {}
+        # Assinatura já tratada (enfileirada ou ignorada) por arquivo
+        self._handled: Dict[str, Signature] = {}
+        # Pasta observada de cada arquivo encontrado (para o nome do deck)
+        self._roots: Dict[str, str] = {}
+        self._in_flight: Set[str] = set()
+        self._idle = threading.Condition()
+
+    # ==========================================================================
+    # VARREDURA
+    # ==========================================================================
+
+    def scan(self) -> Dict[str, Signature]:
+        """
+        Lista os textos-fonte das pastas.
+
+        Returns:
+            Caminho → (mtime_ns, tamanho).
+        """
+        found: Dict[str, Signature] = {}
+        pending = [(root, root) for root in self.directories]
+        while pending:
+            root, directory = pending.pop()
+            try:
+                entries = list(os.scandir(directory))
+            except OSError as e:
+                print(f"[FolderWatcher] Erro ao ler {directory}: {e}")
+                continue
+            for entry in entries:
+                try:
+                    if entry.is_dir():
+                        if self.recursive and not entry.name.startswith("."):
+                            pending.append((root, entry.path))
+                    elif entry.is_file() and is_source_name(entry.name):
+                        stat = entry.stat()
+                        found[entry.path] = (stat.st_mtime_ns, stat.st_size)
+                        self._roots[entry.path] = root
+                except OSError:
+                    # Removido durante a varredura
+                    continue
+        return found
+
+    def poll(self, now: Optional[float] = None, settle: bool = True) -> int:
+        """
+        Faz uma varredura e enfileira os arquivos prontos.
+
+        Args:
+            now: Instante atual (time.monotonic(); para testes).
+            settle: Aplica o debounce (False = processa tudo o que mudou).
+
+        Returns:
+            Número de arquivos enfileirados.
+        """
+        now = time.monotonic() if now is None else now
+        current = self.scan()
+        submitted = 0
+
+        for path, signature in current.items():
+            previous = self._seen.get(path)
+            if previous is None or previous[0] != signature:
+                previous = self._seen[path] = (signature, now)
+            if settle and now - previous[1] < self.debounce:
+                continue
+
+            with self._idle:
+                if self._handled.get(path) == signature or path in self._in_flight:
+                    continue
+                self._handled[path] = signature
+
+            # Arquivo recém-criado (ainda vazio): espera ganhar conteúdo
+            if signature[1] == 0 or self._unchanged(path, signature):
+                continue
+            self._submit(path)
+            submitted += 1
+
+        for path in [p for p in self._seen if p not in current]:
+            del self._seen[path]
+            self._handled.pop(path, None)
+            self._roots.pop(path, None)
+
+        return submitted
+
+    def _unchanged(self, path: str, signature: Signature) -> bool:
+        """Indica se o conteúdo já foi convertido (pelo registro de hashes)."""
+        entry = self.ledger.lookup(path)
+        if entry is None:
+            return False
+
+        digest, mtime_ns, size = entry
+        if (mtime_ns, size) == signature:
+            return True
+
+        # mtime mudou: só o hash diz se o conteúdo mudou de fato
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return True
+        if content_hash(data) != digest:
+            return False
+
+        self.ledger.touch(path, *signature)
+        self._emit("skipped", path=path, reason="conteúdo sem alterações")
+        return True
+
+    # ==========================================================================
+    # PROCESSAMENTO
+    # ==========================================================================
+
+    def _submit(self, path: str) -> None:
+        """Enfileira a conversão de um arquivo."""
+        with self._idle:
+            self._in_flight.add(path)
+        self._emit("queued", path=path)
+        self.queue.submit(
+            "watch", os.path.basename(path),
+            lambda: self._process(path),
+            on_finish=lambda job: self._finished(job, path)
+        )
+
+    def _process(self, path: str) -> Tuple[str, int]:
+        """
+        Gera, refina e exporta um texto (na thread da tarefa).
+
+        Returns:
+            (deck gravado, número de cards).
+        """
+        from core import generate_cards, refine_cards
+
+        # O stat vem antes da leitura: se o arquivo mudar no meio, o mtime
+        # registrado fica para trás e a próxima varredura o reprocessa
+        stat = os.stat(path)
+        with open(path, "rb") as f:
+            data = f.read()
+
+        text = data.decode("utf-8", errors="replace").strip()
+        if not text:
+            raise ValueError("texto vazio")
+
+        cards = generate_cards(text, self.quantity, self.hard)
+        if self.refine and cards:
+            cards = refine_cards(text, cards, self.hard)
+
+        source = os.path.basename(path)
+        store = CardStore()
+        for card in cards:
+            store.append(card["q"], card["a"], source)
+
+        output = output_path_for(path, self.fmt)
+        root = self._roots.get(path, os.path.dirname(path))
+        deck_name = deck_name_for(path, root)
+        run_exports(store, [ExportTarget(self.fmt, output, deck_name=deck_name)])
+
+        self.ledger.record(
+            path, content_hash(data), stat.st_mtime_ns, stat.st_size, output, len(store)
+        )
+        return output, len(store)
+
+    def _finished(self, job: Job, path: str) -> None:
+        """Registra o fim de uma conversão (na thread da tarefa)."""
+        if job.state == DONE:
+            output, count = job.result
+            self._emit("done", path=path, output=output, cards=count, run=job.run_time)
+        else:
+            error = f"{type(job.error).__name__}: {job.error}" if job.error else job.state
+            self._emit("failed", path=path, error=error)
+
+        with self._idle:
+            if job.state != DONE:
+                self.failed += 1
+            self._in_flight.discard(path)
+            self._idle.notify_all()
+
+    def _emit(self, event: str, **fields: Any) -> None:
+        if self.on_event is None:
+            return
+        try:
+            self.on_event(event, **fields)
+        except Exception as e:
+            print(f"[FolderWatcher] Erro: {e}")
+
+    # ==========================================================================
+    # LAÇO PRINCIPAL
+    # ==========================================================================
+
+    def wait_idle(self) -> None:
+        """Espera as conversões em andamento terminarem."""
+        with self._idle:
+            while self._in_flight:
+                self._idle.wait()
+
+    def run(self, interval: float = POLL_SECONDS, once: bool = False) -> None:
+        """
+        Observa as pastas até Ctrl+C (KeyboardInterrupt).
+
+        Args:
+            interval: Segundos entre varreduras.
+            once: Processa o que mudou desde a última execução, sem debounce,
+                espera as conversões e retorna.
+        """
+        if once:
+            self.poll(settle=False)
+            self.wait_idle()
+            return
+
+        while True:
+            self.poll()
+            time.sleep(interval)